@@ -0,0 +1,5 @@
+"""Run the offline benchmark suite: python -m benchmarks"""
+
+from benchmarks.suite import main
+
+main()
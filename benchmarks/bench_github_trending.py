@@ -0,0 +1,34 @@
+"""Benchmark: parse the saved GitHub Trending page.
+
+Run: python -m benchmarks.bench_github_trending
+"""
+
+import time
+from pathlib import Path
+
+from src.aggregator import is_ai_repo, parse_trending
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "github_trending.html"
+
+
+def bench(rounds: int = 50) -> dict:
+    html = FIXTURE.read_text()
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        repos = [r for r in parse_trending(html) if is_ai_repo(r)]
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    return {"page_kb": len(html) / 1024, "ai_repos": len(repos),
+            "median_ms": timings[len(timings) // 2] * 1000, "min_ms": timings[0] * 1000}
+
+
+def main(rounds: int = 50) -> None:
+    result = bench(rounds)
+    print(f"github_trending: {result['page_kb']:.0f} KB page, {result['ai_repos']} AI repos")
+    print(f"  median {result['median_ms']:.2f} ms, min {result['min_ms']:.2f} ms over {rounds} rounds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: peak memory of ranking a big morning, list path vs streaming path.
+
+Run: python -m benchmarks.bench_memory
+     python -m benchmarks.bench_memory --entries 50000 --keep 300
+
+The list path is what aggregate() used to do: every fetched entry as a dict
+in one list, a scored copy of it, then a full sort. The streaming path is
+what it does now: entries arrive one at a time as slotted Entry objects with
+interned source/priority, and top_entries keeps a bounded heap. Peak sizes
+are measured with tracemalloc, entry generation included in both.
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.feeds import WORDS, _story_pool
+from src.entry import Entry
+from src.ranking import rank_entries, top_entries
+
+SOURCES = {"keywords_boost": ["open source", "agent", "benchmark", "API"], "keywords_skip": ["lawsuit", "IPO"]}
+NOW = datetime(2026, 2, 22, 4, 0, tzinfo=timezone.utc)
+
+
+def _entries(n: int, feeds: int = 500, seed: int = 0):
+    """n entry dicts as they come out of the feed cache / ingest store: fresh strings per entry."""
+    rng = random.Random(seed)
+    pool = _story_pool(rng, 2000)
+    for i in range(n):
+        story = pool[i % len(pool)]
+        yield {
+            "title": story["title"],
+            "link": f"{story['link']}?i={i}",
+            "summary": " ".join(rng.choice(WORDS) for _ in range(60))[:500],
+            "published": (NOW - timedelta(minutes=rng.randint(0, 72 * 60))).isoformat(),
+            "source": "".join(["Feed #", str(i % feeds)]),  # built at runtime, like json.loads output
+            "priority": "".join(["hi", "gh"]) if i % 3 == 0 else "".join(["med", "ium"]),
+        }
+
+
+def _measure(fn) -> tuple[float, float, list]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed, result
+
+
+def bench(entries: int = 20000, keep: int = 300) -> dict:
+    list_mb, list_s, listed = _measure(lambda: rank_entries(list(_entries(entries)), SOURCES, NOW)[:keep])
+    stream_mb, stream_s, (streamed, _) = _measure(lambda: top_entries(_entries(entries), SOURCES, keep, NOW))
+    assert [e["link"] for e in listed] == [e["link"] for e in streamed], "paths disagree on the top entries"
+
+    sample = next(_entries(1))
+    entry = Entry.from_dict(sample)
+    return {
+        "entries": entries,
+        "list_peak_mb": list_mb,
+        "stream_peak_mb": stream_mb,
+        "list_ms": list_s * 1000,
+        "stream_ms": stream_s * 1000,
+        "dict_bytes": sys.getsizeof(sample),      # container only, strings excluded
+        "entry_bytes": sys.getsizeof(entry),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_memory", description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--keep", type=int, default=300, help="ranking.max_entries")
+    args = parser.parse_args(argv)
+
+    r = bench(args.entries, args.keep)
+    print(f"ranking {r['entries']:,} entries, keeping the best {args.keep}:")
+    print(f"  list path:      peak {r['list_peak_mb']:7.1f} MB  {r['list_ms']:7.0f} ms")
+    print(f"  streaming path: peak {r['stream_peak_mb']:7.1f} MB  {r['stream_ms']:7.0f} ms")
+    print(f"  per entry (container only): dict {r['dict_bytes']} B, Entry {r['entry_bytes']} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark: how long `import src.main` takes, and which heavy SDKs it pulls in.
+
+Run: python -m benchmarks.bench_startup
+
+Uses `python -X importtime` in a fresh interpreter per round, so nothing is
+already cached in sys.modules.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Each of these belongs to one stage and should only load when that stage runs
+HEAVY = ("anthropic", "elevenlabs", "feedparser", "yaml", "dotenv", "httpx", "pydantic")
+
+
+def import_times(module: str = "src.main") -> dict[str, int]:
+    """Cumulative import time in microseconds of every module `module` imports."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def heavy_loaded(times: dict[str, int]) -> list[str]:
+    return sorted({name.strip().split(".")[0] for name in times} & set(HEAVY))
+
+
+def bench(rounds: int = 5) -> dict:
+    totals = []
+    for _ in range(rounds):
+        times = import_times()
+        totals.append(times["src.main"])
+    totals.sort()
+    return {"median_ms": totals[len(totals) // 2] / 1000, "min_ms": totals[0] / 1000,
+            "heavy_sdks": len(heavy_loaded(times))}
+
+
+def main(rounds: int = 5) -> None:
+    result = bench(rounds)
+    times = import_times()
+    slowest = sorted(((n, us) for n, us in times.items() if n != "src.main" and not n.startswith(" ")),
+                     key=lambda kv: kv[1], reverse=True)[:5]
+    print(f"startup: import src.main median {result['median_ms']:.0f} ms, min {result['min_ms']:.0f} ms")
+    print(f"  slowest: {', '.join(f'{name} {us / 1000:.1f} ms' for name, us in slowest)}")
+    print(f"  heavy SDKs loaded: {', '.join(heavy_loaded(times)) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
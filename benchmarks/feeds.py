@@ -0,0 +1,121 @@
+"""Synthetic feeds shaped like the ones in sources.yaml, scaled up for benchmarks.
+
+Every source is cloned `copies` times with `entries` items each. hnrss feeds
+get HN-style summaries (link boilerplate plus points/comments), /atom/ URLs
+are served as Atom and everything else as Substack-style RSS 2.0. A share of
+the items reuse stories from a common pool with slightly different titles, so
+ranking and dedup see the cross-source overlap of a real morning.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+ORGS = ["OpenAI", "Anthropic", "Google DeepMind", "Meta", "Mistral", "Hugging Face", "NVIDIA",
+        "Microsoft", "Apple", "Cohere", "Stability AI", "xAI", "Alibaba Qwen", "DeepSeek"]
+THINGS = ["reasoning model", "open source agent framework", "coding assistant", "vision model",
+          "embedding API", "inference server", "benchmark suite", "speech model", "RAG toolkit",
+          "fine-tuning library", "small language model", "evaluation harness", "robotics model",
+          "GPU kernel library", "long-context model", "safety paper", "tool-use API"]
+VERBS = ["releases", "launches", "open-sources", "previews", "ships", "details", "benchmarks",
+         "announces", "updates", "deprecates"]
+SKIPPED = ["closes funding round", "faces lawsuit over", "completes acquisition of", "files for IPO with"]
+WORDS = ("model training data tokens context window latency throughput weights license eval agents "
+         "tools prompts retrieval memory GPU cluster inference quantization distillation reasoning "
+         "chain thought safety alignment red team benchmark leaderboard open source community "
+         "developers API pricing rate limits release notes paper arxiv results ablation scaling "
+         "laws compute budget dataset synthetic multimodal vision audio speech code completion "
+         "editor plugin workflow pipeline deployment edge mobile server batch streaming cache "
+         "kernel attention transformer mixture experts sparse dense parameters checkpoint").split()
+
+_SYLLABLES = ["no", "va", "ka", "ri", "zen", "lu", "mi", "tor", "sa", "quo", "pix", "el"]
+_HN_FEEDS = ("hnrss.org",)
+
+
+def _story_pool(rng: random.Random, n: int, first_id: int = 0) -> list[dict]:
+    stories = []
+    for i in range(first_id, first_id + n):
+        org, thing = rng.choice(ORGS), rng.choice(THINGS)
+        codename = "".join(rng.choice(_SYLLABLES) for _ in range(2)).title() + f" {rng.randint(1, 99)}"
+        if rng.random() < 0.05:
+            title = f"{org} {rng.choice(SKIPPED)} {codename} {thing} startup"
+        else:
+            title = f"{org} {rng.choice(VERBS)} {codename} {thing}"
+        stories.append({
+            "title": title,
+            "link": f"https://{org.lower().replace(' ', '')}.example.com/news/{i}",
+            "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 70))),
+        })
+    return stories
+
+
+def _item(rng: random.Random, story: dict, n: int, hn: bool, now: datetime, max_age_hours: int) -> dict:
+    title = story["title"]
+    if rng.random() < 0.3:
+        title = rng.choice(["Show HN: ", "", "Breaking: "]) + title + rng.choice(["", " today", " (2026)"])
+    link = story["link"] + rng.choice(["", "?utm_source=rss", "/", "#comments"])
+    if hn:
+        points, comments = rng.randint(50, 1500), rng.randint(0, 600)
+        summary = (f"<p>Article URL: <a href=\"{link}\">{link}</a></p>"
+                   f"<p>Comments URL: <a href=\"https://news.ycombinator.com/item?id={n}\">"
+                   f"https://news.ycombinator.com/item?id={n}</a></p>"
+                   f"<p>Points: {points}</p><p># Comments: {comments}</p>")
+    else:
+        summary = f"<p>{story['text']}</p><p>Read more on <a href=\"{link}\">the blog</a>.</p>"
+    published = now - timedelta(minutes=rng.randint(0, max_age_hours * 60))
+    return {"title": title, "link": link, "summary": summary, "published": published}
+
+
+def render_rss(name: str, items: list[dict]) -> bytes:
+    parts = [f'<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+             f"<title>{escape(name)}</title><link>https://example.com/</link>"
+             f"<description>{escape(name)}</description>"]
+    for item in items:
+        parts.append(f"<item><title>{escape(item['title'])}</title><link>{escape(item['link'])}</link>"
+                     f"<description>{escape(item['summary'])}</description>"
+                     f"<pubDate>{format_datetime(item['published'])}</pubDate>"
+                     f"<guid isPermaLink=\"false\">{escape(item['link'])}</guid></item>")
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+
+def render_atom(name: str, items: list[dict]) -> bytes:
+    parts = [f'<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">'
+             f"<title>{escape(name)}</title><id>urn:bench:{escape(name)}</id>"]
+    for item in items:
+        parts.append(f"<entry><title>{escape(item['title'])}</title>"
+                     f"<link href=\"{escape(item['link'])}\" rel=\"alternate\"/>"
+                     f"<id>{escape(item['link'])}</id>"
+                     f"<updated>{item['published'].isoformat()}</updated>"
+                     f"<summary type=\"html\">{escape(item['summary'])}</summary></entry>")
+    parts.append("</feed>")
+    return "".join(parts).encode("utf-8")
+
+
+def synthetic_sources(sources: dict, base_url: str, copies: int = 20, entries: int = 20,
+                      seed: int = 0, now: datetime | None = None) -> tuple[dict, dict[str, bytes]]:
+    """Scale sources.yaml up to `copies` x its feeds, served from `base_url`.
+
+    Returns the rewritten sources dict and the feed payloads keyed by URL path.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    pool = _story_pool(rng, max(50, copies * entries // 4))
+    feeds, payloads = [], {}
+    n = 0
+    for copy in range(copies):
+        for feed in sources.get("rss_feeds", []):
+            name = feed["name"] if copy == 0 else f"{feed['name']} #{copy}"
+            path = f"/feeds/{len(feeds)}.xml"
+            hn = any(host in feed["url"] for host in _HN_FEEDS)
+            items = []
+            for _ in range(entries):
+                n += 1
+                story = rng.choice(pool) if rng.random() < 0.6 else _story_pool(rng, 1, len(pool) + n)[0]
+                # Mostly inside the default 48h window, some older ones to filter out
+                items.append(_item(rng, story, n, hn, now, feed.get("hours_back", 48) + 24))
+            render = render_atom if "/atom/" in feed["url"] else render_rss
+            payloads[path] = render(name, items)
+            feeds.append({**feed, "name": name, "url": base_url + path})
+    return {**sources, "rss_feeds": feeds}, payloads
@@ -0,0 +1,136 @@
+"""Local stand-ins for everything the pipeline talks to over the network.
+
+- feed host: serves synthetic feeds and the saved GitHub Trending page, with ETags
+- Anthropic: a minimal /v1/messages that answers with a canned script or summary
+- ElevenLabs: /v1/text-to-speech/<voice> returning silent MP3 frames sized to the text
+- openclaw: a fake executable put first on PATH
+
+Each one sleeps for a configurable latency per request so runs resemble the
+real round trips without leaving the machine.
+"""
+
+import json
+import os
+import stat
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from src.tts import silence
+
+SCRIPT = " ".join(
+    f"Story {i} is the one everyone is talking about this morning. [pause] "
+    f"Here is why it matters for developers, and what to watch for next. "
+    f"It ships today with an open license and a public API. Wild, right? [pause]"
+    for i in range(1, 4)
+) + " That's your AI fix for today. See you tomorrow."
+
+SUMMARY = "🎙️ Today's AI Briefing\n\n" + "\n\n".join(
+    f"{i}. Story {i}\nWhat happened and why it matters.\n🔗 https://example.com/{i}" for i in range(1, 6)
+) + "\n\n---\nFull audio briefing coming up next 🎧"
+
+# ~15 characters of speech per second
+_MS_PER_CHAR = 67
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def log_message(self, *args):
+        pass
+
+
+def _feed_handler(payloads: dict[str, bytes], latency: float):
+    # payloads may still be filled in after the server starts (feed URLs need its port)
+    class FeedHandler(_Handler):
+        def do_GET(self):
+            time.sleep(latency)
+            path = urlsplit(self.path).path
+            if path not in payloads:
+                return self._send(404, b"not found", "text/plain")
+            etag = f'"{zlib.crc32(payloads[path]):08x}"'
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", "application/xml", {"ETag": etag})
+            content_type = "text/html" if path == "/trending" else "application/xml"
+            self._send(200, payloads[path], content_type, {"ETag": etag})
+
+    return FeedHandler
+
+
+def _anthropic_handler(latency: float):
+    class MessagesHandler(_Handler):
+        def do_POST(self):
+            prompt = json.loads(self._body())["messages"][0]["content"]
+            time.sleep(latency)
+            text = SUMMARY if "WhatsApp message" in prompt else SCRIPT
+            body = json.dumps({
+                "id": "msg_bench", "type": "message", "role": "assistant", "model": "claude-bench",
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn", "stop_sequence": None,
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+            }).encode()
+            self._send(200, body, "application/json")
+
+    return MessagesHandler
+
+
+def _elevenlabs_handler(latency: float):
+    class TTSHandler(_Handler):
+        def do_POST(self):
+            text = json.loads(self._body())["text"]
+            time.sleep(latency)
+            self._send(200, silence(len(text) * _MS_PER_CHAR), "audio/mpeg")
+
+    return TTSHandler
+
+
+class StubServer:
+    """A ThreadingHTTPServer on a free localhost port, served from a daemon thread."""
+
+    def __init__(self, handler):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def feed_server(payloads: dict[str, bytes], latency: float = 0.05) -> StubServer:
+    return StubServer(_feed_handler(payloads, latency))
+
+
+def anthropic_server(latency: float = 0.5) -> StubServer:
+    return StubServer(_anthropic_handler(latency))
+
+
+def elevenlabs_server(latency: float = 0.2) -> StubServer:
+    return StubServer(_elevenlabs_handler(latency))
+
+
+def install_openclaw(bin_dir: Path, latency: float = 0.1) -> Path:
+    """Write a fake `openclaw` that just waits `latency` seconds, and put it first on PATH."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    exe = bin_dir / "openclaw"
+    exe.write_text(f"#!{sys.executable}\nimport time\ntime.sleep({latency})\n")
+    exe.chmod(exe.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+    return exe
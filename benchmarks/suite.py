@@ -0,0 +1,212 @@
+"""Offline benchmark suite for the whole pipeline.
+
+Replays synthetic feeds (sources.yaml scaled up) and the saved GitHub
+Trending page from a local server, and runs against local stand-ins for
+Anthropic, ElevenLabs and openclaw, so numbers are comparable between runs
+on the same laptop and need no network or API keys.
+
+Run: python -m benchmarks
+     python -m benchmarks --copies 40 --entries 50 --llm-latency 2
+     python -m benchmarks --save bench.json           # keep a baseline
+     python -m benchmarks --baseline bench.json       # compare against it
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import yaml
+
+from benchmarks import bench_github_trending, bench_memory, bench_startup, stubs
+from benchmarks.feeds import synthetic_sources
+from src import aggregator, metrics
+from src.aggregator import aggregate, fetch_all
+from src.config import load_config, load_sources
+from src.dedup import dedup_entries
+from src.packing import pack_entries
+from src.ranking import rank_entries
+from src.scriptwriter import build_audio_prompt, build_whatsapp_prompt
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+def _median(timings: list[float]) -> float:
+    return sorted(timings)[len(timings) // 2]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+
+def _timed(fn, rounds: int):
+    """Median seconds of `rounds` calls, and the last result."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return _median(timings), result
+
+
+def _setup(workdir: Path, args) -> list[stubs.StubServer]:
+    """Start the stand-ins and lay out a working directory that points at them."""
+    sources = load_sources(str(REPO / "sources" / "sources.yaml"))
+    payloads = {"/trending": bench_github_trending.FIXTURE.read_bytes()}
+    feeds = stubs.feed_server(payloads, args.feed_latency)
+    scaled, feed_payloads = synthetic_sources(sources, feeds.url, args.copies, args.entries, args.seed)
+    payloads.update(feed_payloads)
+    aggregator.TRENDING_URL = f"{feeds.url}/trending"
+
+    (workdir / "sources").mkdir(parents=True)
+    (workdir / "sources" / "sources.yaml").write_text(yaml.safe_dump(scaled, allow_unicode=True))
+    (workdir / "config").mkdir()
+    shutil.copy(REPO / "config" / "config.yaml", workdir / "config" / "config.yaml")
+
+    llm = stubs.anthropic_server(args.llm_latency)
+    tts = stubs.elevenlabs_server(args.tts_latency)
+    stubs.install_openclaw(workdir / "bin", args.deliver_latency)
+    os.environ.update({
+        "ANTHROPIC_BASE_URL": llm.url, "ANTHROPIC_API_KEY": "bench",
+        "ELEVENLABS_BASE_URL": tts.url, "ELEVENLABS_API_KEY": "bench",
+        "WHATSAPP_TARGET_NUMBER": "+10000000000",
+        "HOME": str(workdir),  # deliver stages media under ~/.openclaw
+    })
+    os.chdir(workdir)
+    return [feeds, llm, tts]
+
+
+def bench_aggregate() -> dict:
+    """One aggregate() call; fetch latencies come from the run's fetch_feed spans."""
+    recorder = metrics.reset()
+    started = time.perf_counter()
+    entries = aggregate()
+    wall = time.perf_counter() - started
+    fetches = [s for s in recorder.spans if s.name == "fetch_feed"]
+    fetched = sum(s.attrs.get("entries", 0) for s in fetches)
+    durations = [s.duration for s in fetches]
+    return {
+        "wall_s": wall,
+        "feeds": len(fetches),
+        "entries_fetched": fetched,
+        "entries_out": len(entries),
+        "entries_per_s": fetched / wall,
+        "feed_p50_ms": _percentile(durations, 0.5) * 1000,
+        "feed_p95_ms": _percentile(durations, 0.95) * 1000,
+        "downloaded_mb": sum(s.attrs.get("bytes", 0) for s in fetches) / 1024 / 1024,
+    }
+
+
+def bench_rank_dedup(entries: list[dict], sources: dict, rounds: int) -> dict:
+    rank_s, ranked = _timed(lambda: rank_entries(entries, sources), rounds)
+    dedup_s, deduped = _timed(lambda: dedup_entries(ranked, sources.get("dedup")), rounds)
+    return {
+        "entries_in": len(entries),
+        "rank_ms": rank_s * 1000,
+        "rank_entries_per_s": len(entries) / rank_s,
+        "skipped": len(entries) - len(ranked),
+        "dedup_ms": dedup_s * 1000,
+        "dedup_entries_per_s": len(ranked) / dedup_s,
+        "merged": len(ranked) - len(deduped),
+    }
+
+
+def bench_prompts(entries: list[dict], config: dict, rounds: int) -> dict:
+    pack_s, packed = _timed(lambda: pack_entries(entries, config.get("llm", {}).get("packing")), rounds)
+    audio_s, audio = _timed(lambda: build_audio_prompt(entries, config), rounds)
+    whatsapp_s, whatsapp = _timed(lambda: build_whatsapp_prompt(entries, config), rounds)
+    return {
+        "pack_ms": pack_s * 1000,
+        "audio_prompt_ms": audio_s * 1000,
+        "whatsapp_prompt_ms": whatsapp_s * 1000,
+        "packed_stories": packed.count("\n---\n"),
+        "prompt_chars": len(audio) + len(whatsapp),
+    }
+
+
+def bench_run() -> dict:
+    """The full daily run against the stand-ins, with a cold feed cache and no LLM/TTS cache."""
+    from src.main import run
+
+    shutil.rmtree("cache", ignore_errors=True)
+    started = time.perf_counter()
+    run(use_cache=False)
+    wall = time.perf_counter() - started
+    stages = {row["name"]: row for row in metrics.current().summary()}
+    result = {"wall_s": wall}
+    for name in ("aggregate", "llm", "tts", "deliver"):
+        if name in stages:
+            result[f"{name}_s"] = stages[name]["total"]
+    result["errors"] = sum(row["errors"] for row in stages.values())
+    return result
+
+
+def run_suite(args) -> dict:
+    results = {"github_trending": bench_github_trending.bench(args.rounds),
+               "startup": bench_startup.bench(args.rounds),
+               "memory": bench_memory.bench(args.copies * args.entries * 10)}
+    cwd, env = os.getcwd(), dict(os.environ)
+    with tempfile.TemporaryDirectory(prefix="ai-news-bench-") as tmp:
+        servers = _setup(Path(tmp), args)
+        try:
+            with redirect_stdout(io.StringIO()):
+                results["aggregate_cold"] = bench_aggregate()
+                results["aggregate_warm"] = bench_aggregate()  # every feed answers 304
+
+                sources = load_sources()
+                fetched = fetch_all(sources["rss_feeds"], fetch_config=sources.get("fetch"))
+                results["rank_dedup"] = bench_rank_dedup(fetched, sources, args.rounds)
+
+                entries = dedup_entries(rank_entries(fetched, sources), sources.get("dedup"))
+                results["prompts"] = bench_prompts(entries, load_config(), args.rounds)
+
+                results["run"] = bench_run()
+        finally:
+            for server in servers:
+                server.close()
+            os.chdir(cwd)
+            os.environ.clear()
+            os.environ.update(env)
+    return results
+
+
+def print_report(results: dict, baseline: dict | None = None) -> None:
+    """One `benchmark metric value` row per line, so reports diff cleanly."""
+    header = f"{'benchmark':<18}{'metric':<22}{'value':>14}"
+    print(header + (f"{'baseline':>14}{'change':>9}" if baseline else ""))
+    for bench, values in results.items():
+        for metric, value in values.items():
+            line = f"{bench:<18}{metric:<22}{value:>14,.2f}"
+            before = (baseline or {}).get(bench, {}).get(metric)
+            if before is not None:
+                change = f"{(value - before) / before:+.0%}" if before else ""
+                line += f"{before:>14,.2f}{change:>9}"
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=20, help="copies of each sources.yaml feed")
+    parser.add_argument("--entries", type=int, default=20, help="entries per synthetic feed")
+    parser.add_argument("--rounds", type=int, default=5, help="repeats for the in-memory benchmarks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--feed-latency", type=float, default=0.05, help="seconds per feed request")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per Anthropic call")
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="seconds per ElevenLabs chunk")
+    parser.add_argument("--deliver-latency", type=float, default=0.1, help="seconds per openclaw send")
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved earlier")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.baseline).read_text())["results"] if args.baseline else None
+    results = run_suite(args)
+    print_report(results, baseline)
+    if args.save:
+        Path(args.save).write_text(json.dumps({"params": vars(args), "results": results}, indent=2))
+        print(f"\nSaved: {args.save}")
@@ -1,5 +1,5 @@
 """Allow running as: python -m src.main"""
 
-from src.main import run
+from src.main import main
 
-run()
+main()
@@ -1,164 +1,361 @@
 """RSS feed aggregator - fetches and ranks AI news from configured sources."""
 
 import re
-import urllib.request
-import feedparser
-import yaml
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from html.parser import HTMLParser
 from datetime import datetime, timedelta, timezone
 
+from src import metrics
+from src.config import load_sources as _load_sources
+from src.context import SOURCES_PATH, RunContext, http_client
+from src.dedup import dedup_entries
+from src.entry import Entry
+from src.feedcache import FeedCache
+from src.ranking import RANKING_DEFAULTS, top_entries
+from src.seen import filter_seen, open_index
 
-def load_sources(sources_path: str = "sources/sources.yaml") -> dict:
-    with open(sources_path) as f:
-        return yaml.safe_load(f)
+TRENDING_URL = "https://github.com/trending?since=daily&spoken_language_code=en"
 
+# Defaults for the `fetch:` section of sources.yaml
+FETCH_DEFAULTS = {
+    "max_workers": 8,      # feeds fetched in parallel
+    "feed_timeout": 15,    # seconds allowed per feed
+    "total_timeout": 45,   # seconds before the run moves on with what has arrived
+    "cache_dir": "cache/feeds",  # conditional-GET cache; null disables it
+}
 
-def fetch_feed(feed_config: dict, hours_back: int = 48) -> list[dict]:
-    """Fetch recent entries from a single RSS feed."""
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-    entries = []
 
-    try:
-        feed = feedparser.parse(feed_config["url"])
-        for entry in feed.entries:
-            published = None
-            if hasattr(entry, "published_parsed") and entry.published_parsed:
-                published = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-            elif hasattr(entry, "updated_parsed") and entry.updated_parsed:
-                published = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
-
-            if published and published < cutoff:
-                continue
+def load_sources(sources_path: str = SOURCES_PATH) -> dict:
+    """sources.yaml as a dict; kept for callers from before src.config (the pipeline uses RunContext)."""
+    return _load_sources(sources_path)
 
-            entries.append({
-                "title": entry.get("title", "Untitled"),
-                "link": entry.get("link", ""),
-                "summary": entry.get("summary", "")[:500],
-                "published": published.isoformat() if published else "unknown",
-                "source": feed_config["name"],
-                "priority": feed_config.get("priority", "medium"),
-            })
-    except Exception as e:
-        print(f"  Warning: Failed to fetch {feed_config['name']}: {e}")
 
-    return entries
+def _http_get(url: str, timeout: float, headers: dict | None = None) -> tuple[int, bytes, Mapping[str, str]]:
+    """GET a URL, giving up once `timeout` seconds of wall-clock time have passed.
 
+    The per-request timeout only bounds each socket operation, so a host that
+    trickles bytes could otherwise hold a worker forever. Returns (status, body,
+    headers); a 304 Not Modified comes back as status 304 with an empty body.
+    Requests go through the process's shared client, so fetching several feeds
+    from one host (or the same feeds again) reuses its connection.
+    """
+    deadline = time.monotonic() + timeout
+    chunks = []
+    with http_client().stream("GET", url, headers=headers, timeout=timeout) as resp:
+        if resp.status_code == 304:
+            return 304, b"", resp.headers
+        resp.raise_for_status()
+        for chunk in resp.iter_bytes(64 * 1024):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"no complete response within {timeout}s")
+            chunks.append(chunk)
+        return resp.status_code, b"".join(chunks), resp.headers
+
+
+def _parse_entries(body: bytes, feed_config: dict) -> list[dict]:
+    """Parse a feed body into entry dicts (no recency filtering)."""
+    import feedparser  # ~100ms to import; only runs that actually parse feeds pay for it
 
-def fetch_github_trending(max_repos: int = 10) -> list[dict]:
-    """Scrape GitHub Trending for top AI/ML repos today."""
     entries = []
-    try:
-        url = "https://github.com/trending?since=daily&spoken_language_code=en"
-        req = urllib.request.Request(url, headers={
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                          "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+    for entry in feedparser.parse(body).entries:
+        published = None
+        if hasattr(entry, "published_parsed") and entry.published_parsed:
+            published = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+        elif hasattr(entry, "updated_parsed") and entry.updated_parsed:
+            published = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
+
+        entries.append({
+            "title": entry.get("title", "Untitled"),
+            "link": entry.get("link", ""),
+            "summary": entry.get("summary", "")[:500],
+            "published": published.isoformat() if published else "unknown",
+            "source": feed_config["name"],
+            "priority": feed_config.get("priority", "medium"),
         })
-        html = urllib.request.urlopen(req, timeout=10).read().decode("utf-8")
-
-        # Slugs appear as href="/owner/repo" data-view-component="true" — ordered list of repos
-        slugs = re.findall(
-            r'href="/([a-zA-Z0-9_.-]+/[a-zA-Z0-9_.-]+)"\s*data-view-component="true"', html
-        )
-        # Stars today — in same order as repos
-        stars_list = re.findall(r'([\d,]+)\s*stars today', html)
-
-        # Keywords that must appear as whole words/phrases (word-boundary matched)
-        # to avoid false positives like "wagtail" matching "ai", "dragonfly" matching "rag"
-        ai_keywords_whole = [
-            r"\bai\b", r"\bllm\b", r"\bgpt\b", r"\bml\b", r"\bneural\b",
-            r"\bdiffusion\b", r"\btransformer\b", r"\bembedding\b", r"\brag\b",
-            r"\binference\b", r"\blangchain\b", r"\bopenai\b", r"\bclaude\b",
-            r"\bmistral\b", r"\bllama\b", r"\bgemini\b", r"\bmultimodal\b",
-            r"\bcopilot\b", r"\bhuggingface\b", r"\bpytorch\b", r"\btensorflow\b",
-            r"\bnlp\b", r"\bautonomous\b", r"\bdeep.learning\b",
-            r"\bmachine.learning\b", r"\bcomputer.vision\b",
-            r"\bagent\b", r"\bchatgpt\b", r"\bstable.diffusion\b",
+    return entries
+
+
+def fetch_feed(feed_config: dict, hours_back: int = 48, timeout: float = 15,
+               cache: FeedCache | None = None) -> list[dict]:
+    """Fetch recent entries from a single RSS feed.
+
+    With a cache, the request is conditional and a 304 reuses the entries
+    parsed last time instead of downloading and parsing the feed again.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+    url = feed_config["url"]
+
+    with metrics.span("fetch_feed", source=feed_config["name"]) as span:
+        try:
+            cached = cache.get(url) if cache else None
+            headers = cache.request_headers(cached) if cache else {}
+            status, body, response_headers = _http_get(url, timeout, headers)
+            span.set(status=status, bytes=len(body))
+            if status == 304 and cached:
+                cache.record_hit(cached)
+                entries = cached["entries"]
+            else:
+                entries = _parse_entries(body, feed_config)
+                if cache:
+                    cache.record_miss()
+                    cache.put(url, response_headers, entries, len(body))
+        except Exception as e:
+            print(f"  Warning: Failed to fetch {feed_config['name']}: {e}")
+            span.error = f"{type(e).__name__}: {e}"
+            return []
+
+        # Cached entries carry the source/priority they were parsed with; refresh
+        # them in case sources.yaml changed since.
+        recent = [
+            {**entry, "source": feed_config["name"], "priority": feed_config.get("priority", "medium")}
+            for entry in entries
+            if entry["published"] == "unknown" or datetime.fromisoformat(entry["published"]) >= cutoff
         ]
-        # Substring keywords (safe — unlikely to appear in non-AI repo names)
-        ai_keywords_sub = ["fine-tun", "vector store", "language model"]
-
-        def _is_ai_repo(text: str) -> bool:
-            for pattern in ai_keywords_whole:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return True
-            for kw in ai_keywords_sub:
-                if kw in text:
-                    return True
-            return False
-
-        count = 0
-        for i, slug in enumerate(slugs):
-            if count >= max_repos:
-                break
-
-            stars = stars_list[i] if i < len(stars_list) else "?"
-
-            # Extract description from the HTML section near this slug
-            # Description appears as a long text node (>30 chars) in the slug's area
-            idx = html.find(f'/{slug}"')
-            if idx < 0:
-                continue
-            # Look in a ~3KB window after the slug reference
-            window = html[idx:idx + 3000]
-            # Get plain text chunks — skip SVG/HTML noise
-            text_chunks = re.findall(r'>\s*([^<]{30,}?)\s*<', window)
-            # First long text chunk is typically the repo description
-            desc = text_chunks[0].strip() if text_chunks else ""
-            # Clean whitespace
-            desc = re.sub(r'\s+', ' ', desc)
-
-            combined = f"{slug} {desc}"
-            if _is_ai_repo(combined):
+        span.set(entries=len(entries), recent=len(recent))
+        return recent
+
+
+# Whole words/phrases only, to avoid false positives like "wagtail" matching "ai"
+# or "dragonfly" matching "rag"; the last three are safe as plain substrings.
+_AI_REPO_RE = re.compile(
+    r"\b(?:ai|llm|gpt|ml|neural|diffusion|transformer|embedding|rag|inference|langchain"
+    r"|openai|claude|mistral|llama|gemini|multimodal|copilot|huggingface|pytorch|tensorflow"
+    r"|nlp|autonomous|deep.learning|machine.learning|computer.vision|agent|chatgpt"
+    r"|stable.diffusion)\b"
+    r"|fine-tun|vector store|language model",
+    re.IGNORECASE,
+)
+_COUNT_RE = re.compile(r"[\d,]+")
+
+
+def _parse_count(text: str) -> int | None:
+    match = _COUNT_RE.search(text)
+    return int(match.group().replace(",", "")) if match else None
+
+
+class _TrendingParser(HTMLParser):
+    """Single-pass extractor for github.com/trending.
+
+    Each repo is an <article class="Box-row">; every field is read from inside
+    its own article, so a repo missing e.g. "stars today" can't shift the
+    values of the repos after it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.repos: list[dict] = []
+        self._repo: dict | None = None
+        self._field: str | None = None  # field the current text belongs to
+        self._field_tag: str | None = None
+        self._in_h2 = False
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "article" and "Box-row" in (dict(attrs).get("class") or ""):
+            self._repo = {"slug": "", "description": "", "language": "",
+                          "stars_today": None, "stars": None}
+            return
+        if self._repo is None:
+            return
+        attrs = dict(attrs)
+        href = attrs.get("href") or ""
+        if tag == "h2":
+            self._in_h2 = True
+        elif tag == "a" and self._in_h2 and not self._repo["slug"]:
+            self._repo["slug"] = href.strip("/")
+        elif tag == "p":
+            self._start_field("description", tag)
+        elif tag == "span" and attrs.get("itemprop") == "programmingLanguage":
+            self._start_field("language", tag)
+        elif tag == "a" and href.endswith("/stargazers"):
+            self._start_field("stars", tag)
+
+    def _start_field(self, field: str, tag: str):
+        self._field, self._field_tag, self._text = field, tag, []
+
+    def handle_data(self, data):
+        if self._repo is None:
+            return
+        if self._field:
+            self._text.append(data)
+        elif "stars today" in data:
+            self._repo["stars_today"] = _parse_count(data)
+
+    def handle_endtag(self, tag):
+        if self._repo is None:
+            return
+        if tag == self._field_tag and self._field:
+            text = " ".join("".join(self._text).split())
+            self._repo[self._field] = _parse_count(text) if self._field == "stars" else text
+            self._field = self._field_tag = None
+        elif tag == "h2":
+            self._in_h2 = False
+        elif tag == "article":
+            if self._repo["slug"]:
+                self.repos.append(self._repo)
+            self._repo = None
+
+
+def parse_trending(html: str) -> list[dict]:
+    """Parse the GitHub Trending page into repo records, in page order.
+
+    Records have slug, description, language, stars_today and stars (the
+    counts are None when the page doesn't show them).
+    """
+    parser = _TrendingParser()
+    parser.feed(html)
+    parser.close()
+    return parser.repos
+
+
+def is_ai_repo(repo: dict) -> bool:
+    return _AI_REPO_RE.search(f"{repo['slug']} {repo['description']}") is not None
+
+
+def fetch_github_trending(max_repos: int = 10, timeout: float = 10) -> list[dict]:
+    """Scrape GitHub Trending for top AI/ML repos today."""
+    with metrics.span("github_trending", source="GitHub Trending") as span:
+        entries = []
+        try:
+            body = _http_get(TRENDING_URL, timeout)[1]
+            html = body.decode("utf-8")
+            span.set(bytes=len(body))
+
+            for repo in parse_trending(html):
+                if len(entries) >= max_repos:
+                    break
+                if not is_ai_repo(repo):
+                    continue
+
+                slug, desc = repo["slug"], repo["description"]
+                stars_today = f"{repo['stars_today']:,}" if repo["stars_today"] is not None else "?"
+                details = ", ".join(filter(None, [
+                    repo["language"],
+                    f"{repo['stars']:,} stars" if repo["stars"] is not None else "",
+                ]))
+                summary = desc[:500] if desc else f"Trending AI/ML repo: {slug}"
                 entries.append({
-                    "title": f"🔥 Trending on GitHub: {slug} ({stars} stars today)",
+                    "title": f"🔥 Trending on GitHub: {slug} ({stars_today} stars today)",
                     "link": f"https://github.com/{slug}",
-                    "summary": desc[:500] if desc else f"Trending AI/ML repo: {slug}",
+                    "summary": f"{summary} ({details})" if details else summary,
                     "published": datetime.now(timezone.utc).isoformat(),
                     "source": "GitHub Trending",
                     "priority": "high",
                 })
-                count += 1
 
-    except Exception as e:
-        print(f"  Warning: GitHub Trending fetch failed: {e}")
+        except Exception as e:
+            print(f"  Warning: GitHub Trending fetch failed: {e}")
+            span.error = f"{type(e).__name__}: {e}"
+
+        span.set(entries=len(entries))
+        return entries
 
-    return entries
 
+def iter_entries(feeds: list[dict], hours_back: int = 48, fetch_config: dict | None = None) -> Iterator[Entry]:
+    """Fetch every RSS feed plus GitHub Trending concurrently, streaming their entries.
 
-def aggregate(sources_path: str = "sources/sources.yaml", hours_back: int = 48) -> list[dict]:
-    """Fetch all sources and return combined entries sorted by priority/recency."""
-    sources = load_sources(sources_path)
-    all_entries = []
+    Each source gets `feed_timeout` seconds once it starts; after `total_timeout`
+    seconds the run carries on with whatever has arrived. Entries come out in
+    sources.yaml order, so ties downstream stay deterministic, and each source
+    is handed over and let go of as soon as it and the ones before it are in.
+    """
+    fetch_config = {**FETCH_DEFAULTS, **(fetch_config or {})}
+    feed_timeout = fetch_config["feed_timeout"]
+    total_timeout = fetch_config["total_timeout"]
+    cache = FeedCache(fetch_config["cache_dir"]) if fetch_config["cache_dir"] else None
 
-    # RSS feeds
-    for feed_config in sources.get("rss_feeds", []):
-        print(f"  Fetching: {feed_config['name']}...")
+    started = time.monotonic()
+    pool = metrics.Executor(max_workers=fetch_config["max_workers"], thread_name_prefix="fetch")
+    jobs = []
+    for feed_config in feeds:
         # Per-feed hours_back override (e.g. weekly newsletters use 168h)
         feed_hours_back = feed_config.get("hours_back", hours_back)
-        entries = fetch_feed(feed_config, feed_hours_back)
-        all_entries.extend(entries)
-        print(f"    Found {len(entries)} recent entries")
-
-    # GitHub Trending
-    print(f"  Fetching: GitHub Trending...")
-    gh_entries = fetch_github_trending()
-    all_entries.extend(gh_entries)
-    print(f"    Found {len(gh_entries)} trending AI repos")
-
-    # Sort: high priority first, then recency
-    priority_order = {"high": 0, "medium": 1, "low": 2}
-    all_entries.sort(key=lambda x: (
-        priority_order.get(x["priority"], 1),
-        x["published"] == "unknown",
-    ))
-
-    # Skip filtered keywords
-    keywords_skip = sources.get("keywords_skip", [])
-    filtered = []
-    for entry in all_entries:
-        text = f"{entry['title']} {entry['summary']}".lower()
-        if any(kw.lower() in text for kw in keywords_skip):
-            continue
-        filtered.append(entry)
-
-    print(f"  Total: {len(filtered)} entries after filtering")
-    return filtered
+        jobs.append((pool.submit(fetch_feed, feed_config, feed_hours_back, feed_timeout, cache=cache),
+                     feed_config["name"]))
+    jobs.append((pool.submit(fetch_github_trending, timeout=feed_timeout), "GitHub Trending"))
+
+    arrived = 0
+    try:
+        for n, (future, name) in enumerate(jobs):
+            try:
+                entries = future.result(timeout=max(started + total_timeout - time.monotonic(), 0))
+            except TimeoutError:
+                print(f"  Warning: {name} missed the {total_timeout}s deadline, skipping")
+                metrics.current().record("fetch_deadline_missed", total_timeout, source=name)
+                continue
+            jobs[n] = (None, name)  # drop the future, and with it the source's entry list
+            arrived += 1
+            print(f"  {name}: {len(entries)} recent entries")
+            for entry in entries:
+                yield Entry.from_dict(entry)
+    finally:
+        # Don't block on stragglers — their own socket timeouts will reap them.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    print(f"  Fetched {arrived}/{len(jobs)} sources in {time.monotonic() - started:.1f}s")
+    if cache:
+        stats = cache.stats()
+        print(f"  Feed cache: {stats['hits']} not modified, {stats['misses']} downloaded, "
+              f"{stats['bytes_saved'] / 1024:.0f} KB saved")
+
+
+def fetch_all(feeds: list[dict], hours_back: int = 48, fetch_config: dict | None = None) -> list[dict]:
+    """iter_entries, collected into a list of entry dicts."""
+    return [entry.to_dict() for entry in iter_entries(feeds, hours_back, fetch_config)]
+
+
+def aggregate(sources_path: str = SOURCES_PATH, hours_back: int = 48, ctx: RunContext | None = None) -> list[dict]:
+    """Fetch all sources and return combined entries, best-scored first; `ctx` overrides `sources_path`."""
+    with metrics.span("aggregate") as span:
+        sources = (ctx or RunContext(sources_path=sources_path)).sources
+        all_entries = None
+        if (sources.get("ingest") or {}).get("enabled"):
+            # Feeds are polled continuously by src.ingest; just read the window
+            from src.ingest import read_window
+            all_entries = read_window(sources, hours_back)
+            if all_entries is None:
+                print("  Ingest store not polled recently, fetching feeds directly")
+            else:
+                print(f"  Read {len(all_entries)} entries from the ingest store")
+        if all_entries is None:
+            # Streamed straight into ranking, which only ever holds ranking.max_entries of them
+            all_entries = iter_entries(sources.get("rss_feeds", []), hours_back, sources.get("fetch"))
+        return select_entries(all_entries, sources, span=span)
+
+
+def select_entries(all_entries: Iterable[Entry | dict], sources: dict, now: datetime | None = None,
+                   today: str | None = None, span=None) -> list[dict]:
+    """Rank, merge duplicates and drop stories already covered - everything aggregate() does after fetching.
+
+    `all_entries` may be a stream; only the best ranking.max_entries are kept
+    from it. `now` and `today` default to the present; a backfill passes the
+    day being remade.
+    """
+    # Score by priority, recency, keywords_boost and HN engagement; drop keywords_skip
+    max_entries = {**RANKING_DEFAULTS, **(sources.get("ranking") or {})}["max_entries"]
+    ranked, counts = top_entries(all_entries, sources, max_entries, now)
+    print(f"  Skipped {counts['skipped']} entries matching keywords_skip")
+    if counts["dropped"]:
+        print(f"  Kept the best {len(ranked)} of {counts['seen'] - counts['skipped']} scored entries")
+
+    # Same story from several sources -> one entry carrying all its links
+    deduped = dedup_entries(ranked, sources.get("dedup"))
+    print(f"  Merged {len(ranked) - len(deduped)} duplicate entries")
+
+    # Stories an earlier briefing already covered -> dropped or pushed down
+    fresh, seen = deduped, 0
+    index = open_index(sources.get("seen"))
+    if index is not None:
+        try:
+            fresh = filter_seen(deduped, index, sources.get("seen"), today)
+        finally:
+            index.close()
+        seen = sum(1 for e in fresh if "seen_on" in e) + len(deduped) - len(fresh)
+        print(f"  {seen} entries already covered on earlier days")
+
+    print(f"  Total: {len(fresh)} entries after filtering")
+    if span is not None:
+        span.set(fetched=counts["seen"], skipped=counts["skipped"], dropped=counts["dropped"],
+                 merged=len(ranked) - len(deduped), seen=seen, entries=len(fresh))
+    return fresh
@@ -0,0 +1,189 @@
+"""Archive analytics - which feeds are slow, which fail, and which ever make the briefing.
+
+Run: python -m src.analytics
+     python -m src.analytics --since 2026-02-01 --json
+
+Everything comes from what the archive already keeps for each day: the fetch
+spans in its run metrics (latency, errors, entries inside the window), its
+ranked entries, and which of those were the briefing's top stories. From that
+each source gets a suggested `hours_back` (how old its top stories actually
+are) and `poll_minutes` for src.ingest (how often it publishes, or the slowest
+poll for a feed that never makes the cut), plus notes on feeds worth pruning.
+"""
+
+import argparse
+import json
+import math
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from src.archive import ARCHIVE_DEFAULTS, ArchiveStore, _date_range
+from src.context import RunContext
+from src.ingest import INGEST_DEFAULTS
+from src.schedule import delivery_time, load_schedule
+
+# Spans that stand for one fetch of one source (see aggregator.iter_entries and ingest.poll_once)
+FETCH_SPANS = ("fetch_feed", "github_trending", "ingest_poll", "fetch_deadline_missed")
+
+_FETCHES_SQL = """
+SELECT r.date,
+       json_extract(s.value, '$.name')     AS name,
+       json_extract(s.value, '$.source')   AS source,
+       json_extract(s.value, '$.duration') AS duration,
+       json_extract(s.value, '$.error')    AS error,
+       coalesce(json_extract(s.value, '$.recent'), json_extract(s.value, '$.entries'), 0) AS fetched
+FROM runs r, json_each(r.metrics, '$.spans') s
+WHERE r.metrics IS NOT NULL AND json_extract(s.value, '$.name') IN ({names}){where}
+"""
+
+_ENTRIES_SQL = """
+SELECT e.date, e.source, e.published, e.rank <= json_array_length(r.top_stories) AS top
+FROM entries e JOIN runs r ON r.date = e.date
+WHERE 1{where}
+"""
+
+# A source fetched on fewer days than this isn't judged yet
+MIN_DAYS = 5
+
+
+def _percentile(values: list[float], p: float) -> float | None:
+    """Nearest-rank percentile of already sorted values."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def source_report(store: ArchiveStore, sources: dict, config: dict, since: str | None = None,
+                  until: str | None = None) -> list[dict]:
+    """One row per source in the archive or sources.yaml; the ones with something to fix come first."""
+    ingest = {**INGEST_DEFAULTS, **(sources.get("ingest") or {})}
+    schedule = load_schedule(config)
+    feed_timeout = (sources.get("fetch") or {}).get("feed_timeout", 15)
+    feeds = {f["name"]: f for f in sources.get("rss_feeds", [])}
+
+    rows: dict[str, dict] = defaultdict(lambda: {
+        "days": set(), "durations": [], "failures": 0, "fetched": 0,
+        "ranked": 0, "top": 0, "top_ages": [], "published": set()})
+
+    where, params = _date_range(since, until, "r.date")
+    names = ", ".join("?" * len(FETCH_SPANS))
+    for date, name, source, duration, error, fetched in store.db.execute(
+            _FETCHES_SQL.format(names=names, where=where), [*FETCH_SPANS, *params]):
+        row = rows[source]
+        row["days"].add(date)
+        if name == "fetch_deadline_missed" or error:
+            row["failures"] += 1
+        else:
+            row["durations"].append(duration)
+            row["fetched"] += fetched
+
+    where, params = _date_range(since, until, "e.date")
+    due = {}
+    for date, source, published, top in store.db.execute(_ENTRIES_SQL.format(where=where), params):
+        row = rows[source]
+        row["ranked"] += 1
+        if published in (None, "unknown"):
+            continue
+        published = datetime.fromisoformat(published)
+        if published.tzinfo is None:
+            continue
+        row["published"].add(published)
+        if top:
+            if date not in due:
+                due[date] = delivery_time(date, schedule)
+            row["top"] += 1
+            row["top_ages"].append((due[date] - published).total_seconds() / 3600)
+
+    report = []
+    for source in {*rows, *feeds}:
+        row = rows[source]
+        durations = sorted(row["durations"])
+        fetches = len(durations) + row["failures"]
+        ages = sorted(row["top_ages"])
+        published = sorted(row["published"])
+        gaps = sorted((b - a).total_seconds() / 60 for a, b in zip(published, published[1:]))
+        p95_ms = _percentile(durations, 95) * 1000 if durations else None
+
+        hours_back = None
+        if ages:
+            hours_back = max(24, math.ceil(_percentile(ages, 90) / 24) * 24)
+        if row["top"] and gaps:
+            poll = min(max(_percentile(gaps, 50), ingest["min_poll_minutes"]), ingest["max_poll_minutes"])
+        else:
+            poll = ingest["max_poll_minutes"]
+
+        notes = []
+        if source not in feeds and source != "GitHub Trending":
+            notes.append("no longer in sources.yaml")
+        if len(row["days"]) >= MIN_DAYS and not row["top"]:
+            notes.append(f"never in top stories in {len(row['days'])} days")
+        if fetches and row["failures"] / fetches >= 0.25:
+            notes.append(f"fails {row['failures'] / fetches:.0%} of fetches")
+        if p95_ms and p95_ms > feed_timeout * 1000 / 2:
+            notes.append(f"slow (p95 {p95_ms / 1000:.1f}s of a {feed_timeout}s timeout)")
+
+        report.append({
+            "source": source,
+            "days": len(row["days"]),
+            "fetches": fetches,
+            "failures": row["failures"],
+            "failure_rate": round(row["failures"] / fetches, 3) if fetches else None,
+            "p50_ms": round(_percentile(durations, 50) * 1000) if durations else None,
+            "p95_ms": round(p95_ms) if p95_ms else None,
+            "max_ms": round(durations[-1] * 1000) if durations else None,
+            "fetched": row["fetched"],
+            "ranked": row["ranked"],
+            "top": row["top"],
+            "top_share": round(row["top"] / row["ranked"], 3) if row["ranked"] else None,
+            "top_age_p90_hours": round(_percentile(ages, 90), 1) if ages else None,
+            "hours_back": feeds.get(source, {}).get("hours_back"),
+            "suggested_hours_back": hours_back,
+            "suggested_poll_minutes": round(poll),
+            "notes": notes,
+        })
+    # Pruning candidates first, then by how much fetch time each source costs
+    report.sort(key=lambda r: (not r["notes"], -(r["p95_ms"] or 0), r["source"]))
+    return report
+
+
+def _ms(value: int | None) -> str:
+    return f"{value:,}" if value is not None else "-"
+
+
+def print_report(report: list[dict], default_hours_back: int = 48) -> None:
+    print(f"{'source':<28} {'days':>4} {'fail':>5} {'p50 ms':>7} {'p95 ms':>7} {'fetched':>7} {'ranked':>6} "
+          f"{'top':>4} {'top%':>5}  {'hours_back':>10}  {'poll':>5}  notes")
+    for r in report:
+        fail = f"{r['failure_rate']:.0%}" if r["failure_rate"] is not None else "-"
+        share = f"{r['top_share']:.0%}" if r["top_share"] is not None else "-"
+        current = r["hours_back"] or default_hours_back
+        hours = f"{current}->{r['suggested_hours_back']}" if r["suggested_hours_back"] else f"{current}->-"
+        print(f"{r['source'][:28]:<28} {r['days']:>4} {fail:>5} {_ms(r['p50_ms']):>7} {_ms(r['p95_ms']):>7} "
+              f"{r['fetched']:>7} {r['ranked']:>6} {r['top']:>4} {share:>5}  {hours:>10}  "
+              f"{r['suggested_poll_minutes']:>4}m  {'; '.join(r['notes'])}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.analytics",
+                                     description="Per-source fetch latency, failures and yield from the archive")
+    parser.add_argument("--db", default=ARCHIVE_DEFAULTS["path"], help="archive database")
+    parser.add_argument("--since", metavar="YYYY-MM-DD")
+    parser.add_argument("--until", metavar="YYYY-MM-DD")
+    parser.add_argument("--json", action="store_true", help="print the rows as JSON")
+    args = parser.parse_args(argv)
+    if not Path(args.db).exists():
+        parser.exit(1, f"No archive at {args.db}: run the pipeline (python -m src) or import the JSON archive "
+                       f"(python -m src.archive --db {args.db} import) first\n")
+
+    ctx = RunContext()
+    with ArchiveStore(args.db) as store:
+        report = source_report(store, ctx.sources, ctx.config, args.since, args.until)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
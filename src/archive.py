@@ -0,0 +1,300 @@
+"""Archive store - every briefing's entries, script, summary and metrics in one SQLite file.
+
+Run: python -m src.archive search "llama.cpp" --since 2026-02-01
+     python -m src.archive day 2026-02-22
+     python -m src.archive list --since 2026-02-01 --until 2026-02-28
+     python -m src.archive import            # load the old archive/*.json files
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+from src.packing import clean_summary
+
+# Defaults for the `archive:` section of config.yaml
+ARCHIVE_DEFAULTS = {
+    "path": "archive/archive.sqlite",
+    "legacy_files": False,  # also write archive/<date>.json and scripts/briefing-<date>.txt
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    date              TEXT PRIMARY KEY,
+    entries_found     INTEGER NOT NULL,
+    script            TEXT,
+    summary           TEXT,
+    script_word_count INTEGER,
+    audio_path        TEXT,
+    top_stories       TEXT NOT NULL DEFAULT '[]',
+    metrics           TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id        INTEGER PRIMARY KEY,
+    date      TEXT NOT NULL REFERENCES runs(date) ON DELETE CASCADE,
+    rank      INTEGER NOT NULL,
+    title     TEXT NOT NULL,
+    link      TEXT NOT NULL,
+    source    TEXT NOT NULL,
+    priority  TEXT,
+    published TEXT,
+    score     REAL,
+    summary   TEXT NOT NULL,
+    links     TEXT,
+    raw_summary TEXT,
+    extra     TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_date ON entries(date, rank);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    title, summary, source, content='entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, title, summary, source) VALUES (new.id, new.title, new.summary, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, title, summary, source)
+    VALUES ('delete', old.id, old.title, old.summary, old.source);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5(
+    script, summary, content='runs', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS runs_ai AFTER INSERT ON runs BEGIN
+    INSERT INTO runs_fts(rowid, script, summary) VALUES (new.rowid, new.script, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS runs_ad AFTER DELETE ON runs BEGIN
+    INSERT INTO runs_fts(runs_fts, rowid, script, summary) VALUES ('delete', old.rowid, old.script, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS runs_au AFTER UPDATE OF script, summary ON runs BEGIN
+    INSERT INTO runs_fts(runs_fts, rowid, script, summary) VALUES ('delete', old.rowid, old.script, old.summary);
+    INSERT INTO runs_fts(rowid, script, summary) VALUES (new.rowid, new.script, new.summary);
+END;
+"""
+
+
+# Columns added since the first release, for archives created before them
+_ADDED_COLUMNS = {"entries": {"raw_summary": "TEXT", "extra": "TEXT"}}
+
+# Entry keys with a column of their own (rank is positional: an entry loaded by get_run and
+# saved again in another order takes its new rank); the rest go to `extra` as JSON
+_ENTRY_COLUMNS = {"rank", "title", "link", "source", "priority", "published", "score", "summary", "links"}
+
+
+def _match(query: str, raw: bool = False) -> str:
+    """FTS5 query for plain search words: each quoted, so "llama.cpp" or "GPT-5" just work."""
+    if raw:
+        return query
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+def _date_range(since: str | None, until: str | None, column: str = "date") -> tuple[str, list]:
+    clauses, params = [], []
+    if since:
+        clauses.append(f"{column} >= ?")
+        params.append(since)
+    if until:
+        clauses.append(f"{column} <= ?")
+        params.append(until)
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def _entry_row(date: str, rank: int, entry: dict) -> tuple:
+    raw = entry.get("summary", "")
+    summary = clean_summary(raw)
+    extra = {k: v for k, v in entry.items() if k not in _ENTRY_COLUMNS}
+    return (date, rank, entry["title"], entry["link"], entry["source"], entry.get("priority"),
+            entry.get("published"), entry.get("score"), summary,
+            json.dumps(entry["links"]) if len(entry.get("links", [])) > 1 else None,
+            raw if raw != summary else None, json.dumps(extra, ensure_ascii=False, default=str) if extra else None)
+
+
+def _entry(row: sqlite3.Row) -> dict:
+    """An archived entry as the dict it was saved from, plus its rank."""
+    entry = {k: v for k, v in dict(row).items() if k not in ("id", "date", "links", "raw_summary", "extra")}
+    if row["raw_summary"] is not None:
+        entry["summary"] = row["raw_summary"]
+    if row["links"]:
+        entry["links"] = json.loads(row["links"])
+    return (json.loads(row["extra"]) if row["extra"] else {}) | entry
+
+
+class ArchiveStore:
+    """One row per day in `runs`, its ranked entries in `entries`, both full-text indexed.
+
+    Summaries are indexed cleaned (no HTML or hnrss boilerplate), but the raw
+    summary and the entry's other keys are kept too, so get_run hands back the
+    entries exactly as they were ranked (a backfill re-ranks them from there).
+    Each day is written in a single transaction; saving a date again replaces it.
+    """
+
+    def __init__(self, path: str = "archive/archive.sqlite"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(_SCHEMA)
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row["name"] for row in self.db.execute(f"PRAGMA table_info({table})")}
+            for name, kind in columns.items():
+                if name not in existing:
+                    self.db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def save_run(self, record: dict, script: str | None = None, summary: str | None = None) -> None:
+        """Store a day's archive record (the dict main.run builds) with its script and summary."""
+        with self.db:
+            self.db.execute("DELETE FROM runs WHERE date = ?", (record["date"],))
+            self.db.execute(
+                "INSERT INTO runs (date, entries_found, script, summary, script_word_count, audio_path, "
+                "top_stories, metrics) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (record["date"], record.get("entries_found", len(record.get("entries", []))), script, summary,
+                 record.get("script_word_count"), record.get("audio_path"),
+                 json.dumps(record.get("top_stories") or [], ensure_ascii=False),
+                 json.dumps(record["metrics"]) if record.get("metrics") else None),
+            )
+            self.db.executemany(
+                "INSERT INTO entries (date, rank, title, link, source, priority, published, score, summary, links, "
+                "raw_summary, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [_entry_row(record["date"], rank, e) for rank, e in enumerate(record.get("entries", []), 1)],
+            )
+
+    def save_metrics(self, date: str, run_metrics: dict) -> None:
+        """Attach a run's metrics to its day; a run that failed before archiving still gets a row for them."""
+        with self.db:
+            self.db.execute(
+                "INSERT INTO runs (date, entries_found, metrics) VALUES (?, 0, ?) "
+                "ON CONFLICT(date) DO UPDATE SET metrics = excluded.metrics", (date, json.dumps(run_metrics)))
+
+    def get_run(self, date: str) -> dict | None:
+        """Everything stored for one day, entries in rank order."""
+        row = self.db.execute("SELECT * FROM runs WHERE date = ?", (date,)).fetchone()
+        if row is None:
+            return None
+        run = dict(row)
+        run["top_stories"] = json.loads(run["top_stories"])
+        run["metrics"] = json.loads(run["metrics"]) if run["metrics"] else None
+        run["entries"] = [_entry(e) for e in self.db.execute(
+            "SELECT * FROM entries WHERE date = ? ORDER BY rank", (date,))]
+        return run
+
+    def runs(self, since: str | None = None, until: str | None = None) -> list[dict]:
+        """One summary row per day in the range, newest first."""
+        where, params = _date_range(since, until)
+        rows = self.db.execute(
+            "SELECT date, entries_found, script_word_count, top_stories FROM runs "
+            f"WHERE 1{where} ORDER BY date DESC", params)
+        return [{**dict(r), "top_stories": json.loads(r["top_stories"])} for r in rows]
+
+    def search(self, query: str, since: str | None = None, until: str | None = None,
+               limit: int = 20, raw: bool = False) -> list[dict]:
+        """Entries matching `query` (title, summary or source), best match first.
+
+        Words are matched as-is unless `raw`, which passes FTS5 syntax through
+        (e.g. 'claude OR gemini', 'agent*').
+        """
+        where, params = _date_range(since, until, "e.date")
+        rows = self.db.execute(
+            "SELECT e.date, e.rank, e.title, e.link, e.source, "
+            "snippet(entries_fts, -1, '[', ']', '…', 12) AS snippet "
+            "FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+            f"WHERE entries_fts MATCH ?{where} ORDER BY bm25(entries_fts, 5.0, 1.0, 1.0) LIMIT ?",
+            [_match(query, raw), *params, limit])
+        return [dict(r) for r in rows]
+
+    def search_briefings(self, query: str, since: str | None = None, until: str | None = None,
+                         limit: int = 20, raw: bool = False) -> list[dict]:
+        """Days whose audio script or WhatsApp summary mention `query`."""
+        where, params = _date_range(since, until, "r.date")
+        rows = self.db.execute(
+            "SELECT r.date, snippet(runs_fts, -1, '[', ']', '…', 12) AS snippet "
+            "FROM runs_fts JOIN runs r ON r.rowid = runs_fts.rowid "
+            f"WHERE runs_fts MATCH ?{where} ORDER BY r.date DESC LIMIT ?",
+            [_match(query, raw), *params, limit])
+        return [dict(r) for r in rows]
+
+    def import_json(self, archive_dir: str = "archive") -> int:
+        """Load daily archive/<date>.json files (with their scripts and -summary.json) into the store.
+
+        Days already in the store are skipped. Returns the number imported.
+        """
+        imported = 0
+        for path in sorted(Path(archive_dir).glob("????-??-??.json")):
+            record = json.loads(path.read_text())
+            date = record.get("date", path.stem)
+            if self.db.execute("SELECT 1 FROM runs WHERE date = ?", (date,)).fetchone():
+                continue
+            summary_path = path.with_name(f"{path.stem}-summary.json")
+            if not record.get("top_stories") and summary_path.exists():
+                record["top_stories"] = json.loads(summary_path.read_text())
+            script_path = Path(record.get("script_path") or "")
+            script = script_path.read_text() if script_path.is_file() else None
+            self.save_run({**record, "date": date}, script)
+            imported += 1
+        return imported
+
+
+def _print_entries(rows: list[dict]) -> None:
+    for r in rows:
+        print(f"{r['date']}  #{r['rank']:<3} {r['title']}  [{r['source']}]")
+        print(f"             {r['link']}")
+        if r.get("snippet"):
+            print(f"             {r['snippet']}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.archive", description="Query the briefing archive")
+    parser.add_argument("--db", default=ARCHIVE_DEFAULTS["path"], help="archive database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="full-text search over archived stories")
+    search.add_argument("query")
+    search.add_argument("--briefings", action="store_true", help="search scripts and summaries instead")
+    search.add_argument("--raw", action="store_true", help="query is FTS5 syntax (OR, NEAR, prefix*)")
+    search.add_argument("--limit", type=int, default=20)
+    for cmd in (search, commands.add_parser("list", help="days in a date range")):
+        cmd.add_argument("--since", metavar="YYYY-MM-DD")
+        cmd.add_argument("--until", metavar="YYYY-MM-DD")
+
+    day = commands.add_parser("day", help="one day's briefing")
+    day.add_argument("date", metavar="YYYY-MM-DD")
+
+    imp = commands.add_parser("import", help="load archive/<date>.json files")
+    imp.add_argument("archive_dir", nargs="?", default="archive")
+    args = parser.parse_args(argv)
+
+    with ArchiveStore(args.db) as store:
+        if args.command == "search" and args.briefings:
+            for r in store.search_briefings(args.query, args.since, args.until, args.limit, args.raw):
+                print(f"{r['date']}  {r['snippet']}")
+        elif args.command == "search":
+            _print_entries(store.search(args.query, args.since, args.until, args.limit, args.raw))
+        elif args.command == "list":
+            for r in store.runs(args.since, args.until):
+                titles = "; ".join(s["title"] for s in r["top_stories"][:3])
+                print(f"{r['date']}  {r['entries_found']:>4} entries  {titles}")
+        elif args.command == "day":
+            run = store.get_run(args.date)
+            if run is None:
+                parser.exit(1, f"No briefing archived for {args.date}\n")
+            print(f"=== {run['date']} — {run['entries_found']} entries ===\n")
+            if run["script"]:
+                print(f"{run['script']}\n")
+            if run["summary"]:
+                print(f"{run['summary']}\n")
+            _print_entries([{**e, "date": run["date"]} for e in run["entries"]])
+        elif args.command == "import":
+            print(f"Imported {store.import_json(args.archive_dir)} days into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
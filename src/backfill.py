@@ -0,0 +1,110 @@
+"""Backfill - make (or remake) the briefings for a range of past days, several at once.
+
+Run: python -m src backfill 2026-02-16 2026-02-22
+     python -m src backfill 2026-02-16 2026-02-22 --fresh     # e.g. after a prompt change
+     python -m src backfill 2026-02-20 --workers 1
+
+Each day's entries are rebuilt from what was published in the window before
+that morning's delivery time: from the ingest store when it still holds the
+day (see ingest.retain_hours), otherwise from the entries archived with the
+day's original briefing. Nothing is fetched and nothing is delivered.
+
+Days run in threads of one process, so the `llm.rate_limit` and
+`tts.rate_limit` limiters (src/ratelimit.py) are shared by all of them.
+Every day is checkpointed like a normal run, so an interrupted backfill
+picks up where it stopped; pipeline output goes to runs/backfill-<start>-<end>.log.
+"""
+
+import sys
+import time
+from concurrent.futures import as_completed
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+
+from src import metrics
+from src.aggregator import select_entries
+from src.archive import ARCHIVE_DEFAULTS, ArchiveStore
+from src.checkpoint import RUNS_DIR, RunDir
+from src.context import RunContext
+from src.ingest import read_window
+from src.main import run
+from src.schedule import delivery_time, load_schedule
+
+
+def days_between(start: str, end: str | None = None) -> list[str]:
+    """Every date from `start` to `end` inclusive, as YYYY-MM-DD."""
+    first, last = date.fromisoformat(start), date.fromisoformat(end or start)
+    if last < first:
+        raise ValueError(f"backfill range ends ({last}) before it starts ({first})")
+    return [(first + timedelta(days=n)).isoformat() for n in range((last - first).days + 1)]
+
+
+def rebuild_entries(day: str, sources: dict, config: dict, hours_back: int = 48) -> tuple[list[dict], str]:
+    """`day`'s ranked entries and where they came from ("ingest", "archive" or "none")."""
+    as_of = delivery_time(day, load_schedule(config))
+    origin = "ingest"
+    entries = read_window(sources, hours_back, as_of=as_of)
+    if not entries:
+        archive_cfg = {**ARCHIVE_DEFAULTS, **(config.get("archive") or {})}
+        origin, entries = "none", []
+        if Path(archive_cfg["path"]).exists():
+            with ArchiveStore(archive_cfg["path"]) as store:
+                archived = store.get_run(day)
+            if archived and archived["entries"]:
+                origin, entries = "archive", archived["entries"]
+    return select_entries(entries, sources, now=as_of, today=day), origin
+
+
+def backfill(start: str, end: str | None = None, workers: int = 3, use_cache: bool = True,
+             fresh: bool = False) -> list[dict]:
+    """Make every day's briefing in the range; returns one result row per day, in date order."""
+    days = days_between(start, end)
+    ctx = RunContext()
+    config, sources = ctx.config, ctx.sources
+    recorder = metrics.Recorder()  # every day's spans, for the summary at the end
+    log_path = Path(RUNS_DIR) / f"backfill-{days[0]}-{days[-1]}.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    out = sys.stdout
+
+    def one_day(day: str) -> dict:
+        started = time.perf_counter()
+        day_recorder = metrics.reset()
+        row = {"date": day, "entries": 0, "origin": "checkpoint", "status": "ok"}
+        try:
+            entries = None
+            if fresh or not RunDir(day).done("entries"):
+                entries, row["origin"] = rebuild_entries(day, sources, config)
+                row["entries"] = len(entries)
+                if not entries:
+                    raise ValueError("no entries in the ingest store or archive for this day")
+            run(use_cache=use_cache, entries=entries, fresh=fresh, day=day, deliver=False, recorder=day_recorder,
+                ctx=ctx)
+        except SystemExit as e:  # run() exits on e.g. a TTS failure, after printing why
+            row["status"] = f"failed: {e.code if isinstance(e.code, str) else f'see {log_path}'}"
+        except Exception as e:
+            row["status"] = f"failed: {e}"
+        finally:
+            recorder.absorb(day_recorder)
+        row["seconds"] = round(time.perf_counter() - started, 2)
+        return row
+
+    print(f"Backfilling {len(days)} days, {min(workers, len(days))} at a time (log: {log_path})", file=out)
+    started = time.perf_counter()
+    results = []
+    with open(log_path, "a") as log, redirect_stdout(log), \
+            metrics.Executor(max_workers=workers, thread_name_prefix="backfill") as pool:
+        futures = [pool.submit(one_day, day) for day in days]
+        for n, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            results.append(row)
+            print(f"  [{n}/{len(days)}] {row['date']}  {row['seconds']:6.1f}s  {row['entries']:>4} entries "
+                  f"({row['origin']})  {row['status']}", file=out, flush=True)
+
+    results.sort(key=lambda r: r["date"])
+    failed = [r for r in results if r["status"] != "ok"]
+    print(f"\nDone in {time.perf_counter() - started:.1f}s: {len(results) - len(failed)} days made, "
+          f"{len(failed)} failed", file=out)
+    with redirect_stdout(out):
+        metrics.print_summary(recorder)
+    return results
@@ -0,0 +1,83 @@
+"""Disk cache - content-addressed byte store with a TTL and size-capped LRU eviction."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class DiskCache:
+    """One file per key under `directory`.
+
+    A file's mtime is when it was written (for the TTL) and its atime is when
+    it was last read (for LRU eviction); both are set explicitly so mount
+    options like noatime don't matter. Safe to share across threads.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: float | None = None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Stable hash of the parts that determine a cached value."""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self.ttl_seconds is not None and time.time() - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                raise FileNotFoundError
+            data = path.read_bytes()
+            os.utime(path, (time.time(), stat.st_mtime))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_name(f"{key}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used files until the cache fits in max_bytes."""
+        with self._lock:
+            files = []
+            for path in self.directory.iterdir():
+                if path.suffix == ".tmp":
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_atime, stat.st_size, path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,108 @@
+"""Run checkpoints - each stage's output for a day, under runs/<date>/ with a manifest of content hashes.
+
+runs/2026-02-22/manifest.json records, for every finished stage, the file it
+wrote, its sha256, and the hashes of the stage outputs it was made from. A
+stage counts as done only while its file still matches its hash and its inputs
+are unchanged, so re-running `python -m src aggregate` makes the saved script,
+summary and audio stale, and the next run regenerates them.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+RUNS_DIR = "runs"
+
+# Stage -> file name inside the day's run directory (audio lives under audio/, see main.run)
+STAGE_FILES = {
+    "entries": "entries.json",
+    "script": "script.txt",
+    "summary": "summary.txt",
+    "delivery": "receipt.json",
+}
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file and rename, so a crash never leaves half a file behind."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.part")
+    partial.write_bytes(data)
+    os.replace(partial, path)
+
+
+class RunDir:
+    """One day's checkpoints: runs/<date>/ and its manifest."""
+
+    def __init__(self, day: str, root: str = RUNS_DIR):
+        self.day = day
+        self.path = Path(root) / day
+        self.manifest_path = self.path / "manifest.json"
+        self._lock = threading.Lock()
+        try:
+            self.manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            self.manifest = {"date": day, "stages": {}}
+
+    def file(self, stage: str) -> Path:
+        """Where a stage's output goes; "script:ur" (an edition's stage) lives under runs/<date>/ur/."""
+        name, _, edition = stage.partition(":")
+        return self.path / edition / STAGE_FILES[name]
+
+    def _hash(self, stage: str) -> str | None:
+        info = self.manifest["stages"].get(stage)
+        return info["sha256"] if info else None
+
+    def done(self, stage: str) -> bool:
+        """True if the stage's output is on disk, unmodified, and made from the current inputs."""
+        info = self.manifest["stages"].get(stage)
+        if not info:
+            return False
+        try:
+            if _sha256(Path(info["path"]).read_bytes()) != info["sha256"]:
+                return False
+        except OSError:
+            return False
+        return all(self._hash(name) == sha and self.done(name) for name, sha in info["inputs"].items())
+
+    def record(self, stage: str, path: str | Path, inputs: tuple[str, ...] = ()) -> None:
+        """Mark a file already written by the stage (e.g. the audio) as its checkpoint."""
+        data = Path(path).read_bytes()
+        with self._lock:
+            self.manifest["stages"][stage] = {
+                "path": str(path),
+                "sha256": _sha256(data),
+                "bytes": len(data),
+                "inputs": {name: self._hash(name) for name in inputs},
+                "saved_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+            }
+            _write_atomic(self.manifest_path, json.dumps(self.manifest, indent=2).encode())
+
+    def save(self, stage: str, data: str | bytes, inputs: tuple[str, ...] = ()) -> Path:
+        path = self.file(stage)
+        _write_atomic(path, data.encode() if isinstance(data, str) else data)
+        self.record(stage, path, inputs)
+        return path
+
+    def save_json(self, stage: str, obj, inputs: tuple[str, ...] = ()) -> Path:
+        return self.save(stage, json.dumps(obj, ensure_ascii=False, indent=2, default=str), inputs)
+
+    def load(self, stage: str) -> str | None:
+        """The stage's checkpointed output, or None if it isn't done (or is stale)."""
+        return self.file(stage).read_text() if self.done(stage) else None
+
+    def load_json(self, stage: str):
+        text = self.load(stage)
+        return json.loads(text) if text is not None else None
+
+    def clear(self) -> None:
+        """Forget every checkpoint for the day; the files stay until overwritten."""
+        with self._lock:
+            self.manifest = {"date": self.day, "stages": {}}
+            _write_atomic(self.manifest_path, json.dumps(self.manifest, indent=2).encode())
@@ -0,0 +1,19 @@
+"""Config loading - config/config.yaml and sources/sources.yaml.
+
+yaml is imported on first use, so modules can import these without paying
+for it at CLI startup.
+"""
+
+
+def load_config(config_path: str = "config/config.yaml") -> dict:
+    import yaml
+
+    with open(config_path) as f:
+        return yaml.safe_load(f)
+
+
+def load_sources(sources_path: str = "sources/sources.yaml") -> dict:
+    import yaml
+
+    with open(sources_path) as f:
+        return yaml.safe_load(f)
@@ -0,0 +1,211 @@
+"""Run context - config, sources and API clients, set up once per process and shared by every stage.
+
+config.yaml and sources.yaml are parsed and checked against a small schema
+the first time they're needed, and again only when the file changes on disk,
+so a daemon picks up edits without restarting and nothing re-parses YAML per
+Claude call. The Anthropic, ElevenLabs and feed-fetching HTTP clients are
+deliberately process-wide rather than per context: each is made once and
+shared by every RunContext (and http_client() hands out the HTTP one to code
+that has no context, like a feed fetch deep in a worker), so their keep-alive
+connection pools carry over between stages, editions and days. A run makes
+one context and passes it down; what differs between contexts is only which
+config.yaml and sources.yaml they read.
+
+    ctx = RunContext()
+    ctx.config["llm"]["model"]
+    ctx.anthropic().messages.create(...)
+"""
+
+import os
+import re
+import threading
+import zoneinfo
+from typing import TYPE_CHECKING
+
+from src.config import load_config, load_sources
+
+if TYPE_CHECKING:
+    import anthropic
+    import httpx
+
+CONFIG_PATH = "config/config.yaml"
+SOURCES_PATH = "sources/sources.yaml"
+
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36")
+
+_NUMBER = (int, float)
+
+# Expected type of each section and setting, by dotted path; anything may be left out (defaults apply)
+CONFIG_SCHEMA = {
+    "output": dict, "delivery": dict, "style": dict, "editions": list, "archive": dict, "llm": dict, "tts": dict,
+    "delivery.channels": list, "delivery.max_workers": int, "delivery.retries": int,
+    "delivery.retry_backoff_seconds": _NUMBER, "delivery.send_timeout_seconds": _NUMBER,
+    "delivery.schedule": dict, "delivery.schedule.timezone": str, "delivery.schedule.time": str,
+    "delivery.schedule.prefetch_minutes": _NUMBER, "delivery.schedule.prefetch_every_minutes": _NUMBER,
+    "delivery.schedule.final_prefetch_minutes": _NUMBER, "delivery.schedule.max_entries_age_minutes": _NUMBER,
+    "style.max_stories": int,
+    "archive.path": str, "archive.legacy_files": bool,
+    "llm.model": str, "llm.max_tokens": int, "llm.timeout": _NUMBER, "llm.max_retries": int,
+    "llm.retry_backoff": _NUMBER, "llm.packing": dict, "llm.packing.token_budget": int,
+    "llm.packing.summary_chars": int, "llm.cache": dict, "llm.cache.dir": str, "llm.cache.ttl_hours": _NUMBER,
+    "llm.cache.max_mb": _NUMBER, "llm.rate_limit": dict, "llm.rate_limit.max_concurrent": int,
+    "llm.rate_limit.requests_per_minute": _NUMBER,
+    "tts.voice_id": str, "tts.model": str, "tts.max_workers": int, "tts.chunk_chars": int,
+    "tts.pause_ms": int, "tts.max_retries": int, "tts.retry_backoff": _NUMBER,
+    "tts.cache": (dict, bool), "tts.cache.dir": str, "tts.cache.max_mb": _NUMBER,
+    "tts.rate_limit": dict, "tts.rate_limit.max_concurrent": int, "tts.rate_limit.requests_per_minute": _NUMBER,
+}
+EDITION_SCHEMA = {
+    "id": str, "language": str, "listener": str, "timezone": str, "voice_id": str, "model": str, "channels": list,
+}
+SOURCES_SCHEMA = {
+    "fetch": dict, "ingest": dict, "rss_feeds": list, "dedup": dict, "seen": dict, "ranking": dict,
+    "keywords_boost": list, "keywords_skip": list,
+    "fetch.max_workers": int, "fetch.feed_timeout": _NUMBER, "fetch.total_timeout": _NUMBER,
+    "ingest.enabled": bool, "ingest.path": str,
+    "ranking.max_entries": int, "ranking.priority_weights": dict,
+}
+
+_TIME_RE = re.compile(r"([01]?\d|2[0-3]):[0-5]\d")
+
+
+class ConfigError(ValueError):
+    """A config file that doesn't match its schema; lists every problem at once."""
+
+
+def _problems(data, schema: dict) -> list[str]:
+    if not isinstance(data, dict):
+        return [f"expected a mapping at the top level, got {type(data).__name__}"]
+    problems = []
+    for key, expected in schema.items():
+        value, parent = data, None
+        for part in key.split("."):
+            parent, value = value, value.get(part) if isinstance(value, dict) else None
+        if value is None or not isinstance(parent, dict):
+            continue
+        allowed = expected if isinstance(expected, tuple) else (expected,)
+        if not isinstance(value, expected) or (isinstance(value, bool) and bool not in allowed):
+            names = " or ".join(t.__name__ for t in allowed)
+            problems.append(f"{key} should be a {names}, got {type(value).__name__} ({value!r})")
+    return problems
+
+
+def _timezone_problem(key: str, name) -> list[str]:
+    if not isinstance(name, str):
+        return []
+    try:
+        zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return [f"{key} is not a known timezone ({name!r})"]
+    return []
+
+
+def validate_config(config: dict, path: str = CONFIG_PATH) -> dict:
+    problems = _problems(config, CONFIG_SCHEMA)
+    if not problems:
+        schedule = (config.get("delivery") or {}).get("schedule") or {}
+        problems += _timezone_problem("delivery.schedule.timezone", schedule.get("timezone"))
+        if isinstance(schedule.get("time"), str) and not _TIME_RE.fullmatch(schedule["time"]):
+            problems.append(f"delivery.schedule.time should be HH:MM, got {schedule['time']!r}")
+        for i, edition in enumerate(config.get("editions") or []):
+            if not isinstance(edition, dict):
+                problems.append(f"editions[{i}] should be a mapping, got {type(edition).__name__}")
+                continue
+            problems += [f"editions[{i}].{problem}" for problem in _problems(edition, EDITION_SCHEMA)]
+            problems += _timezone_problem(f"editions[{i}].timezone", edition.get("timezone"))
+    if problems:
+        raise ConfigError(f"{path}: " + "; ".join(problems))
+    return config
+
+
+def validate_sources(sources: dict, path: str = SOURCES_PATH) -> dict:
+    problems = _problems(sources, SOURCES_SCHEMA)
+    for i, feed in enumerate((sources.get("rss_feeds") or []) if not problems else []):
+        if not isinstance(feed, dict) or not feed.get("name") or not feed.get("url"):
+            problems.append(f"rss_feeds[{i}] needs a name and a url")
+    if problems:
+        raise ConfigError(f"{path}: " + "; ".join(problems))
+    return sources
+
+
+# Parsed files by absolute path: (mtime_ns, size, data)
+_files: dict[str, tuple[int, int, dict]] = {}
+_files_lock = threading.Lock()
+
+# Clients shared by every context in the process
+_clients: dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _load(path: str, parse, validate) -> dict:
+    """The parsed, validated file, re-read only if it changed since last time."""
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    with _files_lock:
+        cached = _files.get(key)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        data = validate(parse(key) or {}, path)
+        _files[key] = (stat.st_mtime_ns, stat.st_size, data)
+        return data
+
+
+def _client(key: tuple, make):
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = make()
+        return _clients[key]
+
+
+class RunContext:
+    """Settings and clients for one run; cheap to make, since everything it hands out is shared.
+
+    The dicts returned by `config` and `sources` are shared too; treat them as read-only.
+    """
+
+    def __init__(self, config_path: str = CONFIG_PATH, sources_path: str = SOURCES_PATH):
+        self.config_path = config_path
+        self.sources_path = sources_path
+
+    @property
+    def config(self) -> dict:
+        return _load(self.config_path, load_config, validate_config)
+
+    @property
+    def sources(self) -> dict:
+        return _load(self.sources_path, load_sources, validate_sources)
+
+    def anthropic(self) -> "anthropic.Anthropic":
+        """The Anthropic client, so concurrent calls share one connection pool.
+
+        The SDK's own retries are off; scriptwriter._create_message retries with
+        backoff instead so every attempt is logged. The SDK (~1.5s to import) is
+        loaded here, on first use, rather than when the CLI starts.
+        """
+        import anthropic
+
+        timeout = (self.config.get("llm") or {}).get("timeout", 120)
+        return _client(("anthropic", timeout), lambda: anthropic.Anthropic(timeout=timeout, max_retries=0))
+
+    def elevenlabs(self, api_key: str):
+        """The ElevenLabs client for a key.
+
+        ELEVENLABS_BASE_URL points at a proxy or local stand-in (see benchmarks/).
+        """
+        from elevenlabs.client import ElevenLabs
+
+        base_url = os.getenv("ELEVENLABS_BASE_URL")
+        return _client(("elevenlabs", api_key, base_url), lambda: ElevenLabs(api_key=api_key, base_url=base_url))
+
+    def http(self) -> "httpx.Client":
+        return http_client()
+
+
+def http_client() -> "httpx.Client":
+    """The process's HTTP client feeds are fetched with; keeps connections to each feed host alive between fetches."""
+    import httpx
+
+    return _client(("http",), lambda: httpx.Client(
+        headers={"User-Agent": USER_AGENT}, follow_redirects=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)))
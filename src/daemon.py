@@ -0,0 +1,141 @@
+"""Scheduler daemon - one long-running process that delivers the briefing at delivery.schedule.
+
+Run: python -m src --daemon
+
+Imports and API clients are set up once. Feeds are fetched and ranked on a
+rolling schedule in the hour before delivery (mostly 304s from the feed
+cache, or reads of the ingest store when `ingest.enabled`, which the daemon
+then keeps polling), so at the scheduled time only the Claude, TTS and
+delivery steps remain.
+"""
+
+import os
+import signal
+import threading
+import zoneinfo
+from datetime import datetime, timedelta, tzinfo
+
+from src import metrics
+from src.aggregator import aggregate
+from src.context import CONFIG_PATH, RunContext
+from src.ingest import run_forever
+from src.main import run
+from src.schedule import load_schedule
+
+_MAX_SLEEP = 60  # seconds; wake up regularly so a suspended laptop or clock change is noticed
+
+
+def next_delivery(now: datetime, schedule: dict) -> datetime:
+    """The next delivery time strictly after `now`, in the schedule's timezone."""
+    tz = zoneinfo.ZoneInfo(schedule["timezone"])
+    hour, minute = map(int, schedule["time"].split(":"))
+    local = now.astimezone(tz)
+    delivery = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if delivery <= local:
+        delivery = (delivery.replace(tzinfo=None) + timedelta(days=1)).replace(tzinfo=tz)
+    return delivery
+
+
+def prefetch_times(delivery: datetime, schedule: dict) -> list[datetime]:
+    """When to refresh feeds before `delivery`: every prefetch_every_minutes, ending at the final prefetch."""
+    final = delivery - timedelta(minutes=schedule["final_prefetch_minutes"])
+    at = delivery - timedelta(minutes=schedule["prefetch_minutes"])
+    times = []
+    while at < final:
+        times.append(at)
+        at += timedelta(minutes=schedule["prefetch_every_minutes"])
+    return times + [final]
+
+
+def _wait_until(when: datetime, stop: threading.Event) -> bool:
+    """Sleep until `when`; True if the daemon was asked to stop meanwhile."""
+    while not stop.is_set():
+        remaining = (when - datetime.now(when.tzinfo)).total_seconds()
+        if remaining <= 0:
+            return False
+        stop.wait(min(remaining, _MAX_SLEEP))
+    return True
+
+
+def _prefetch(ctx: RunContext, tz: tzinfo) -> tuple[list[dict], datetime] | None:
+    try:
+        return aggregate(ctx=ctx), datetime.now(tz)
+    except Exception as e:
+        print(f"  Warning: pre-fetch failed: {e}")
+        return None
+
+
+def _warm_up(ctx: RunContext) -> None:
+    """Open the Anthropic and ElevenLabs connections ahead of delivery with cheap model-list calls."""
+    try:
+        ctx.anthropic().models.list(limit=1)
+    except Exception as e:
+        print(f"  Warning: Anthropic warm-up failed: {e}")
+    if os.getenv("ELEVENLABS_API_KEY"):
+        try:
+            ctx.elevenlabs(os.environ["ELEVENLABS_API_KEY"]).models.list()
+        except Exception as e:
+            print(f"  Warning: ElevenLabs warm-up failed: {e}")
+
+
+def run_day(delivery: datetime, schedule: dict, ctx: RunContext, stop: threading.Event, **run_kwargs) -> bool:
+    """Pre-fetch on schedule, then deliver at `delivery`. False if stopped before delivering.
+
+    The pre-fetches record into the day's recorder, so their fetch spans are saved with the run.
+    """
+    recorder = metrics.reset()
+    now = datetime.now(delivery.tzinfo)
+    times = prefetch_times(delivery, schedule)
+    upcoming = [t for t in times if t > now]
+    if len(upcoming) < len(times):
+        upcoming.insert(0, now)  # started inside the window: fetch right away
+
+    prefetched = None
+    for at in upcoming:
+        if _wait_until(at, stop):
+            return False
+        print(f"\n[daemon] Pre-fetching feeds for the {delivery:%H:%M} briefing...")
+        prefetched = _prefetch(ctx, delivery.tzinfo) or prefetched
+    _warm_up(ctx)
+
+    if _wait_until(delivery, stop):
+        return False
+    entries = None
+    if prefetched:
+        age = datetime.now(delivery.tzinfo) - prefetched[1]
+        if age <= timedelta(minutes=schedule["max_entries_age_minutes"]):
+            entries = prefetched[0]
+        else:
+            print(f"  Pre-fetched entries are {age.total_seconds() / 60:.0f} min old, fetching again")
+    try:
+        run(entries=entries, recorder=recorder, ctx=ctx, **run_kwargs)
+    except (Exception, SystemExit) as e:
+        # One bad morning must not take the daemon down with it
+        print(f"  Error: briefing failed: {e!r}")
+    return True
+
+
+def serve(use_cache: bool = True, metrics_file: str | None = None, config_path: str = CONFIG_PATH,
+          stop: threading.Event | None = None) -> None:
+    """Deliver a briefing every day until SIGINT/SIGTERM (or `stop` is set)."""
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+    ctx = RunContext(config_path)
+    if (ctx.sources.get("ingest") or {}).get("enabled"):
+        # Feeds are polled on their own schedules all day; pre-fetches just read the store
+        threading.Thread(target=run_forever, kwargs={"sources_path": ctx.sources_path, "stop": stop},
+                         name="ingest", daemon=True).start()
+
+    while not stop.is_set():
+        # Re-read (when changed) every day so schedule edits apply without a restart
+        cfg = ctx.config
+        schedule = load_schedule(cfg)
+        delivery = next_delivery(datetime.now().astimezone(), schedule)
+        print(f"[daemon] Next briefing {delivery:%a %Y-%m-%d %H:%M %Z}, "
+              f"pre-fetching from {delivery - timedelta(minutes=schedule['prefetch_minutes']):%H:%M}")
+        if not run_day(delivery, schedule, ctx, stop, use_cache=use_cache, metrics_file=metrics_file):
+            break
+    print("[daemon] Stopped")
@@ -0,0 +1,174 @@
+"""Story dedup - merges the same story reported by several sources into one entry."""
+
+import random
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from src.packing import clean_summary
+
+# MinHash signature length and LSH banding: 8 bands of 4 rows puts the
+# candidate threshold around Jaccard 0.6, candidates are then verified exactly.
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+
+_MASK64 = (1 << 64) - 1
+_EMPTY = _MASK64 + 1
+_MERSENNE_PRIME = (1 << 61) - 1
+# (a * h + b) mod p — a universal hash family, so the NUM_PERM minima are independent
+_PERMS = [(random.Random(i).randrange(1, _MERSENNE_PRIME), random.Random(-i).randrange(_MERSENNE_PRIME))
+          for i in range(NUM_PERM)]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_TRACKING_PARAM_RE = re.compile(r"^(utm_\w+|ref|ref_src|fbclid|gclid|mc_cid|mc_eid)$")
+
+DEDUP_DEFAULTS = {
+    "title_similarity": 0.7,    # Jaccard over title words
+    "summary_similarity": 0.8,  # Jaccard over summary word 3-shingles
+    "min_summary_words": 12,    # shorter summaries are too generic to compare
+}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a story URL: no scheme, www., fragment, trailing slash or tracking params."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    path = parts.path.rstrip("/")
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAM_RE.match(k)
+    ))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def _words(text: str) -> list[str]:
+    # clean_summary drops hnrss link boilerplate, identical across unrelated stories
+    return _WORD_RE.findall(clean_summary(text).lower())
+
+
+def _title_shingles(entry: dict) -> frozenset:
+    words = _words(entry.get("title", ""))
+    return frozenset(words) if len(words) >= 3 else frozenset()
+
+
+def _summary_shingles(entry: dict, min_words: int) -> frozenset:
+    words = _words(entry.get("summary", ""))[:60]
+    if len(words) < min_words:
+        return frozenset()
+    return frozenset(" ".join(words[i:i + 3]) for i in range(len(words) - 2))
+
+
+def _minhash(shingles: frozenset) -> tuple:
+    """Classic MinHash, one min per hash permutation. Used for short title sets."""
+    hashes = [hash(s) & _MASK64 for s in shingles]
+    return tuple(min([(a * h + b) % _MERSENNE_PRIME for h in hashes]) for a, b in _PERMS)
+
+
+def _one_permutation_minhash(shingles: frozenset) -> tuple:
+    """One-permutation MinHash: a single hash per shingle, binned into NUM_PERM slots.
+
+    Costs O(len(shingles)) rather than O(len(shingles) * NUM_PERM). Empty slots
+    borrow from the next filled slot (rotation densification) so small sets
+    still produce comparable signatures. Only suitable for specific shingles
+    (summary 3-grams): sets sharing one common word would collide through the
+    borrowed slots.
+    """
+    bins = [_EMPTY] * NUM_PERM
+    for s in shingles:
+        h = hash(s) & _MASK64
+        slot, value = h % NUM_PERM, h // NUM_PERM
+        if value < bins[slot]:
+            bins[slot] = value
+    sig = list(bins)
+    for i in range(NUM_PERM):
+        if bins[i] == _EMPTY:
+            step = 1
+            while bins[(i + step) % NUM_PERM] == _EMPTY:
+                step += 1
+            sig[i] = (bins[(i + step) % NUM_PERM], step)
+    return tuple(sig)
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b)
+
+
+def _near_duplicate_pairs(shingle_sets: list[frozenset], threshold: float, signature=_minhash):
+    """Yield (i, j) index pairs whose shingle sets have Jaccard >= threshold.
+
+    LSH banding keeps this roughly linear: only entries that share a band
+    bucket are compared exactly.
+    """
+    buckets: dict[tuple, list[int]] = {}
+    for i, shingles in enumerate(shingle_sets):
+        if not shingles:
+            continue
+        sig = signature(shingles)
+        for band in range(BANDS):
+            key = (band, sig[band * ROWS:(band + 1) * ROWS])
+            buckets.setdefault(key, []).append(i)
+
+    seen = set()
+    for members in buckets.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pair = (members[a], members[b])
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                if _jaccard(shingle_sets[pair[0]], shingle_sets[pair[1]]) >= threshold:
+                    yield pair
+
+
+def dedup_entries(entries: list[dict], dedup_config: dict | None = None) -> list[dict]:
+    """Merge entries that share a normalized URL or have near-identical titles/summaries.
+
+    Each cluster becomes one entry at the position of its first member (so the
+    incoming ranking is kept), with every source and link collected under
+    `sources` and `links`.
+    """
+    cfg = {**DEDUP_DEFAULTS, **(dedup_config or {})}
+
+    parent = list(range(len(entries)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            # Root is always the earliest member, i.e. the best-ranked one
+            parent[max(ri, rj)] = min(ri, rj)
+
+    by_url: dict[str, int] = {}
+    for i, entry in enumerate(entries):
+        if entry.get("link"):
+            url = normalize_url(entry["link"])
+            if url in by_url:
+                union(by_url[url], i)
+            else:
+                by_url[url] = i
+
+    titles = [_title_shingles(e) for e in entries]
+    for i, j in _near_duplicate_pairs(titles, cfg["title_similarity"]):
+        union(i, j)
+    summaries = [_summary_shingles(e, cfg["min_summary_words"]) for e in entries]
+    for i, j in _near_duplicate_pairs(summaries, cfg["summary_similarity"],
+                                      signature=_one_permutation_minhash):
+        union(i, j)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(entries)):
+        clusters.setdefault(find(i), []).append(i)
+
+    merged = []
+    for root in sorted(clusters):
+        members = [entries[i] for i in clusters[root]]
+        entry = dict(members[0])
+        if len(members) > 1:
+            entry["sources"] = list(dict.fromkeys(m["source"] for m in members))
+            entry["links"] = list(dict.fromkeys(m["link"] for m in members if m.get("link")))
+        merged.append(entry)
+    return merged
@@ -1,50 +1,167 @@
-"""WhatsApp delivery via openclaw CLI."""
+"""Delivery via the openclaw CLI - every recipient on every enabled channel in `delivery.channels`.
 
+Sends fan out over a bounded pool, so a morning with 500 subscribers takes
+about as long as the slowest batch of sends rather than all of them in a
+row. Each recipient is retried with backoff on its own, and one recipient
+failing doesn't hold up or fail the others.
+"""
+
+import errno
 import os
 import shutil
 import subprocess
+import time
 from pathlib import Path
 
+from src import metrics
 
-def deliver_whatsapp(audio_path: str, text: str) -> None:
-    """Send MP3 voice note + English text summary to WhatsApp via openclaw.
 
-    Args:
-        audio_path: Path to the MP3 audio file (Urdu TTS briefing).
-        text: English summary string to send as the WhatsApp text message.
+# Defaults for the `delivery:` section of config.yaml
+DELIVERY_DEFAULTS = {
+    "max_workers": 16,            # openclaw processes running at once
+    "retries": 2,                 # extra attempts per recipient after a failed send
+    "retry_backoff_seconds": 2.0, # doubled after every failed attempt
+    "send_timeout_seconds": 120,
+    "channels": [{"type": "whatsapp", "enabled": True}],
+}
 
-    Requires:
-        - openclaw installed and running locally
-        - WHATSAPP_TARGET_NUMBER env var (E.164 format, e.g. +971501234567)
-    """
-    target = os.getenv("WHATSAPP_TARGET_NUMBER")
-    if not target:
-        raise ValueError("WHATSAPP_TARGET_NUMBER env var not set")
+# Where a channel's recipients come from when it lists none itself (comma-separated)
+_RECIPIENTS_ENV = {"whatsapp": "WHATSAPP_TARGET_NUMBER", "telegram": "TELEGRAM_TARGET"}
+
+
+class DeliveryError(RuntimeError):
+    """Some recipients still failed after their retries; `report` says who got it and who didn't."""
 
-    # openclaw only allows media from its state dir or system tmp.
-    # Copy the MP3 to ~/.openclaw/media/ before sending.
+    def __init__(self, report: dict):
+        failed = report["failed"]
+        super().__init__(f"{len(failed)} of {len(failed) + len(report['sent'])} sends failed: "
+                         + "; ".join(f"{f['recipient']}: {f['error']}" for f in failed[:3]))
+        self.report = report
+
+
+def recipients(delivery_config: dict | None = None) -> list[str]:
+    """Every `channel:target` to deliver to, from each enabled channel's recipients,
+    recipients_file (one per line, # comments) or recipients_env variable."""
+    cfg = {**DELIVERY_DEFAULTS, **(delivery_config or {})}
+    found = []
+    for channel in cfg["channels"]:
+        if not channel.get("enabled", True):
+            continue
+        targets = list(channel.get("recipients") or [])
+        if channel.get("recipients_file"):
+            lines = Path(channel["recipients_file"]).read_text().splitlines()
+            targets += [line.split("#")[0].strip() for line in lines]
+        if not targets:
+            env = channel.get("recipients_env") or _RECIPIENTS_ENV.get(channel["type"], "")
+            targets = os.getenv(env, "").split(",")
+        found += [f"{channel['type']}:{t.strip()}" for t in targets if str(t).strip()]
+    if not found:
+        raise ValueError("No delivery recipients: set WHATSAPP_TARGET_NUMBER or delivery.channels[].recipients")
+    return list(dict.fromkeys(found))
+
+
+def stage_media(audio_path: str) -> Path:
+    """Make the MP3 available in ~/.openclaw/media without copying its bytes.
+
+    openclaw only allows media from its state dir or system tmp. A hardlink is
+    atomic and free; a copy (to a temp name, then renamed) is only the fallback
+    when the media dir is on another filesystem.
+    """
     media_dir = Path.home() / ".openclaw" / "media"
     media_dir.mkdir(parents=True, exist_ok=True)
     staged = media_dir / Path(audio_path).name
-    shutil.copy2(audio_path, staged)
-
-    # 1. Send MP3 as voice note
-    print(f"  Sending voice note to {target}...")
-    subprocess.run([
-        "openclaw", "message", "send",
-        "--channel", "whatsapp",
-        "--target", target,
-        "--media", str(staged),
-        "--message", "Your AI news briefing is ready",
-    ], check=True)
-    print("  Voice note sent.")
-
-    # 2. Send English text summary
+    tmp = staged.with_name(f".{staged.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(audio_path, tmp)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        shutil.copy2(audio_path, tmp)
+    os.replace(tmp, staged)
+    return staged
+
+
+def _send(recipient: str, cfg: dict, kind: str, message: str, media: Path | None = None) -> dict:
+    """One openclaw send, retried with backoff; never raises, the result says how it went."""
+    channel, target = recipient.split(":", 1)
+    cmd = ["openclaw", "message", "send", "--channel", channel, "--target", target]
+    if media:
+        cmd += ["--media", str(media)]
+    cmd += ["--message", message]
+
+    started = time.perf_counter()
+    error = None
+    for attempt in range(1, cfg["retries"] + 2):
+        try:
+            with metrics.span("deliver", kind=kind, channel=channel, attempt=attempt):
+                subprocess.run(cmd, check=True, capture_output=True, timeout=cfg["send_timeout_seconds"])
+            error = None
+            break
+        except (OSError, subprocess.SubprocessError) as e:
+            stderr = getattr(e, "stderr", None)
+            error = (stderr.decode(errors="replace").strip() if stderr else "") or str(e)
+            if attempt <= cfg["retries"]:
+                time.sleep(cfg["retry_backoff_seconds"] * 2 ** (attempt - 1))
+    return {"recipient": recipient, "ok": error is None, "attempts": attempt,
+            "seconds": round(time.perf_counter() - started, 3), "error": error}
+
+
+def _fan_out(kind: str, message: str, delivery_config: dict | None, done: list[str],
+             media: Path | None = None) -> dict:
+    """Send to every recipient not in `done`, concurrently; returns the delivery report."""
+    cfg = {**DELIVERY_DEFAULTS, **(delivery_config or {})}
+    already_sent = set(done)
+    pending = [r for r in recipients(cfg) if r not in already_sent]
+    started = time.perf_counter()
+    results = []
+    if pending:
+        with metrics.Executor(max_workers=min(cfg["max_workers"], len(pending)),
+                                thread_name_prefix="deliver") as pool:
+            results = list(pool.map(lambda r: _send(r, cfg, kind, message, media), pending))
+    report = {
+        "kind": kind,
+        "sent": [r["recipient"] for r in results if r["ok"]],
+        "failed": [r for r in results if not r["ok"]],
+        "skipped": len(done),
+        "seconds": round(time.perf_counter() - started, 3),
+        "slowest_seconds": max((r["seconds"] for r in results), default=0.0),
+        "retried": sum(r["attempts"] > 1 for r in results),
+    }
+    print(f"  {kind}: {len(report['sent'])}/{len(pending)} sent in {report['seconds']:.1f}s"
+          + (f", {report['skipped']} already had it" if done else "")
+          + (f", {len(report['failed'])} failed" if report["failed"] else ""))
+    if report["failed"]:
+        raise DeliveryError(report)
+    return report
+
+
+def deliver_text(text: str, delivery_config: dict | None = None, done: list[str] = ()) -> dict:
+    """Send the English text summary to every recipient; `done` lists ones that already have it."""
     print("  Sending text summary...")
-    subprocess.run([
-        "openclaw", "message", "send",
-        "--channel", "whatsapp",
-        "--target", target,
-        "--message", text,
-    ], check=True)
-    print("  Summary sent.")
+    return _fan_out("text", text, delivery_config, list(done))
+
+
+def deliver_voice_note(audio_path: str, delivery_config: dict | None = None, done: list[str] = ()) -> dict:
+    """Send the MP3 briefing as a voice note; the file is staged once for every recipient."""
+    staged = stage_media(audio_path)
+    print(f"  Sending voice note ({staged.stat().st_size / 1024:.0f} KB)...")
+    return _fan_out("voice_note", "Your AI news briefing is ready", delivery_config, list(done), media=staged)
+
+
+def deliver_whatsapp(audio_path: str, text: str, delivery_config: dict | None = None) -> None:
+    """Send MP3 voice note + English text summary via openclaw.
+
+    Args:
+        audio_path: Path to the MP3 audio file (Urdu TTS briefing).
+        text: English summary string to send as the text message.
+        delivery_config: the `delivery:` section of config.yaml; without it,
+            just WhatsApp to WHATSAPP_TARGET_NUMBER.
+
+    Requires:
+        - openclaw installed and running locally
+        - recipients: WHATSAPP_TARGET_NUMBER env var (E.164 format, e.g.
+          +971501234567, comma-separated for several) or delivery.channels
+    """
+    deliver_voice_note(audio_path, delivery_config)
+    deliver_text(text, delivery_config)
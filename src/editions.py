@@ -0,0 +1,60 @@
+"""Editions - the same morning's news as several briefings (language, listener, voice, timezone).
+
+Every edition in the `editions:` list of config.yaml is written and voiced
+from the one set of aggregated, ranked entries, so an extra edition costs its
+own Claude and ElevenLabs calls and nothing else. The first edition is the
+primary one: its files keep the plain names (runs/<date>/script.txt,
+audio/briefing-<date>.mp3) and it is the one stored in the archive. The others
+are saved next to it under their id (runs/<date>/ur/script.txt,
+audio/briefing-<date>-ur.mp3).
+"""
+
+import zoneinfo
+from datetime import datetime
+
+# Defaults for each entry of `editions:` in config.yaml
+EDITION_DEFAULTS = {
+    "id": "en",
+    "language": "English",
+    "listener": "Momal",
+    "timezone": "Asia/Dubai",
+    "voice_id": None,   # defaults to tts.voice_id
+    "model": None,      # defaults to tts.model
+    "channels": None,   # who gets this edition; defaults to delivery.channels
+}
+
+
+def load_editions(config: dict) -> list[dict]:
+    """The configured editions with defaults filled in; just the default edition if none are."""
+    editions = [{**EDITION_DEFAULTS, **e} for e in (config.get("editions") or [{}])]
+    ids = [e["id"] for e in editions]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"editions: ids must be unique, got {ids}")
+    return editions
+
+
+def suffix(edition: dict, primary: bool) -> str:
+    """What an edition adds to its checkpoint stage names: "" for the primary one ("script"), ":ur" for the others."""
+    return "" if primary else f":{edition['id']}"
+
+
+def audio_path(day: str, edition: dict, primary: bool) -> str:
+    return f"audio/briefing-{day}.mp3" if primary else f"audio/briefing-{day}-{edition['id']}.mp3"
+
+
+def local_time(edition: dict, moment: datetime | None = None) -> datetime:
+    """The run's `moment` (default now) on the edition's clock - the day its listener is having."""
+    tz = zoneinfo.ZoneInfo(edition["timezone"])
+    return moment.astimezone(tz) if moment else datetime.now(tz)
+
+
+def tts_config(config: dict, edition: dict) -> dict:
+    """The `tts:` section with the edition's voice and model, where it sets them."""
+    overrides = {k: edition[k] for k in ("voice_id", "model") if edition.get(k)}
+    return {**(config.get("tts") or {}), **overrides}
+
+
+def delivery_config(config: dict, edition: dict) -> dict:
+    """The `delivery:` section with the edition's channels, where it sets them."""
+    delivery = config.get("delivery") or {}
+    return {**delivery, "channels": edition["channels"]} if edition.get("channels") else delivery
@@ -0,0 +1,48 @@
+"""Entry - the compact form a feed entry takes while aggregation streams and ranks it.
+
+Everywhere else entries are plain dicts (they go to JSON for checkpoints, the
+caches and the archive). While tens of thousands of them are fetched and
+scored, though, each one is an Entry: fixed slots instead of a per-entry
+dict, and the handful of distinct `source` and `priority` strings interned so
+every entry of a feed points at the same string object. Only the best-scored
+ones are ever turned back into dicts.
+"""
+
+import sys
+from dataclasses import dataclass
+
+_FIELDS = ("title", "link", "summary", "published", "source", "priority")
+
+
+@dataclass(slots=True)
+class Entry:
+    title: str
+    link: str
+    summary: str
+    published: str              # ISO 8601 (UTC) or "unknown"
+    source: str
+    priority: str
+    score: float | None = None  # set by ranking
+    extra: dict | None = None   # any other keys the dict had (links, seen_on, ...)
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> "Entry":
+        extra = {k: v for k, v in entry.items() if k not in _FIELDS and k != "score"}
+        return cls(
+            entry.get("title", "Untitled"), entry.get("link", ""), entry.get("summary", ""),
+            entry.get("published", "unknown"),
+            sys.intern(entry.get("source", "")), sys.intern(entry.get("priority", "medium")),
+            entry.get("score"), extra or None,
+        )
+
+    @classmethod
+    def coerce(cls, entry: "Entry | dict") -> "Entry":
+        return entry if isinstance(entry, Entry) else cls.from_dict(entry)
+
+    def to_dict(self) -> dict:
+        """The usual entry dict, with `score` last once it's ranked."""
+        d = {"title": self.title, "link": self.link, "summary": self.summary, "published": self.published,
+             "source": self.source, "priority": self.priority, **(self.extra or {})}
+        if self.score is not None:
+            d["score"] = self.score
+        return d
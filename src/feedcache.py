@@ -0,0 +1,76 @@
+"""Feed cache - remembers ETag/Last-Modified and parsed entries per feed URL."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class FeedCache:
+    """Persistent conditional-GET cache, one JSON file per feed URL.
+
+    Safe to share across fetch threads: each URL maps to its own file and the
+    counters are guarded by a lock.
+    """
+
+    def __init__(self, cache_dir: str = "cache/feeds"):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha256(url.encode()).hexdigest()[:32] + ".json")
+
+    def get(self, url: str) -> dict | None:
+        """Return the cached record for a URL, or None."""
+        try:
+            with open(self._path(url)) as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return record if record.get("url") == url else None
+
+    def request_headers(self, record: dict | None) -> dict:
+        """Conditional-GET headers for a cached record."""
+        headers = {}
+        if record:
+            if record.get("etag"):
+                headers["If-None-Match"] = record["etag"]
+            if record.get("last_modified"):
+                headers["If-Modified-Since"] = record["last_modified"]
+        return headers
+
+    def put(self, url: str, response_headers: dict, entries: list[dict], size: int) -> None:
+        """Store validators and parsed entries from a fresh 200 response."""
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return  # nothing to revalidate with next time
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "size": size,
+                "entries": entries,
+            }, f)
+        os.replace(tmp, path)
+
+    def record_hit(self, record: dict) -> None:
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += record.get("size", 0)
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved}
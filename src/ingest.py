@@ -0,0 +1,277 @@
+"""Incremental ingestion - polls each feed on its own schedule and keeps new entries in SQLite.
+
+Run: python -m src.ingest          # poll forever
+     python -m src.ingest --once   # poll the feeds that are due, then exit
+
+With `ingest.enabled` in sources.yaml, aggregate() reads the briefing window
+straight from this store instead of fetching and parsing every feed.
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src import metrics
+from src.aggregator import FETCH_DEFAULTS, _http_get, _parse_entries, fetch_github_trending
+from src.context import SOURCES_PATH, RunContext
+
+# Defaults for the `ingest:` section of sources.yaml
+INGEST_DEFAULTS = {
+    "enabled": False,           # aggregate() reads the store instead of fetching
+    "path": "cache/ingest.sqlite",
+    "min_poll_minutes": 15,     # a feed that keeps changing is polled this often...
+    "max_poll_minutes": 360,    # ...and one that never does, this rarely
+    "backoff": 1.5,             # interval multiplier after a poll with nothing new
+    "trending_poll_minutes": 60,
+    "retain_hours": 336,        # entries older than this are dropped from the store
+    "max_staleness_minutes": 720,  # aggregate() falls back to fetching if no poll since
+}
+
+TRENDING = "github:trending"  # pseudo-feed key for GitHub Trending
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    url           TEXT PRIMARY KEY,
+    interval      REAL NOT NULL,
+    next_poll     REAL NOT NULL,
+    last_poll     REAL,
+    last_new      REAL,
+    high_water    TEXT,
+    etag          TEXT,
+    last_modified TEXT,
+    failures      INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS items (
+    id        INTEGER PRIMARY KEY,
+    feed_url  TEXT NOT NULL,
+    guid      TEXT NOT NULL,
+    published TEXT NOT NULL,
+    entry     TEXT NOT NULL,
+    UNIQUE (feed_url, guid)
+);
+CREATE INDEX IF NOT EXISTS items_published ON items(published);
+"""
+
+
+class IngestStore:
+    """Per-feed poll state plus every entry seen, one row each."""
+
+    def __init__(self, path: str = "cache/ingest.sqlite"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode = WAL")  # aggregate() reads while the poller writes
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def feed_state(self, url: str) -> dict | None:
+        cur = self.db.execute("SELECT * FROM feeds WHERE url = ?", (url,))
+        row = cur.fetchone()
+        return dict(zip([c[0] for c in cur.description], row)) if row else None
+
+    def due(self, urls: list[str], now: float) -> list[str]:
+        """Feeds never polled, or whose next poll time has come."""
+        known = dict(self.db.execute("SELECT url, next_poll FROM feeds"))
+        return [url for url in urls if known.get(url, 0) <= now]
+
+    def add_entries(self, url: str, entries: list[dict], replace: bool = False) -> int:
+        """Append entries not stored yet; returns how many were new.
+
+        `replace` swaps out everything stored for the feed, for snapshot sources
+        like GitHub Trending.
+        """
+        with self.db:
+            if replace:
+                self.db.execute("DELETE FROM items WHERE feed_url = ?", (url,))
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO items (feed_url, guid, published, entry) VALUES (?, ?, ?, ?)",
+                [(url, e["link"] or e["title"], e["published"], json.dumps(e, ensure_ascii=False))
+                 for e in entries])
+            return self.db.total_changes - before
+
+    def update_feed(self, url: str, **state) -> None:
+        columns = ", ".join(state)
+        with self.db:
+            self.db.execute(
+                f"INSERT INTO feeds (url, {columns}) VALUES (?, {', '.join('?' * len(state))}) "
+                f"ON CONFLICT(url) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in state)}",
+                (url, *state.values()))
+
+    def last_poll(self) -> float | None:
+        return self.db.execute("SELECT MAX(last_poll) FROM feeds").fetchone()[0]
+
+    def window(self, url: str, since: datetime, until: datetime | None = None) -> list[dict]:
+        """Stored entries of one feed published since `since` (or with no date), up to `until`."""
+        if until is None:
+            rows = self.db.execute(
+                "SELECT entry FROM items WHERE feed_url = ? AND (published >= ? OR published = 'unknown') "
+                "ORDER BY id", (url, since.isoformat()))
+        else:
+            # Undated entries can't be placed in a past window, so they're left out
+            rows = self.db.execute(
+                "SELECT entry FROM items WHERE feed_url = ? AND published >= ? AND published <= ? "
+                "AND published != 'unknown' ORDER BY id", (url, since.isoformat(), until.isoformat()))
+        return [json.loads(entry) for (entry,) in rows]
+
+    def prune(self, older_than: datetime) -> int:
+        with self.db:
+            return self.db.execute("DELETE FROM items WHERE published < ? AND published != 'unknown'",
+                                   (older_than.isoformat(),)).rowcount
+
+
+def _next_interval(state: dict | None, new: int, cfg: dict, feed_config: dict) -> float:
+    """Seconds until the next poll: halve it after new entries, back off after none."""
+    lo = feed_config.get("poll_minutes", cfg["min_poll_minutes"]) * 60
+    hi = max(lo, cfg["max_poll_minutes"] * 60)
+    current = state["interval"] if state else lo
+    return max(lo, current / 2) if new else min(hi, current * cfg["backoff"])
+
+
+def _poll_feed(feed_config: dict, state: dict | None, timeout: float) -> tuple[int, list[dict], dict]:
+    """Conditional GET and parse; entries at or below the high-water mark are dropped here."""
+    headers = {}
+    if state and state["etag"]:
+        headers["If-None-Match"] = state["etag"]
+    if state and state["last_modified"]:
+        headers["If-Modified-Since"] = state["last_modified"]
+    status, body, response_headers = _http_get(feed_config["url"], timeout, headers)
+    if status == 304:
+        return 304, [], response_headers
+    entries = _parse_entries(body, feed_config)
+    high_water = state["high_water"] if state else None
+    if high_water:
+        # Anything newer, plus undated entries; the UNIQUE guid catches what's left
+        entries = [e for e in entries if e["published"] == "unknown" or e["published"] >= high_water]
+    return status, entries, response_headers
+
+
+def poll_once(sources: dict, store: IngestStore, now: float | None = None) -> dict:
+    """Poll every feed that is due, concurrently; returns {url: new entry count}."""
+    cfg = {**INGEST_DEFAULTS, **(sources.get("ingest") or {})}
+    fetch_config = {**FETCH_DEFAULTS, **(sources.get("fetch") or {})}
+    now = now or time.time()
+    feeds = {f["url"]: f for f in sources.get("rss_feeds", [])}
+    due = store.due(list(feeds) + [TRENDING], now)
+    if not due:
+        return {}
+
+    states = {url: store.feed_state(url) for url in due}
+
+    def poll(url):
+        with metrics.span("ingest_poll", source=feeds[url]["name"] if url in feeds else "GitHub Trending") as span:
+            if url == TRENDING:
+                return 200, fetch_github_trending(timeout=fetch_config["feed_timeout"]), {}
+            status, entries, headers = _poll_feed(feeds[url], states[url], fetch_config["feed_timeout"])
+            span.set(status=status, entries=len(entries))
+            return status, entries, headers
+
+    new_counts = {}
+    with metrics.Executor(max_workers=fetch_config["max_workers"], thread_name_prefix="ingest") as pool:
+        # Network in the pool, every write here on the store's own thread
+        for url, future in [(url, pool.submit(poll, url)) for url in due]:
+            state = states[url]
+            try:
+                status, entries, headers = future.result()
+            except Exception as e:
+                name = feeds[url]["name"] if url in feeds else "GitHub Trending"
+                print(f"  Warning: Failed to poll {name}: {e}")
+                interval = _next_interval(state, 0, cfg, feeds.get(url, {}))
+                store.update_feed(url, interval=interval, next_poll=now + interval, last_poll=now,
+                                  failures=(state["failures"] if state else 0) + 1)
+                continue
+            new = store.add_entries(url, entries, replace=url == TRENDING and bool(entries))
+            new_counts[url] = new
+            if url == TRENDING:
+                interval = cfg["trending_poll_minutes"] * 60
+            else:
+                interval = _next_interval(state, new, cfg, feeds[url])
+            dated = [e["published"] for e in entries if e["published"] != "unknown"]
+            high_water = max(dated + ([state["high_water"]] if state and state["high_water"] else []), default=None)
+            store.update_feed(
+                url, interval=interval, next_poll=now + interval, last_poll=now,
+                last_new=now if new else (state["last_new"] if state else None), high_water=high_water,
+                etag=headers.get("ETag") or (state["etag"] if state and status == 304 else None),
+                last_modified=headers.get("Last-Modified") or (state["last_modified"] if state and status == 304 else None),
+                failures=0)
+
+    cutoff = datetime.fromtimestamp(now, timezone.utc) - timedelta(hours=cfg["retain_hours"])
+    store.prune(cutoff)
+    return new_counts
+
+
+def read_window(sources: dict, hours_back: int = 48, as_of: datetime | None = None) -> list[dict] | None:
+    """Entries for the briefing window, in sources.yaml order, straight from the store.
+
+    None when the store hasn't been polled recently enough to stand in for a fetch.
+    With `as_of`, the window that ended then instead (for backfills); that
+    doesn't depend on recent polls, only on retain_hours.
+    """
+    cfg = {**INGEST_DEFAULTS, **(sources.get("ingest") or {})}
+    if not Path(cfg["path"]).exists():
+        return None
+    store = IngestStore(cfg["path"])
+    try:
+        if as_of is None:
+            last_poll = store.last_poll()
+            if last_poll is None or time.time() - last_poll > cfg["max_staleness_minutes"] * 60:
+                return None
+        until = as_of.astimezone(timezone.utc) if as_of else None  # stored dates are UTC ISO strings
+        now = until or datetime.now(timezone.utc)
+        entries = []
+        for feed_config in sources.get("rss_feeds", []):
+            since = now - timedelta(hours=feed_config.get("hours_back", hours_back))
+            entries.extend(
+                {**e, "source": feed_config["name"], "priority": feed_config.get("priority", "medium")}
+                for e in store.window(feed_config["url"], since, until))
+        # Trending is stored as the latest snapshot of the page, so a past day only gets it if still there
+        entries.extend(store.window(TRENDING, now - timedelta(hours=cfg["retain_hours"]), until))
+        return entries
+    finally:
+        store.close()
+
+
+def run_forever(sources_path: str = SOURCES_PATH, stop: threading.Event | None = None) -> None:
+    """Poll due feeds, sleep until the next one is due, repeat until `stop` is set."""
+    stop = stop or threading.Event()
+    ctx = RunContext(sources_path=sources_path)
+    while not stop.is_set():
+        metrics.reset()  # poll spans aren't kept past the poll (nor mixed into a briefing's)
+        sources = ctx.sources  # re-read when sources.yaml changes
+        cfg = {**INGEST_DEFAULTS, **(sources.get("ingest") or {})}
+        store = IngestStore(cfg["path"])
+        try:
+            new = poll_once(sources, store)
+            if new:
+                print(f"  [ingest] polled {len(new)} feeds, {sum(new.values())} new entries")
+            next_poll = store.db.execute("SELECT MIN(next_poll) FROM feeds").fetchone()[0]
+        finally:
+            store.close()
+        stop.wait(min(max((next_poll or 0) - time.time(), 1), 60))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.ingest", description="Poll feeds into the ingest store")
+    parser.add_argument("--sources", default=SOURCES_PATH)
+    parser.add_argument("--once", action="store_true", help="poll the feeds that are due, then exit")
+    args = parser.parse_args(argv)
+
+    if args.once:
+        sources = RunContext(sources_path=args.sources).sources
+        store = IngestStore({**INGEST_DEFAULTS, **(sources.get("ingest") or {})}["path"])
+        try:
+            new = poll_once(sources, store)
+        finally:
+            store.close()
+        print(f"Polled {len(new)} feeds, {sum(new.values())} new entries")
+    else:
+        run_forever(args.sources)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,465 @@
-"""AI News Caster - main pipeline entry point."""
+"""AI News Caster - main pipeline entry point.
 
+Run: python -m src                      # the whole pipeline (same as `run`)
+     python -m src --fresh              # ignore today's checkpoints and start over
+     python -m src aggregate            # fetch + rank, saved to runs/<date>/entries.json
+     python -m src write                # Claude script + summary from the saved entries
+     python -m src tts                  # audio from the saved script
+     python -m src deliver              # send the saved summary and audio
+     python -m src daemon               # deliver every day at delivery.schedule
+     python -m src backfill 2026-02-16 2026-02-22   # remake past days (see src/backfill.py)
+
+The SDKs (anthropic, elevenlabs, feedparser, yaml) are imported by the stage
+that needs them, so e.g. `deliver` starts without loading any of them.
+Check with: python -X importtime -m src --help 2>&1 | sort -t'|' -k2 -n | tail
+"""
+
+import argparse
 import json
 import sys
 from datetime import datetime
 from pathlib import Path
 
-from dotenv import load_dotenv
+from src import editions, metrics
+from src.aggregator import aggregate
+from src.archive import ARCHIVE_DEFAULTS, ArchiveStore
+from src.schedule import delivery_time, load_schedule
+from src.scriptwriter import write_script, write_whatsapp_summary, extract_story_list
+from src.tts import generate_audio, audio_cache_stats
+from src.deliver import DeliveryError, deliver_text, deliver_voice_note
+from src.seen import mark_covered
+from src.checkpoint import RunDir
+from src.context import RunContext
 
-load_dotenv()
 
-from src.aggregator import aggregate
-from src.scriptwriter import write_script, write_whatsapp_summary, extract_story_list, load_config
-from src.tts import generate_audio
-from src.deliver import deliver_whatsapp
+def _require(checkpoints: RunDir, stage: str, produced_by: str) -> str:
+    text = checkpoints.load(stage)
+    if text is None:
+        sys.exit(f"No up-to-date {checkpoints.file(stage)} yet — run `python -m src {produced_by}` "
+                 f"(or `run`) for {checkpoints.day} first")
+    return text
 
 
-def run():
-    today = datetime.now().strftime("%Y-%m-%d")
-    print(f"\n=== AI News Caster - {today} ===\n")
+def _resumable(checkpoints: RunDir, stage: str, inputs: tuple[str, ...], fn, *args, **kwargs) -> str:
+    """fn's result for the stage, reusing today's checkpoint if there is one; saved as soon as it's in."""
+    saved = checkpoints.load(stage)
+    if saved is not None:
+        print(f"  {stage.capitalize()}: reusing the one saved earlier today")
+        return saved
+    result = fn(*args, **kwargs)
+    checkpoints.save(stage, result, inputs)
+    return result
 
-    # Step 1: Aggregate news
-    print("[1/4] Aggregating news from RSS feeds...")
-    entries = aggregate()
 
-    if not entries:
-        print("No news entries found. Try increasing hours_back or checking feed URLs.")
-        sys.exit(1)
-
-    # Step 2a: Write punchy audio teaser script
-    print(f"\n[2/4] Writing audio teaser ({len(entries)} entries)...")
-    script = write_script(entries)
-    script_path = f"scripts/briefing-{today}.txt"
-    Path(script_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(script_path, "w") as f:
-        f.write(script)
-    print(f"  Script saved: {script_path}")
-
-    # Step 2b: Write detailed WhatsApp summary
-    print(f"\n[3/4] Writing WhatsApp summary...")
-    whatsapp_text = write_whatsapp_summary(entries)
-
-    # Step 3: Generate audio
-    print(f"\n[4/4] Generating audio...")
-    audio_path = f"audio/briefing-{today}.mp3"
+def _render_audio(checkpoints: RunDir, script: str, audio_path: str, tts_config: dict | None,
+                  use_cache: bool = True, suffix: str = "", ctx: RunContext | None = None) -> str:
+    if checkpoints.done(f"audio{suffix}"):
+        print(f"  Audio: reusing {audio_path} rendered earlier today")
+        return audio_path
+    generate_audio(script, audio_path, tts_config, use_cache=use_cache, ctx=ctx)
+    if Path(audio_path).exists():
+        checkpoints.record(f"audio{suffix}", audio_path, inputs=(f"script{suffix}",))
+    return audio_path
+
+
+def _deliver(checkpoints: RunDir, receipt: dict, part: str, send, payload: str, delivery_config: dict | None,
+             suffix: str = "") -> None:
+    """Send the text or voice part to every recipient that doesn't have it yet, keeping the receipt.
+
+    The receipt lists who got what, so after a partial failure a re-run only
+    retries the recipients that failed. `suffix` picks an edition's stages (":ur").
+    """
+    sent = receipt.setdefault("sent", {}).setdefault(part, [])
+    failed = None
     try:
-        generate_audio(script, audio_path)
-    except Exception as e:
-        print(f"  Error: TTS generation failed: {e}")
-        sys.exit(1)
+        report = send(payload, delivery_config, done=list(sent)) or {}
+    except DeliveryError as e:
+        report, failed = e.report, e
+    sent.extend(report.get("sent", []))
+    receipt.setdefault("reports", {})[part] = report
+    if failed is None:
+        receipt[part] = datetime.now().astimezone().isoformat(timespec="seconds")
+    voice = part == "voice" or "voice" in receipt["sent"]
+    inputs = ("summary", "audio") if voice else ("summary",)
+    checkpoints.save_json(f"delivery{suffix}", receipt, inputs=tuple(f"{name}{suffix}" for name in inputs))
+    if failed:
+        raise failed
+
+
+def _moment(day: str, config: dict) -> datetime:
+    """The moment a run is for, which each edition dates its briefing by in its own timezone.
 
-    # Archive
-    archive_path = f"archive/{today}.json"
+    Now for today's run; for another day (a backfill, or a stage re-run with --date)
+    the time that day's briefing was due.
+    """
+    now = datetime.now().astimezone()
+    return now if day == now.strftime("%Y-%m-%d") else delivery_time(day, load_schedule(config))
+
+
+def _write_archive(archive_path: str, record: dict) -> None:
     Path(archive_path).parent.mkdir(parents=True, exist_ok=True)
-    cfg = load_config()
-    max_stories = cfg.get("style", {}).get("max_stories", 8)
     with open(archive_path, "w") as f:
-        json.dump({
-            "date": today,
-            "entries_found": len(entries),
-            "entries": entries,
-            "script_path": script_path,
-            "audio_path": audio_path,
-            "script_word_count": len(script.split()),
-            "top_stories": extract_story_list(entries, max_stories=max_stories),
-        }, f, indent=2, default=str)
-    print(f"  Archive saved: {archive_path}")
-
-    # Deliver: audio teaser + detailed text summary
-    print(f"\n[+] Delivering via WhatsApp...")
+        json.dump(record, f, indent=2, default=str)
+
+
+def run(use_cache: bool = True, metrics_file: str | None = None, entries: list[dict] | None = None,
+        fresh: bool = False, day: str | None = None, deliver: bool = True,
+        recorder: metrics.Recorder | None = None, ctx: RunContext | None = None):
+    """One daily briefing, end to end. `entries` skips aggregation (the daemon pre-fetches them).
+
+    Every stage is checkpointed under runs/<date>/, so running again the same day
+    resumes after the last stage that finished: a TTS failure doesn't cost the
+    Claude calls again, nor a delivery failure the audio. `fresh` starts over.
+
+    Entries are aggregated and ranked once; every edition in config.yaml
+    (see src/editions.py) is then written, voiced and delivered from them at once.
+
+    Stage metrics go to `recorder` (a fresh one by default) and are saved with
+    the day in the archive even when the run fails. A backfill passes the `day`
+    it is remaking, `deliver=False`, and a recorder per day. Every stage gets its
+    settings and clients from `ctx` (the daemon's, or one for the default paths).
+    """
+    today = day or datetime.now().strftime("%Y-%m-%d")
+    checkpoints = RunDir(today)
+    if fresh:
+        checkpoints.clear()
+    ctx = ctx or RunContext()
+    cfg = ctx.config
+    moment = _moment(today, cfg)
+    all_editions = editions.load_editions(cfg)
+    receipts = [checkpoints.load_json(f"delivery{editions.suffix(e, i == 0)}") or {}
+                for i, e in enumerate(all_editions)]
+    if deliver and all({"text", "voice"} <= receipt.keys() for receipt in receipts):
+        print(f"Today's briefing was already delivered ({checkpoints.file('delivery')}); "
+              "use --fresh to make and send it again.")
+        return
+    print(f"\n=== AI News Caster - {today} ===\n")
+    archive_cfg = {**ARCHIVE_DEFAULTS, **(cfg.get("archive") or {})}
+    recorder = metrics.use(recorder or metrics.Recorder())
+    archive = None
     try:
-        deliver_whatsapp(audio_path, whatsapp_text)
-    except Exception as e:
-        print(f"  Warning: WhatsApp delivery failed: {e}")
-        print("  Briefing saved locally — deliver manually if needed.")
+        # Step 1: Aggregate news (a resumed run keeps the entries its script was written from)
+        saved = checkpoints.load_json("entries")
+        if saved:
+            entries = saved
+            print(f"[1/4] Resuming with {len(entries)} entries saved earlier today")
+        elif entries is None:
+            print("[1/4] Aggregating news from RSS feeds...")
+            entries = aggregate(ctx=ctx)
+        else:
+            print(f"[1/4] Using {len(entries)} pre-fetched entries")
+
+        if not entries:
+            print("No news entries found. Try increasing hours_back or checking feed URLs.")
+            sys.exit(1)
+        if not saved:
+            checkpoints.save_json("entries", entries)
+
+        # Steps 2-4 for every edition at once, all from the same entries
+        failed = []
+        with metrics.Executor(max_workers=len(all_editions), thread_name_prefix="edition") as pool:
+            futures = [pool.submit(_make_edition, edition, i == 0, entries, checkpoints, receipts[i], ctx, today,
+                                   moment, use_cache=use_cache, deliver=deliver)
+                       for i, edition in enumerate(all_editions)]
+            for edition, future in zip(all_editions, futures):
+                try:
+                    made = future.result()
+                except Exception as e:
+                    print(f"  Error: {edition['id']} edition failed: {e}")
+                    failed.append(edition["id"])
+                else:
+                    archive = archive or made
+
+        if failed:
+            print(f"  Finished outputs are saved in {checkpoints.path}; run again to resume "
+                  f"the {', '.join(failed)} edition(s) from where they stopped.")
+            sys.exit(1)
+    finally:
+        # Failed runs too: their fetch spans are what shows why
+        _save_metrics(today, recorder, archive_cfg, archive, metrics_file)
 
     print(f"\n=== Done! ===")
-    print(f"  Script:  {script_path}")
-    print(f"  Audio:   {audio_path}")
-    print(f"  Archive: {archive_path}\n")
+    for i, edition in enumerate(all_editions):
+        print(f"  Audio:   {editions.audio_path(today, edition, i == 0)}")
+    print(f"  Archive: {archive_cfg['path']} (python -m src.archive day {today})\n")
+
+
+def _make_edition(edition: dict, primary: bool, entries: list[dict], checkpoints: RunDir, receipt: dict,
+                  ctx: RunContext, today: str, moment: datetime, use_cache: bool = True,
+                  deliver: bool = True) -> dict | None:
+    """Write, voice, archive and deliver one edition; returns the archive record for the primary one.
+
+    The script and summary are dated by the edition's own clock at the run's `moment`.
+
+    Raises if the audio can't be rendered, after the script, summary and text
+    delivery are checkpointed, so the next run resumes from the audio.
+    """
+    cfg = ctx.config
+    suffix = editions.suffix(edition, primary)
+    label = f" ({edition['id']})" if not primary else ""
+    archive_cfg = {**ARCHIVE_DEFAULTS, **(cfg.get("archive") or {})}
+
+    # Step 2: Audio teaser and WhatsApp summary only depend on entries — write both at once
+    print(f"\n[2/4] Writing audio teaser + WhatsApp summary{label} ({len(entries)} entries)...")
+    with metrics.Executor(max_workers=3, thread_name_prefix="stage") as pool:
+        script_future = pool.submit(_resumable, checkpoints, f"script{suffix}", ("entries",),
+                                    write_script, entries, use_cache=use_cache, moment=moment, edition=edition,
+                                    ctx=ctx)
+        summary_future = pool.submit(_resumable, checkpoints, f"summary{suffix}", ("entries",),
+                                     write_whatsapp_summary, entries, use_cache=use_cache, edition=edition,
+                                     moment=moment, ctx=ctx)
+
+        script = script_future.result()
+        script_path = None
+        if archive_cfg["legacy_files"]:
+            script_path = f"scripts/briefing-{today}.txt" if primary else f"scripts/briefing-{today}-{edition['id']}.txt"
+            Path(script_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(script_path, "w") as f:
+                f.write(script)
+            print(f"  Script saved: {script_path}")
+
+        # Step 3: Generate audio in the background — it starts as soon as the script is in and
+        # streams to disk while the summary, archive and text delivery carry on here
+        print(f"\n[3/4] Generating audio{label}...")
+        audio_path = editions.audio_path(today, edition, primary)
+        audio_future = pool.submit(_render_audio, checkpoints, script, audio_path,
+                                   editions.tts_config(cfg, edition), use_cache=use_cache, suffix=suffix,
+                                   ctx=ctx)
+
+        whatsapp_text = summary_future.result()
+
+        # Step 4: Archive the primary edition — entries, script and summary in one transaction;
+        # metrics are added at the end
+        archive = None
+        if primary:
+            print(f"\n[4/4] Archiving...")
+            max_stories = cfg.get("style", {}).get("max_stories", 8)
+            archive = {
+                "date": today,
+                "entries_found": len(entries),
+                "entries": entries,
+                "script_path": script_path,
+                "audio_path": audio_path,
+                "script_word_count": len(script.split()),
+                "top_stories": extract_story_list(entries, max_stories=max_stories),
+            }
+            with metrics.span("archive"):
+                with ArchiveStore(archive_cfg["path"]) as store:
+                    store.save_run(archive, script, whatsapp_text)
+                if archive_cfg["legacy_files"]:
+                    _write_archive(f"archive/{today}.json", archive)
+                try:
+                    mark_covered(entries[:max_stories], ctx.sources.get("seen"), today)
+                except Exception as e:
+                    print(f"  Warning: seen-story index not updated: {e}")
+            print(f"  Archived to {archive_cfg['path']}")
+
+        # Deliver: detailed text summary now, audio teaser once it's rendered
+        delivery_config = editions.delivery_config(cfg, edition)
+        if deliver:
+            print(f"\n[+] Delivering{label}...")
+            if "text" in receipt:
+                print(f"  Text summary already delivered at {receipt['text']}")
+            else:
+                try:
+                    _deliver(checkpoints, receipt, "text", deliver_text, whatsapp_text, delivery_config, suffix)
+                except Exception as e:
+                    print(f"  Warning: text delivery failed{label}: {e}")
+
+        try:
+            audio_future.result()
+        except Exception as e:
+            raise RuntimeError(f"TTS generation failed: {e}") from e
+
+    if deliver and "voice" not in receipt:
+        try:
+            _deliver(checkpoints, receipt, "voice", deliver_voice_note, audio_path, delivery_config, suffix)
+        except Exception as e:
+            print(f"  Warning: voice note delivery failed{label}: {e}")
+            print("  Briefing saved locally — run again to retry delivery, or deliver manually.")
+    return archive
+
+
+def _save_metrics(today: str, recorder: metrics.Recorder, archive_cfg: dict, archive: dict | None,
+                  metrics_file: str | None) -> None:
+    stats = audio_cache_stats(recorder)
+    print(f"\n  Audio cache: {stats['hits']}/{stats['hits'] + stats['misses']} chunks reused "
+          f"({stats['hit_rate']:.0%}), {stats['chars_saved']:,} ElevenLabs characters saved")
+    metrics.print_summary(recorder)
+
+    run_metrics = recorder.to_dict()
+    with ArchiveStore(archive_cfg["path"]) as store:
+        store.save_metrics(today, run_metrics)
+    if archive_cfg["legacy_files"] and archive:
+        _write_archive(f"archive/{today}.json", {**archive, "metrics": run_metrics})
+    if metrics_file:
+        metrics.append_jsonl(metrics_file, {"date": today, **run_metrics})
+
+
+def _profiled(fn, *args, **kwargs):
+    """Run fn under cProfile and tracemalloc, then dump and summarize both.
+
+    cProfile only sees the calling thread, so time spent in fetch/LLM/TTS
+    workers shows up as waits here; the per-stage spans cover those.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    stamp = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+    Path("profile").mkdir(exist_ok=True)
+    tracemalloc.start(25)
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(fn, *args, **kwargs)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        prof_path = f"profile/run-{stamp}.prof"
+        profiler.dump_stats(prof_path)
+        print(f"\n=== Profile: {prof_path} (open with snakeviz or pstats) ===")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+        print(f"=== Memory: peak {peak / 1024 / 1024:.1f} MB, top allocations ===")
+        with open(f"profile/run-{stamp}-memory.txt", "w") as f:
+            for stat in snapshot.statistics("lineno")[:25]:
+                f.write(f"{stat}\n")
+        for stat in snapshot.statistics("lineno")[:10]:
+            print(f"  {stat}")
+
+
+def cmd_aggregate(day: str) -> None:
+    entries = aggregate()
+    path = RunDir(day).save_json("entries", entries)
+    print(f"\n  {len(entries)} entries saved: {path}")
+
+
+def cmd_write(day: str, use_cache: bool = True) -> None:
+    checkpoints = RunDir(day)
+    entries = json.loads(_require(checkpoints, "entries", "aggregate"))
+    ctx = RunContext()
+    cfg = ctx.config
+    moment = _moment(day, cfg)
+    all_editions = editions.load_editions(cfg)
+    with metrics.Executor(max_workers=2 * len(all_editions), thread_name_prefix="stage") as pool:
+        futures = []
+        for i, edition in enumerate(all_editions):
+            suffix = editions.suffix(edition, i == 0)
+            futures.append((f"script{suffix}", pool.submit(write_script, entries, use_cache=use_cache,
+                                                            moment=moment, edition=edition, ctx=ctx)))
+            futures.append((f"summary{suffix}", pool.submit(write_whatsapp_summary, entries, use_cache=use_cache,
+                                                             edition=edition, moment=moment, ctx=ctx)))
+        for stage, future in futures:
+            print(f"  Saved: {checkpoints.save(stage, future.result(), inputs=('entries',))}")
+
+
+def cmd_tts(day: str, use_cache: bool = True) -> None:
+    checkpoints = RunDir(day)
+    ctx = RunContext()
+    cfg = ctx.config
+    for i, edition in enumerate(editions.load_editions(cfg)):
+        suffix = editions.suffix(edition, i == 0)
+        script = _require(checkpoints, f"script{suffix}", "write")
+        audio_path = editions.audio_path(day, edition, i == 0)
+        generate_audio(script, audio_path, editions.tts_config(cfg, edition), use_cache=use_cache, ctx=ctx)
+        checkpoints.record(f"audio{suffix}", audio_path, inputs=(f"script{suffix}",))
+
+
+def cmd_deliver(day: str, only: str | None = None) -> None:
+    checkpoints = RunDir(day)
+    cfg = RunContext().config
+    for i, edition in enumerate(editions.load_editions(cfg)):
+        suffix = editions.suffix(edition, i == 0)
+        receipt = checkpoints.load_json(f"delivery{suffix}") or {}
+        delivery_config = editions.delivery_config(cfg, edition)
+        if only != "voice":
+            _deliver(checkpoints, receipt, "text", deliver_text, _require(checkpoints, f"summary{suffix}", "write"),
+                     delivery_config, suffix)
+        if only != "text":
+            if not checkpoints.done(f"audio{suffix}"):
+                sys.exit(f"No up-to-date audio{suffix} for {day} yet — run `python -m src tts` first")
+            _deliver(checkpoints, receipt, "voice", deliver_voice_note,
+                     checkpoints.manifest["stages"][f"audio{suffix}"]["path"], delivery_config, suffix)
+
+
+def _option_parents(default=None) -> tuple[argparse.ArgumentParser, argparse.ArgumentParser]:
+    """The --no-cache and run options, as argparse parents.
+
+    The main parser takes them with their usual defaults; the subcommands take
+    copies with `default=argparse.SUPPRESS`, which leave what the main parser
+    set alone unless given again, so `--no-cache run` and `run --no-cache` agree.
+    """
+    flag = {"default": default} if default is not None else {}
+    no_cache = argparse.ArgumentParser(add_help=False)
+    no_cache.add_argument("--no-cache", action="store_true", **flag,
+                          help="ignore cached Claude responses and TTS audio and call the APIs again")
+    run_opts = argparse.ArgumentParser(add_help=False, parents=[no_cache])
+    run_opts.add_argument("--metrics-file", metavar="PATH", **flag,
+                          help="also append this run's stage metrics to a JSONL file")
+    run_opts.add_argument("--profile", action="store_true", **flag,
+                          help="dump cProfile and tracemalloc output for the run under profile/")
+    run_opts.add_argument("--fresh", action="store_true", **flag,
+                          help="ignore today's checkpoints in runs/<date>/ and start from aggregation")
+    return no_cache, run_opts
+
+
+def main(argv: list[str] | None = None):
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    stage = argparse.ArgumentParser(add_help=False)
+    stage.add_argument("--date", default=today, metavar="YYYY-MM-DD",
+                       help="which day's saved outputs to use (default: today)")
+    run_opts = _option_parents()[1]
+    sub_no_cache, sub_run_opts = _option_parents(argparse.SUPPRESS)
+
+    parser = argparse.ArgumentParser(prog="python -m src", description="AI News Caster daily briefing",
+                                     parents=[run_opts])
+    parser.add_argument("--daemon", action="store_true", help="same as the `daemon` command")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("run", parents=[sub_run_opts], help="the whole pipeline (default)")
+    commands.add_parser("aggregate", parents=[stage], help="fetch, rank and save entries")
+    commands.add_parser("write", parents=[stage, sub_no_cache], help="write script and summary from saved entries")
+    commands.add_parser("tts", parents=[stage, sub_no_cache], help="render audio from the saved script")
+    deliver = commands.add_parser("deliver", parents=[stage], help="send the saved summary and audio")
+    deliver.add_argument("--only", choices=["text", "voice"])
+    commands.add_parser("daemon", parents=[sub_run_opts], help="deliver every day at delivery.schedule")
+    backfill = commands.add_parser("backfill", parents=[sub_no_cache], help="remake the briefings for past days")
+    backfill.add_argument("start", metavar="YYYY-MM-DD")
+    backfill.add_argument("end", nargs="?", metavar="YYYY-MM-DD", help="last day (default: just start)")
+    backfill.add_argument("--workers", type=int, default=3, help="days made at once")
+    backfill.add_argument("--fresh", action="store_true", default=argparse.SUPPRESS,
+                          help="remake days that already have checkpoints")
+    args = parser.parse_args(argv)
+
+    kwargs = {"use_cache": not args.no_cache, "metrics_file": args.metrics_file}
+    if args.fresh and args.command != "daemon" and not args.daemon:
+        kwargs["fresh"] = True
+    if args.command == "aggregate":
+        cmd_aggregate(args.date)
+    elif args.command == "write":
+        cmd_write(args.date, use_cache=not args.no_cache)
+    elif args.command == "tts":
+        cmd_tts(args.date, use_cache=not args.no_cache)
+    elif args.command == "deliver":
+        cmd_deliver(args.date, args.only)
+    elif args.command == "backfill":
+        from src.backfill import backfill
+        results = backfill(args.start, args.end, workers=args.workers, use_cache=not args.no_cache,
+                           fresh=args.fresh)
+        sys.exit(1 if any(r["status"] != "ok" for r in results) else 0)
+    elif args.command == "daemon" or args.daemon:
+        from src.daemon import serve
+        serve(**kwargs)
+    elif args.profile:
+        _profiled(run, **kwargs)
+    else:
+        run(**kwargs)
 
 
 if __name__ == "__main__":
-    run()
+    main()
@@ -0,0 +1,163 @@
+"""Run metrics - timed spans for each pipeline stage, saved with the daily archive.
+
+The recorder spans go to is the one current in the calling context: a run
+makes its own with reset() or use(), and the pools it starts with Executor
+hand it on to their workers. Threads that aren't part of a run (the daemon's
+ingest poller) record somewhere else, so their spans never mix into a briefing.
+"""
+
+import contextvars
+import functools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+class Span:
+    """One timed unit of work plus whatever counters it reports (bytes, entries, tokens...)."""
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration = 0.0
+        self.error: str | None = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, key: str, n: int = 1) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + n
+
+    def to_dict(self) -> dict:
+        record = {"name": self.name, "start": round(self.start, 4),
+                  "duration": round(self.duration, 4), **self.attrs}
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class Recorder:
+    """Collects spans from every thread of a run."""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        s = Span(name, {**attrs, "thread": threading.current_thread().name})
+        s.start = time.perf_counter() - self._t0
+        try:
+            yield s
+        except BaseException as e:
+            s.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            s.duration = time.perf_counter() - self._t0 - s.start
+            with self._lock:
+                self._spans.append(s)
+
+    def record(self, name: str, duration: float = 0.0, error: str | None = None, **attrs) -> None:
+        """Add a span for something that wasn't timed with a context manager."""
+        s = Span(name, attrs)
+        s.start = time.perf_counter() - self._t0 - duration
+        s.duration = duration
+        s.error = error
+        with self._lock:
+            self._spans.append(s)
+
+    def absorb(self, other: "Recorder") -> None:
+        """Add another run's spans (e.g. each day of a backfill), for a joint summary."""
+        spans = other.spans
+        with self._lock:
+            self._spans.extend(spans)
+
+    @property
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s.start)
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "wall_time": round(time.perf_counter() - self._t0, 4),
+            "spans": [s.to_dict() for s in self.spans],
+        }
+
+    def summary(self) -> list[dict]:
+        """Per span name: count, total and slowest duration, in first-seen order."""
+        rows: dict[str, dict] = {}
+        for s in self.spans:
+            row = rows.setdefault(s.name, {"name": s.name, "count": 0, "total": 0.0, "max": 0.0,
+                                           "errors": 0})
+            row["count"] += 1
+            row["total"] += s.duration
+            row["max"] = max(row["max"], s.duration)
+            row["errors"] += s.error is not None
+        return list(rows.values())
+
+
+_recorder: contextvars.ContextVar[Recorder] = contextvars.ContextVar("recorder", default=Recorder())
+
+
+def use(recorder: Recorder) -> Recorder:
+    """Make `recorder` current for this thread's context (and the Executor pools it starts)."""
+    _recorder.set(recorder)
+    return recorder
+
+
+def reset() -> Recorder:
+    """Start a fresh recorder for a new run."""
+    return use(Recorder())
+
+
+def current() -> Recorder:
+    return _recorder.get()
+
+
+def span(name: str, **attrs):
+    """Time a block on the current run's recorder: `with span("fetch_feed", source=...) as s:`."""
+    return current().span(name, **attrs)
+
+
+class Executor(ThreadPoolExecutor):
+    """A ThreadPoolExecutor whose tasks record into the recorder that was current when they were submitted."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def timed(name: str):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def print_summary(recorder: Recorder | None = None) -> None:
+    recorder = recorder or current()
+    print("  Stage timings:")
+    for row in recorder.summary():
+        count = f"x{row['count']}" if row["count"] > 1 else ""
+        slowest = f"  (slowest {row['max']:.1f}s)" if row["count"] > 1 else ""
+        errors = f"  [{row['errors']} failed]" if row["errors"] else ""
+        print(f"    {row['name']:<18}{count:>4} {row['total']:7.1f}s{slowest}{errors}")
+    print(f"    {'wall time':<18}     {recorder.to_dict()['wall_time']:7.1f}s")
+
+
+def append_jsonl(path: str, record: dict) -> None:
+    """Append one run's metrics as a JSON line."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
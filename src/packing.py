@@ -0,0 +1,72 @@
+"""Prompt packing - compact entry text and fit as many stories as a token budget allows."""
+
+import html
+import re
+
+from src.ranking import parse_engagement
+
+# Defaults for the `llm.packing` section of config.yaml
+PACKING_DEFAULTS = {
+    "token_budget": 3000,  # tokens spent on the NEWS ENTRIES block
+    "summary_chars": 300,  # per-story summary cap after cleaning
+}
+
+_TAG_RE = re.compile(r"<[^>]+>|<[^>]*$")  # second branch: tag cut off by the 500-char clip
+# hnrss summaries are link boilerplate: "Article URL: ... Comments URL: ... Points: 12 # Comments: 3"
+_HN_BOILERPLATE_RE = re.compile(r"(Article URL|Comments URL|Points|# Comments):\s*\S*")
+_SPACE_RE = re.compile(r"\s+")
+_MIN_BLOCK_TOKENS = 20  # below this no story block can fit any more
+
+
+def clean_summary(summary: str) -> str:
+    """Plain text of an entry summary: no HTML, entities decoded, HN link boilerplate dropped."""
+    text = html.unescape(_TAG_RE.sub(" ", summary))
+    return _SPACE_RE.sub(" ", _HN_BOILERPLATE_RE.sub(" ", text)).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English prose and URLs)."""
+    return (len(text) + 3) // 4
+
+
+def _clip(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+def _entry_block(i: int, entry: dict, summary_chars: int) -> str:
+    block = f"\n---\n{i}. [{entry['source']}] {entry['title']}\n"
+    block += f"   Link: {entry['link']}\n"
+    if len(entry.get("sources", [])) > 1:
+        block += f"   Also covered by: {', '.join(entry['sources'][1:])}\n"
+    points, comments = parse_engagement(entry["summary"])
+    if points or comments:
+        block += f"   Buzz: {points} points, {comments} comments\n"
+    summary = _clip(clean_summary(entry["summary"]), summary_chars)
+    if summary and summary != entry["title"]:
+        block += f"   Summary: {summary}\n"
+    return block
+
+
+def pack_entries(entries: list[dict], packing_config: dict | None = None) -> str:
+    """Render entries, best-ranked first, until the token budget is spent.
+
+    A story that doesn't fit is skipped rather than ending the list, so a
+    shorter one further down can still use the remaining budget.
+    """
+    cfg = {**PACKING_DEFAULTS, **(packing_config or {})}
+    remaining = cfg["token_budget"]
+    text = ""
+    n = 0
+    for entry in entries:
+        if remaining < _MIN_BLOCK_TOKENS:
+            break
+        block = _entry_block(n + 1, entry, cfg["summary_chars"])
+        cost = estimate_tokens(block)
+        if cost > remaining:
+            continue
+        text += block
+        remaining -= cost
+        n += 1
+    return text
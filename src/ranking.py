@@ -0,0 +1,145 @@
+"""Ranking - scores entries by priority, recency, keyword boosts and HN engagement."""
+
+import heapq
+import math
+import re
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from src.entry import Entry
+
+# Defaults for the `ranking:` section of sources.yaml
+RANKING_DEFAULTS = {
+    "priority_weights": {"high": 3.0, "medium": 2.0, "low": 1.0},
+    "recency_weight": 2.0,          # added in full for a brand-new entry
+    "recency_half_life_hours": 24,  # ...and halved every this many hours
+    "unknown_age_hours": 48,        # age assumed for entries without a date
+    "boost_weight": 0.5,            # per distinct keywords_boost hit
+    "max_boost_hits": 3,
+    "points_weight": 0.5,           # per factor of 10 HN points
+    "comments_weight": 0.3,         # per factor of 10 HN comments
+    "max_entries": 300,             # only the best this many are kept after scoring; null keeps all
+}
+
+# hnrss puts engagement into the summary, e.g. "<p>Points: 123</p><p># Comments: 45</p>"
+_POINTS_RE = re.compile(r"Points:\s*(\d+)")
+_COMMENTS_RE = re.compile(r"# Comments:\s*(\d+)")
+
+
+class KeywordMatcher:
+    """Compiled keyword lists: one pattern for keywords_skip, one alternation for keywords_boost.
+
+    Skip keywords match anywhere, as plain substrings (as they always have), so
+    "sponsor" also catches "cosponsored"; they get their own search so a boost
+    match can never swallow the text a skip keyword sits in. Boost keywords
+    match at a word start, so "API" hits "APIs" but not "rapid", and one
+    finditer pass counts how many distinct ones an entry hits.
+    """
+
+    def __init__(self, boost: tuple[str, ...], skip: tuple[str, ...]):
+        # Longest first so "open source" wins over a shorter overlapping keyword
+        def alternation(keywords):
+            return "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+
+        self.skip = re.compile(alternation(skip), re.IGNORECASE) if skip else None
+        self.boost = re.compile(rf"\b(?:{alternation(boost)})", re.IGNORECASE) if boost else None
+
+    def scan(self, text: str) -> tuple[bool, int]:
+        """Return (hits a skip keyword, number of distinct boost keywords hit)."""
+        if self.skip is not None and self.skip.search(text):
+            return True, 0
+        if self.boost is None:
+            return False, 0
+        return False, len({match.group().lower() for match in self.boost.finditer(text)})
+
+
+@lru_cache(maxsize=8)
+def build_matcher(boost: tuple[str, ...], skip: tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(boost, skip)
+
+
+def parse_engagement(summary: str) -> tuple[int, int]:
+    """(points, comments) from an hnrss summary, zeros when absent."""
+    points = _POINTS_RE.search(summary)
+    comments = _COMMENTS_RE.search(summary)
+    return (int(points.group(1)) if points else 0,
+            int(comments.group(1)) if comments else 0)
+
+
+def make_scorer(sources: dict, now: datetime | None = None):
+    """A function scoring one Entry per the `ranking:` config, or returning None for a keywords_skip hit."""
+    cfg = {**RANKING_DEFAULTS, **(sources.get("ranking") or {})}
+    weights = {**RANKING_DEFAULTS["priority_weights"], **cfg["priority_weights"]}
+    matcher = build_matcher(tuple(sources.get("keywords_boost") or ()),
+                            tuple(sources.get("keywords_skip") or ()))
+    now = now or datetime.now(timezone.utc)
+    decay = math.log(2) / (cfg["recency_half_life_hours"] * 3600)
+    unknown_age = cfg["unknown_age_hours"] * 3600
+
+    def score(entry: Entry) -> float | None:
+        skip, boost_hits = matcher.scan(f"{entry.title} {entry.summary}")
+        if skip:
+            return None
+        if entry.published == "unknown":
+            age = unknown_age
+        else:
+            published = datetime.fromisoformat(entry.published)
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            age = max((now - published).total_seconds(), 0)
+        points, comments = parse_engagement(entry.summary)
+        return round(
+            weights.get(entry.priority, weights["medium"])
+            + cfg["recency_weight"] * math.exp(-decay * age)
+            + cfg["boost_weight"] * min(boost_hits, cfg["max_boost_hits"])
+            + cfg["points_weight"] * math.log10(1 + points)
+            + cfg["comments_weight"] * math.log10(1 + comments),
+            3)
+
+    return score
+
+
+def rank_entries(entries: list[dict], sources: dict, now: datetime | None = None) -> list[dict]:
+    """Drop keywords_skip hits, score the rest and return them best first.
+
+    Each returned entry carries its `score`. Ties keep the incoming order.
+    """
+    score = make_scorer(sources, now)
+    scored = []
+    for entry in entries:
+        value = score(Entry.coerce(entry))
+        if value is not None:
+            scored.append({**entry, "score": value})
+
+    scored.sort(key=lambda e: e["score"], reverse=True)
+    return scored
+
+
+def top_entries(entries: Iterable[Entry | dict], sources: dict, k: int | None = None,
+                now: datetime | None = None) -> tuple[list[dict], dict]:
+    """rank_entries for a stream: score entries as they arrive and keep only the best `k`.
+
+    Memory stays at k entries however many stream past (k=None keeps all).
+    Returns the kept entries best first, as dicts, and counts of what was
+    seen, skipped (keywords_skip) and dropped (below the top k). Ties keep
+    the incoming order, as in rank_entries.
+    """
+    score = make_scorer(sources, now)
+    heap: list[tuple[float, int, Entry]] = []  # min-heap on (score, -position): worst entry on top
+    counts = {"seen": 0, "skipped": 0, "dropped": 0}
+    for position, entry in enumerate(entries):
+        counts["seen"] += 1
+        entry = Entry.coerce(entry)
+        entry.score = score(entry)
+        if entry.score is None:
+            counts["skipped"] += 1
+            continue
+        item = (entry.score, -position, entry)
+        if k is None or len(heap) < k:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
+            counts["dropped"] += 1
+    heap.sort(reverse=True)
+    return [entry.to_dict() for _, _, entry in heap], counts
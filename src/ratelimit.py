@@ -0,0 +1,49 @@
+"""Process-wide rate limits for the paid APIs, shared by every briefing being made at once.
+
+A backfill or several editions run their pipelines side by side in one
+process; each Claude request and each ElevenLabs chunk takes a slot from the
+same limiter, so together they stay inside the provider's limits.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class RateLimiter:
+    """At most `max_concurrent` calls in flight and `per_minute` started per minute (None = no limit)."""
+
+    def __init__(self, max_concurrent: int | None = None, per_minute: float | None = None):
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._interval = 60.0 / per_minute if per_minute else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        if self._slots is not None:
+            self._slots.acquire()
+        try:
+            if self._interval:
+                with self._lock:
+                    now = time.monotonic()
+                    start = max(now, self._next_start)
+                    self._next_start = start + self._interval
+                time.sleep(start - now)
+            yield
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter(name: str, rate_limit_config: dict | None = None) -> RateLimiter:
+    """The process's limiter for `name` ("llm", "tts"), made from its `rate_limit:` config on first use."""
+    with _limiters_lock:
+        if name not in _limiters:
+            cfg = rate_limit_config or {}
+            _limiters[name] = RateLimiter(cfg.get("max_concurrent"), cfg.get("requests_per_minute"))
+        return _limiters[name]
@@ -0,0 +1,30 @@
+"""Schedule - when the daily briefing is due, from the `delivery.schedule` section of config.yaml.
+
+Kept free of the pipeline's imports, so the daemon, backfill and the archive
+analytics can all work out a day's delivery time without loading each other.
+"""
+
+import zoneinfo
+from datetime import date, datetime
+
+# Defaults for the `delivery.schedule` section of config.yaml
+SCHEDULE_DEFAULTS = {
+    "timezone": "Asia/Dubai",
+    "time": "08:00",
+    "prefetch_minutes": 60,        # start refreshing feeds this long before delivery
+    "prefetch_every_minutes": 15,  # ...and refresh them this often
+    "final_prefetch_minutes": 3,   # last refresh, just before delivery
+    "max_entries_age_minutes": 30, # older pre-fetched entries are fetched again at delivery
+}
+
+
+def load_schedule(config: dict) -> dict:
+    """The `delivery.schedule` section with defaults filled in."""
+    return {**SCHEDULE_DEFAULTS, **((config.get("delivery") or {}).get("schedule") or {})}
+
+
+def delivery_time(day: str, schedule: dict) -> datetime:
+    """When `day`'s briefing was due, in the schedule's timezone - the end of its entry window."""
+    hour, minute = map(int, schedule["time"].split(":"))
+    return datetime.combine(date.fromisoformat(day), datetime.min.time().replace(hour=hour, minute=minute),
+                            zoneinfo.ZoneInfo(schedule["timezone"]))
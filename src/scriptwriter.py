@@ -1,47 +1,130 @@
 """Script writer - uses Claude to write audio teaser and WhatsApp detail summary."""
 
-import anthropic
-import yaml
-
-
-def load_config(config_path: str = "config/config.yaml") -> dict:
-    with open(config_path) as f:
-        return yaml.safe_load(f)
-
-
-def _entries_text(entries: list[dict], max_stories: int) -> str:
-    text = ""
-    for i, entry in enumerate(entries[:max_stories * 2], 1):  # give Claude more to pick from
-        text += f"\n---\n{i}. [{entry['source']}] {entry['title']}\n"
-        text += f"   Link: {entry['link']}\n"
-        text += f"   Summary: {entry['summary']}\n"
-    return text
-
-
-def build_audio_prompt(entries: list[dict], config: dict) -> str:
-    max_stories = config.get("style", {}).get("max_stories", 8)
-
-    from datetime import datetime
-    import zoneinfo
-    now = datetime.now(zoneinfo.ZoneInfo("Asia/Dubai"))
-    today = now.strftime("%A, %B %-d")  # e.g. "Sunday, February 22"
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from src import metrics, ratelimit
+from src.cache import DiskCache
+from src.config import load_config as _load_config
+from src.context import CONFIG_PATH, RunContext
+from src.editions import EDITION_DEFAULTS, local_time
+from src.packing import pack_entries
+
+if TYPE_CHECKING:
+    import anthropic
+
+# Defaults for the `llm.cache` section of config.yaml
+LLM_CACHE_DEFAULTS = {
+    "dir": "cache/llm",
+    "ttl_hours": 24,
+    "max_mb": 20,
+}
+
+# Status codes worth retrying: timeout, conflict, rate limit, server errors/overloaded
+_RETRYABLE_STATUS = {408, 409, 429}
+
+
+def load_config(config_path: str = CONFIG_PATH) -> dict:
+    """config.yaml as a dict; kept for callers from before src.config (the pipeline uses RunContext)."""
+    return _load_config(config_path)
+
+
+def _create_message(client: "anthropic.Anthropic", llm_config: dict, prompt: str, span=None):
+    """messages.create with retry and exponential backoff on transient failures.
+
+    Retries and token usage are reported on `span` when one is given.
+    """
+    import anthropic
+
+    max_retries = llm_config.get("max_retries", 3)
+    backoff = llm_config.get("retry_backoff", 2.0)
+    limit = ratelimit.limiter("llm", llm_config.get("rate_limit"))
+    for attempt in range(max_retries + 1):
+        try:
+            with limit.slot():
+                message = client.messages.create(
+                    model=llm_config.get("model", "claude-sonnet-4-20250514"),
+                    max_tokens=llm_config.get("max_tokens", 4000),
+                    messages=[{"role": "user", "content": prompt}],
+                )
+            if span is not None:
+                span.set(retries=attempt, input_tokens=message.usage.input_tokens,
+                         output_tokens=message.usage.output_tokens)
+            return message
+        except (anthropic.APIConnectionError, anthropic.APIStatusError) as e:
+            status = getattr(e, "status_code", None)
+            retryable = status is None or status in _RETRYABLE_STATUS or status >= 500
+            if not retryable or attempt == max_retries:
+                raise
+            delay = backoff * 2 ** attempt
+            print(f"  Claude call failed ({status or type(e).__name__}), retrying in {delay:.0f}s...")
+            time.sleep(delay)
+
+
+def _complete(client: "anthropic.Anthropic", llm_config: dict, prompt: str, label: str,
+              use_cache: bool = True) -> str:
+    """Return Claude's text for a prompt, served from the response cache when possible.
+
+    The cache key covers everything that shapes the response (model, max_tokens,
+    prompt), so a same-day re-run after a TTS/delivery failure skips the API.
+    """
+    model = llm_config.get("model", "claude-sonnet-4-20250514")
+    max_tokens = llm_config.get("max_tokens", 4000)
+    cache_config = {**LLM_CACHE_DEFAULTS, **(llm_config.get("cache") or {})}
+    cache = DiskCache(cache_config["dir"], max_bytes=int(cache_config["max_mb"] * 1024 * 1024),
+                      ttl_seconds=cache_config["ttl_hours"] * 3600)
+    key = DiskCache.key(model, max_tokens, prompt)
+
+    with metrics.span("llm", label=label, model=model, prompt_chars=len(prompt)) as span:
+        if use_cache:
+            cached = cache.get(key)
+            span.set(cache_hit=cached is not None)
+            if cached is not None:
+                print(f"  Response cache hit ({label})")
+                return cached.decode("utf-8")
+            print(f"  Response cache miss ({label})")
+
+        print(f"  Sending to Claude ({label})...")
+        text = _create_message(client, llm_config, prompt, span).content[0].text
+        cache.put(key, text.encode("utf-8"))
+        return text
+
+
+def _language_rule(edition: dict) -> str:
+    if edition["language"] == "English":
+        return ""
+    return (f"\nLANGUAGE: Write everything in {edition['language']}, the way a native speaker would say it. "
+            "Keep product, company and repo names, and links, exactly as they are.\n")
+
+
+def _today(edition: dict, moment: datetime | None) -> str:
+    return local_time(edition, moment).strftime("%A, %B %-d")  # e.g. "Sunday, February 22"
+
+
+def build_audio_prompt(entries: list[dict], config: dict, moment: datetime | None = None,
+                       edition: dict | None = None) -> str:
+    """The teaser prompt, dated the day `moment` (default now) falls on in the edition's timezone."""
+    edition = {**EDITION_DEFAULTS, **(edition or {})}
+    listener = edition["listener"]
+    today = _today(edition, moment)
 
     return f"""You are the host of a friendly morning AI news briefing — think Morning Brew but for developers. Casual, warm, smart. Easy to absorb with your first coffee.
 
 Pick the 3 best stories from the entries below. Best = actually buzzing right now. Things developers are sharing, debating, excited or freaked out about.
 
 TODAY'S DATE: {today}
-
+{_language_rule(edition)}
 NEWS ENTRIES:
-{_entries_text(entries, max_stories)}
+{pack_entries(entries, config.get("llm", {}).get("packing"))}
 
 STRUCTURE — follow this exactly:
 
 1. OPENER — GREETING + STAKES + RAPID TEASE (3 sentences MAX)
-   Sentence 1: Warm, punchy hello — address the listener by name: Momal. Like a friend who's excited to catch up.
+   Sentence 1: Warm, punchy hello — address the listener by name: {listener}. Like a friend who's excited to catch up.
    Sentence 2: Set the energy — bold claim or mood-setter about what's going on in AI today.
    Sentence 3: Rapid-fire all 3 story names back-to-back — just the titles, no details, make them curious.
-   Example: "Hey Momal, happy Sunday morning! The AI world did not sleep this weekend. We've got llama.cpp getting acquired, a viral tool to block AI slop, and a wild AI agent drama."
+   Example: "Hey {listener}, happy Sunday morning! The AI world did not sleep this weekend. We've got llama.cpp getting acquired, a viral tool to block AI slop, and a wild AI agent drama."
    Then add a DIVE-IN LINE — one punchy sentence that transitions into the stories.
    Example: "Alright, let's get into it." or "Here's what you need to know." or "Let's break it down."
 
@@ -79,21 +162,24 @@ FORMATTING:
 Write the script now."""
 
 
-def build_whatsapp_prompt(entries: list[dict], config: dict) -> str:
-    max_stories = config.get("style", {}).get("max_stories", 8)
-
+def build_whatsapp_prompt(entries: list[dict], config: dict, edition: dict | None = None,
+                          moment: datetime | None = None) -> str:
+    edition = {**EDITION_DEFAULTS, **(edition or {})}
+    today = _today(edition, moment)
     return f"""Write a detailed WhatsApp message summarizing today's top AI news stories for a developer/researcher audience.
 
 This is the "full details" companion to a short audio teaser — readers want substance here.
 
 Pick the top 5 most interesting/trending stories from the entries below. Prioritize things that are actually causing buzz — viral repos, hot model releases, trending HN threads — over dry corporate announcements.
 
+TODAY'S DATE: {today}
+{_language_rule(edition)}
 NEWS ENTRIES:
-{_entries_text(entries, max_stories)}
+{pack_entries(entries, config.get("llm", {}).get("packing"))}
 
 FORMAT — write it exactly like this:
 
-🎙️ Today's AI Briefing — [Date]
+🎙️ Today's AI Briefing — {today}
 
 1. [Story Title]
 [2-3 sentences: what happened + why it matters to developers/researchers]
@@ -106,7 +192,7 @@ FORMAT — write it exactly like this:
 (repeat for all 5 stories)
 
 ---
-Full audio briefing above ☝️
+Full audio briefing coming up next 🎧
 
 RULES:
 - Plain text only — no bold, no asterisks, no markdown
@@ -117,44 +203,43 @@ RULES:
 Write it now."""
 
 
-def write_script(entries: list[dict], config_path: str = "config/config.yaml") -> str:
-    """Write a punchy 3-5 min audio teaser script."""
-    config = load_config(config_path)
-    llm_config = config.get("llm", {})
+def write_script(entries: list[dict], config_path: str = CONFIG_PATH,
+                 client: "anthropic.Anthropic | None" = None, use_cache: bool = True,
+                 moment: datetime | None = None, edition: dict | None = None,
+                 ctx: RunContext | None = None) -> str:
+    """Write a punchy 3-5 min audio teaser script for an edition, dated by its clock at `moment` (default now).
 
-    client = anthropic.Anthropic()
-    prompt = build_audio_prompt(entries, config)
+    Settings and the client come from the run's `ctx`, or a context for `config_path`.
+    """
+    ctx = ctx or RunContext(config_path)
+    config = ctx.config
+    llm_config = config.get("llm", {})
 
-    print("  Sending to Claude (audio teaser)...")
-    message = client.messages.create(
-        model=llm_config.get("model", "claude-sonnet-4-20250514"),
-        max_tokens=llm_config.get("max_tokens", 4000),
-        messages=[{"role": "user", "content": prompt}],
-    )
+    client = client or ctx.anthropic()
+    prompt = build_audio_prompt(entries, config, moment, edition)
 
-    script = message.content[0].text
+    label = f"audio teaser, {edition['id']}" if edition else "audio teaser"
+    script = _complete(client, llm_config, prompt, label, use_cache)
     word_count = len(script.split())
     est_minutes = word_count / 150
     print(f"  Audio script: {word_count} words (~{est_minutes:.1f} min)")
     return script
 
 
-def write_whatsapp_summary(entries: list[dict], config_path: str = "config/config.yaml") -> str:
+def write_whatsapp_summary(entries: list[dict], config_path: str = CONFIG_PATH,
+                           client: "anthropic.Anthropic | None" = None, use_cache: bool = True,
+                           edition: dict | None = None, moment: datetime | None = None,
+                           ctx: RunContext | None = None) -> str:
     """Write a detailed WhatsApp text summary with full story details and links."""
-    config = load_config(config_path)
+    ctx = ctx or RunContext(config_path)
+    config = ctx.config
     llm_config = config.get("llm", {})
 
-    client = anthropic.Anthropic()
-    prompt = build_whatsapp_prompt(entries, config)
-
-    print("  Sending to Claude (WhatsApp summary)...")
-    message = client.messages.create(
-        model=llm_config.get("model", "claude-sonnet-4-20250514"),
-        max_tokens=llm_config.get("max_tokens", 4000),
-        messages=[{"role": "user", "content": prompt}],
-    )
+    client = client or ctx.anthropic()
+    prompt = build_whatsapp_prompt(entries, config, edition, moment)
 
-    summary = message.content[0].text
+    label = f"WhatsApp summary, {edition['id']}" if edition else "WhatsApp summary"
+    summary = _complete(client, llm_config, prompt, label, use_cache)
     print(f"  WhatsApp summary: {len(summary.split())} words")
     return summary
 
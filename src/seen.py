@@ -0,0 +1,164 @@
+"""Seen-story index - remembers which stories earlier briefings already covered."""
+
+import hashlib
+import json
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.archive import ARCHIVE_DEFAULTS, ArchiveStore
+from src.dedup import _words, normalize_url
+
+# Defaults for the `seen:` section of sources.yaml
+SEEN_DEFAULTS = {
+    "path": "archive/seen.sqlite",  # null disables the index
+    "mode": "drop",                 # drop | downrank stories covered on an earlier day
+    "penalty": 3.0,                 # score taken off in downrank mode
+    "keep_days": 30,                # forget stories not covered for this long
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key        TEXT PRIMARY KEY,
+    first_seen TEXT NOT NULL,
+    last_seen  TEXT NOT NULL,
+    title      TEXT NOT NULL
+)
+"""
+
+
+def story_keys(entry: dict) -> list[str]:
+    """Index keys for an entry: every normalized link plus a title fingerprint.
+
+    The fingerprint is a hash of the title's distinct words, so word order,
+    case and punctuation don't matter; titles under three words are too
+    generic to fingerprint.
+    """
+    links = entry.get("links") or [entry.get("link", "")]
+    keys = [f"url:{normalize_url(link)}" for link in links if link]
+    words = sorted(set(_words(entry.get("title", ""))))
+    if len(words) >= 3:
+        keys.append("title:" + hashlib.sha1(" ".join(words).encode()).hexdigest()[:20])
+    return keys
+
+
+class SeenIndex:
+    """SQLite table of story keys and the days they were covered.
+
+    Every lookup is a primary-key probe, so checking today's entries costs the
+    same however many days of briefings are behind it.
+    """
+
+    def __init__(self, path: str = "archive/seen.sqlite"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def covered_before(self, entry: dict, day: str) -> str | None:
+        """The first day before `day` on which this story was covered, or None."""
+        keys = story_keys(entry)
+        if not keys:
+            return None
+        row = self.db.execute(
+            f"SELECT MIN(first_seen) FROM seen WHERE key IN ({','.join('?' * len(keys))}) AND first_seen < ?",
+            (*keys, day),
+        ).fetchone()
+        return row[0]
+
+    def add(self, entries: list[dict], day: str) -> None:
+        """Record entries as covered on `day` (re-running a day is harmless)."""
+        rows = [(key, day, day, e.get("title", "")) for e in entries for key in story_keys(e)]
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO seen VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET last_seen = MAX(last_seen, excluded.last_seen)",
+                rows,
+            )
+
+    def prune(self, day: str, keep_days: int) -> int:
+        """Forget stories last covered more than `keep_days` before `day`."""
+        cutoff = (date.fromisoformat(day) - timedelta(days=keep_days)).isoformat()
+        with self.db:
+            return self.db.execute("DELETE FROM seen WHERE last_seen < ?", (cutoff,)).rowcount
+
+    def seed_from_archive(self, archive_dir: str = "archive") -> int:
+        """Load the top stories of every archived day; used once for a new index.
+
+        Days come from the SQLite archive in `archive_dir` when there is one,
+        and from the daily JSON files, whose top stories may be in
+        <date>-summary.json instead (as ArchiveStore.import_json reads them).
+        """
+        days: dict[str, list[dict]] = {}
+        for path in sorted(Path(archive_dir).glob("????-??-??.json")):
+            try:
+                record = json.loads(path.read_text())
+                stories = record.get("top_stories")
+                summary_path = path.with_name(f"{path.stem}-summary.json")
+                if not stories and summary_path.exists():
+                    stories = json.loads(summary_path.read_text())
+            except (OSError, ValueError):
+                continue
+            days[record.get("date", path.stem)] = stories or []
+        db_path = Path(archive_dir) / Path(ARCHIVE_DEFAULTS["path"]).name
+        if db_path.exists():
+            with ArchiveStore(str(db_path)) as store:
+                days |= {run["date"]: run["top_stories"] for run in store.runs()}
+        for day, stories in sorted(days.items()):
+            self.add(stories, day)
+        return sum(map(len, days.values()))
+
+
+def open_index(seen_config: dict | None = None) -> SeenIndex | None:
+    """Open the index configured in sources.yaml, seeding a new one from the archive."""
+    cfg = {**SEEN_DEFAULTS, **(seen_config or {})}
+    if not cfg["path"]:
+        return None
+    index = SeenIndex(cfg["path"])
+    if not len(index):
+        seeded = index.seed_from_archive(str(Path(cfg["path"]).parent))
+        if seeded:
+            print(f"  Seen index: seeded {seeded} stories from the archive")
+    return index
+
+
+def filter_seen(entries: list[dict], index: SeenIndex, seen_config: dict | None = None,
+                today: str | None = None) -> list[dict]:
+    """Drop (or push down) stories a previous day's briefing already covered.
+
+    Stories covered earlier today are kept, so a same-day re-run still sees
+    them. In downrank mode entries keep their place relative to each other and
+    carry `seen_on` with the day they were first covered.
+    """
+    cfg = {**SEEN_DEFAULTS, **(seen_config or {})}
+    today = today or date.today().isoformat()
+    kept = []
+    for entry in entries:
+        seen_on = index.covered_before(entry, today)
+        if seen_on is None:
+            kept.append(entry)
+        elif cfg["mode"] == "downrank":
+            kept.append({**entry, "seen_on": seen_on,
+                         "score": round(entry.get("score", 0) - cfg["penalty"], 3)})
+    if cfg["mode"] == "downrank":
+        kept.sort(key=lambda e: e.get("score", 0), reverse=True)
+    return kept
+
+
+def mark_covered(entries: list[dict], seen_config: dict | None = None, today: str | None = None) -> None:
+    """Record today's top stories in the index and prune old ones."""
+    cfg = {**SEEN_DEFAULTS, **(seen_config or {})}
+    index = open_index(cfg)
+    if index is None:
+        return
+    today = today or date.today().isoformat()
+    try:
+        index.add(entries, today)
+        index.prune(today, cfg["keep_days"])
+    finally:
+        index.close()
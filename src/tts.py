@@ -1,39 +1,207 @@
 """TTS generator - converts script text to MP3 audio using ElevenLabs."""
 
 import os
+import re
+import threading
+import time
 from pathlib import Path
 
-from elevenlabs.client import ElevenLabs
+from src import metrics, ratelimit
+from src.cache import DiskCache
+from src.context import RunContext
 
 # Jessica — casual, friendly female voice
 VOICE_ID = "cgSgspJ2msm6clMCkdW9"
 MODEL_ID = "eleven_turbo_v2_5"
+OUTPUT_FORMAT = "mp3_44100_128"
 
+# Defaults for the `tts:` section of config.yaml
+TTS_DEFAULTS = {
+    "voice_id": VOICE_ID,
+    "model": MODEL_ID,
+    "max_workers": 3,       # concurrent ElevenLabs requests
+    "chunk_chars": 800,     # longest text sent in one request
+    "pause_ms": 600,        # silence inserted for each [pause]
+    "max_retries": 2,       # per chunk
+    "retry_backoff": 1.0,   # seconds, doubled after each retry
+    "cache": {"dir": "cache/tts", "max_mb": 200},  # synthesized chunks; false disables
+}
 
-def generate_audio(script: str, output_path: str) -> str:
-    """Generate MP3 audio from script text using ElevenLabs TTS."""
+_PAUSE_RE = re.compile(r"\[pause\]", re.IGNORECASE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# MPEG-1 Layer III header fields (ISO 11172-3)
+_MPEG1_SAMPLE_RATES = {44100: 0b00, 48000: 0b01, 32000: 0b10}
+_MPEG1_L3_BITRATES = {32: 1, 40: 2, 48: 3, 56: 4, 64: 5, 80: 6, 96: 7, 112: 8,
+                      128: 9, 160: 10, 192: 11, 224: 12, 256: 13, 320: 14}
+
+_audio_caches: dict[str, DiskCache] = {}
+_audio_caches_lock = threading.Lock()
+
+
+def split_script(script: str, chunk_chars: int = 800) -> list[str | None]:
+    """Split a script into TTS chunks, with None marking each [pause].
+
+    Chunks break at sentence boundaries and stay under `chunk_chars` unless a
+    single sentence is longer. Pauses at the very start/end are dropped and
+    repeated pauses collapse into one.
+    """
+    chunks: list[str | None] = []
+    for segment in _PAUSE_RE.split(script):
+        if chunks and chunks[-1] is not None:
+            chunks.append(None)
+        current = ""
+        for sentence in _SENTENCE_RE.split(segment.strip()):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if current and len(current) + 1 + len(sentence) > chunk_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+    while chunks and chunks[-1] is None:
+        chunks.pop()
+    return chunks
+
+
+def silence(ms: int, output_format: str = OUTPUT_FORMAT) -> bytes:
+    """Silent MP3 frames lasting about `ms` milliseconds, matching `output_format`.
+
+    A frame with zeroed side info and main data decodes to silence, so frames
+    can be spliced between ElevenLabs chunks. Returns b"" for formats other
+    than MPEG-1 MP3 (e.g. mp3_22050_32), where pauses are simply skipped.
+    """
+    match = re.fullmatch(r"mp3_(\d+)_(\d+)", output_format)
+    if not match:
+        return b""
+    sample_rate, kbps = int(match.group(1)), int(match.group(2))
+    if sample_rate not in _MPEG1_SAMPLE_RATES or kbps not in _MPEG1_L3_BITRATES:
+        return b""
+    header = bytes([
+        0xFF, 0xFB,  # frame sync, MPEG-1, Layer III, no CRC
+        (_MPEG1_L3_BITRATES[kbps] << 4) | (_MPEG1_SAMPLE_RATES[sample_rate] << 2),
+        0xC4,        # mono, original
+    ])
+    frame = header + bytes(144 * kbps * 1000 // sample_rate - len(header))
+    n_frames = round(ms / 1000 * sample_rate / 1152)
+    return frame * n_frames
+
+
+def _cache_config(cache: dict | bool | None) -> dict | None:
+    """The `tts.cache` setting over its defaults: true means just the defaults, false (or null) no cache."""
+    if not cache:
+        return None
+    return {**TTS_DEFAULTS["cache"], **(cache if isinstance(cache, dict) else {})}
+
+
+def _get_audio_cache(cache_config: dict) -> DiskCache:
+    """One DiskCache per directory for the whole process."""
+    with _audio_caches_lock:
+        if cache_config["dir"] not in _audio_caches:
+            _audio_caches[cache_config["dir"]] = DiskCache(
+                cache_config["dir"], max_bytes=int(cache_config["max_mb"] * 1024 * 1024))
+        return _audio_caches[cache_config["dir"]]
+
+
+def audio_cache_key(text: str, voice_id: str = VOICE_ID, model_id: str = MODEL_ID) -> str:
+    """Cache key for a chunk: everything that changes the synthesized audio."""
+    return DiskCache.key(voice_id, model_id, OUTPUT_FORMAT, " ".join(text.split()))
+
+
+def audio_cache_stats(recorder: metrics.Recorder | None = None) -> dict:
+    """Chunk cache hits/misses and ElevenLabs characters saved in a run, from its tts_chunk spans."""
+    lookups = [s.attrs for s in (recorder or metrics.current()).spans
+               if s.name == "tts_chunk" and "cache_hit" in s.attrs]
+    hits = [attrs for attrs in lookups if attrs["cache_hit"]]
+    return {"hits": len(hits), "misses": len(lookups) - len(hits),
+            "chars_saved": sum(attrs["chars"] for attrs in hits),
+            "hit_rate": len(hits) / len(lookups) if lookups else 0.0}
+
+
+def _synthesize(client, text: str, tts_config: dict, span=None) -> bytes:
+    """Synthesize one chunk, retrying with exponential backoff."""
+    max_retries = tts_config["max_retries"]
+    limit = ratelimit.limiter("tts", tts_config.get("rate_limit"))
+    for attempt in range(max_retries + 1):
+        try:
+            with limit.slot():
+                audio = b"".join(client.text_to_speech.convert(
+                    text=text,
+                    voice_id=tts_config["voice_id"],
+                    model_id=tts_config["model"],
+                    output_format=OUTPUT_FORMAT,
+                ))
+            if span is not None:
+                span.set(retries=attempt)
+            return audio
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = tts_config["retry_backoff"] * 2 ** attempt
+            print(f"  TTS chunk failed ({e}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+def _render(client, text: str, tts_config: dict, cache: DiskCache | None) -> bytes:
+    """Audio for one chunk, from the cache when this exact text was synthesized before."""
+    with metrics.span("tts_chunk", chars=len(text)) as span:
+        audio = None
+        if cache is not None:
+            key = audio_cache_key(text, tts_config["voice_id"], tts_config["model"])
+            audio = cache.get(key)
+            span.set(cache_hit=audio is not None)
+        if audio is None:
+            audio = _synthesize(client, text, tts_config, span)
+            if cache is not None:
+                cache.put(key, audio)
+        span.set(bytes=len(audio))
+        return audio
+
+
+def generate_audio(script: str, output_path: str, tts_config: dict | None = None,
+                   use_cache: bool = True, ctx: RunContext | None = None) -> str:
+    """Generate MP3 audio from script text using ElevenLabs TTS.
+
+    The script is split at [pause] markers and sentence boundaries, chunks are
+    synthesized concurrently, and their MP3 frames are written out in order
+    with real silence where each [pause] was. Chunks already in the audio cache
+    are not sent to ElevenLabs.
+    """
     api_key = os.getenv("ELEVENLABS_API_KEY")
     if not api_key:
         raise ValueError("ELEVENLABS_API_KEY env var not set")
 
-    client = ElevenLabs(api_key=api_key)
+    tts_config = {**TTS_DEFAULTS, **(tts_config or {})}
+    client = (ctx or RunContext()).elevenlabs(api_key)
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    # Strip stage directions that shouldn't be read aloud
-    import re
-    clean_script = re.sub(r'\[pause\]', '', script).strip()
-
-    print(f"  Generating audio with ElevenLabs (Jessica)...")
-    audio = client.text_to_speech.convert(
-        text=clean_script,
-        voice_id=VOICE_ID,
-        model_id=MODEL_ID,
-        output_format="mp3_44100_128",
-    )
-
-    with open(output_path, "wb") as f:
-        for chunk in audio:
-            f.write(chunk)
+    chunks = split_script(script, tts_config["chunk_chars"])
+    texts = [c for c in chunks if c is not None]
+    pause = silence(tts_config["pause_ms"])
+    cache_config = _cache_config(tts_config["cache"])
+    cache = _get_audio_cache(cache_config) if use_cache and cache_config else None
+
+    voice = "Jessica" if tts_config["voice_id"] == VOICE_ID else tts_config["voice_id"]
+    print(f"  Generating audio with ElevenLabs ({voice}), {len(texts)} chunks...")
+    with metrics.span("tts", chunks=len(texts), chars=sum(map(len, texts)), pauses=len(chunks) - len(texts)), \
+            metrics.Executor(max_workers=tts_config["max_workers"], thread_name_prefix="tts") as pool:
+        # map() yields in submission order, so chunks are written as soon as
+        # everything before them is done
+        audio = pool.map(lambda text: _render(client, text, tts_config, cache), texts)
+        # Stream into a sibling .part file and rename, so readers of output_path
+        # never see a half-written MP3
+        partial = f"{output_path}.part"
+        try:
+            with open(partial, "wb") as f:
+                for chunk in chunks:
+                    f.write(pause if chunk is None else next(audio))
+            os.replace(partial, output_path)
+        except BaseException:
+            Path(partial).unlink(missing_ok=True)
+            raise
 
     print(f"  Audio saved: {output_path}")
     return output_path
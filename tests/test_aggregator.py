@@ -0,0 +1,120 @@
+"""Tests for src/aggregator.py concurrent fetching."""
+
+import threading
+import time
+from unittest.mock import patch
+
+
+def _write_sources(tmp_path, n_feeds, fetch_section=""):
+    feeds = "".join(
+        f'  - name: "Feed {i}"\n    url: "https://example.com/{i}"\n    priority: high\n'
+        for i in range(n_feeds)
+    )
+    path = tmp_path / "sources.yaml"
+    seen_section = f'seen:\n  path: "{tmp_path / "seen.sqlite"}"\n'
+    path.write_text(f"{fetch_section}{seen_section}rss_feeds:\n{feeds}keywords_skip: []\n")
+    return str(path)
+
+
+def _slow_fetch(delays, wait=None):
+    def fetch_feed(feed_config, hours_back=48, timeout=15, cache=None):
+        if wait:
+            wait(feed_config["name"])
+        time.sleep(delays.get(feed_config["name"], 0))
+        return [{"title": feed_config["name"], "link": feed_config["url"], "summary": "",
+                 "published": "unknown", "source": feed_config["name"], "priority": "high"}]
+    return fetch_feed
+
+
+def test_aggregate_fetches_feeds_concurrently(tmp_path):
+    """Every feed is in flight at once: none returns until all six have started."""
+    sources_path = _write_sources(tmp_path, 6, "fetch:\n  max_workers: 8\n")
+    all_started = threading.Barrier(6, timeout=5)  # breaks (and fails the run) if fetches were sequential
+
+    with patch("src.aggregator.fetch_feed", side_effect=_slow_fetch({}, lambda name: all_started.wait())), \
+         patch("src.aggregator.fetch_github_trending", return_value=[]):
+        from src.aggregator import aggregate
+        entries = aggregate(sources_path)
+
+    assert len(entries) == 6
+
+
+def test_aggregate_keeps_sources_yaml_order(tmp_path):
+    sources_path = _write_sources(tmp_path, 3)
+    delays = {"Feed 0": 0.3, "Feed 1": 0.1, "Feed 2": 0.0}
+
+    with patch("src.aggregator.fetch_feed", side_effect=_slow_fetch(delays)), \
+         patch("src.aggregator.fetch_github_trending", return_value=[]):
+        from src.aggregator import aggregate
+        entries = aggregate(sources_path)
+
+    assert [e["source"] for e in entries] == ["Feed 0", "Feed 1", "Feed 2"]
+
+
+def test_aggregate_moves_on_after_total_timeout(tmp_path):
+    """A hanging feed must not hold up the run past the global deadline."""
+    sources_path = _write_sources(tmp_path, 3, "fetch:\n  total_timeout: 0.5\n")
+    release, hung_feed_done = threading.Event(), threading.Event()
+
+    def hang(name):
+        if name == "Feed 1":
+            release.wait(10)
+            hung_feed_done.set()
+
+    with patch("src.aggregator.fetch_feed", side_effect=_slow_fetch({}, hang)), \
+         patch("src.aggregator.fetch_github_trending", return_value=[]):
+        from src.aggregator import aggregate
+        entries = aggregate(sources_path)
+
+    assert not hung_feed_done.is_set()  # returned while Feed 1 was still hanging
+    release.set()
+    assert sorted(e["source"] for e in entries) == ["Feed 0", "Feed 2"]
+
+
+def _trending_html():
+    from pathlib import Path
+    return (Path(__file__).parent / "fixtures" / "github_trending.html").read_text()
+
+
+def test_parse_trending_reads_fields_per_repo():
+    from src.aggregator import parse_trending
+    repos = parse_trending(_trending_html())
+
+    assert len(repos) == 25
+    assert repos[0] == {
+        "slug": "ggml-org/llama.cpp", "description": "LLM inference in C/C++",
+        "language": "C++", "stars_today": 1204, "stars": 82345,
+    }
+    # torvalds/linux shows no "stars today"; later repos must not shift
+    linux = next(r for r in repos if r["slug"] == "torvalds/linux")
+    assert linux["stars_today"] is None
+    assert repos[9]["slug"] == "langchain-ai/langgraph"
+    assert repos[9]["stars_today"] == 278
+    # Entities are decoded and header/nav links are not mistaken for repos
+    assert repos[5]["description"].startswith("Fine-tuning & Reinforcement")
+    assert not any(r["slug"].startswith("features/") for r in repos)
+
+
+def test_is_ai_repo_avoids_substring_false_positives():
+    from src.aggregator import is_ai_repo, parse_trending
+    by_slug = {r["slug"]: r for r in parse_trending(_trending_html())}
+
+    assert is_ai_repo(by_slug["ggml-org/llama.cpp"])
+    assert is_ai_repo(by_slug["unslothai/unsloth"])
+    assert not is_ai_repo(by_slug["wagtail/wagtail"])
+    assert not is_ai_repo(by_slug["dragonflydb/dragonfly"])
+
+
+def test_fetch_github_trending_builds_entries():
+    html = _trending_html().encode()
+    with patch("src.aggregator._http_get", return_value=(200, html, {})):
+        from src.aggregator import fetch_github_trending
+        entries = fetch_github_trending(max_repos=3)
+
+    assert [e["link"] for e in entries] == [
+        "https://github.com/ggml-org/llama.cpp",
+        "https://github.com/huggingface/smolagents",
+        "https://github.com/unslothai/unsloth",
+    ]
+    assert entries[0]["title"] == "🔥 Trending on GitHub: ggml-org/llama.cpp (1,204 stars today)"
+    assert entries[0]["summary"] == "LLM inference in C/C++ (C++, 82,345 stars)"
@@ -0,0 +1,100 @@
+"""Tests for the per-source analytics over the archive."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.analytics import main, source_report
+from src.archive import ArchiveStore
+
+SOURCES = {
+    "fetch": {"feed_timeout": 10},
+    "ingest": {"min_poll_minutes": 15, "max_poll_minutes": 360},
+    "rss_feeds": [{"name": "Fast", "url": "https://fast.example/rss"},
+                  {"name": "Flaky", "url": "https://flaky.example/rss", "hours_back": 168},
+                  {"name": "Quiet", "url": "https://quiet.example/rss"}],
+}
+CONFIG = {"delivery": {"schedule": {"timezone": "UTC", "time": "08:00"}}}
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _day(date: str, flaky_fails: bool) -> dict:
+    """Fast makes the top story (published 6h and 30 min before delivery), Quiet is ranked but never on top."""
+    spans = [
+        {"name": "fetch_feed", "source": "Fast", "duration": 0.2, "recent": 20},
+        {"name": "fetch_feed", "source": "Quiet", "duration": 1.0, "recent": 5},
+        {"name": "fetch_feed", "source": "Flaky", "duration": 6.0, "recent": 3},
+        {"name": "llm", "duration": 9.0},
+    ]
+    if flaky_fails:
+        spans[2] = {"name": "fetch_deadline_missed", "source": "Flaky", "duration": 45}
+    entries = [
+        {"title": f"Fast {date} a", "link": f"https://fast.example/{date}/a", "source": "Fast",
+         "published": f"{date}T02:00:00+00:00", "summary": "", "priority": "high"},
+        {"title": f"Fast {date} b", "link": f"https://fast.example/{date}/b", "source": "Fast",
+         "published": f"{date}T07:30:00+00:00", "summary": "", "priority": "high"},
+        {"title": f"Quiet {date}", "link": f"https://quiet.example/{date}", "source": "Quiet",
+         "published": f"{date}T01:00:00+00:00", "summary": "", "priority": "low"},
+    ]
+    return {"date": date, "entries": entries, "metrics": {"spans": spans},
+            "top_stories": [{"title": e["title"], "link": e["link"], "source": e["source"]} for e in entries[:2]]}
+
+
+@pytest.fixture
+def report(tmp_path):
+    with ArchiveStore(str(tmp_path / "archive.sqlite")) as store:
+        for n in range(1, 7):
+            store.save_run(_day(f"2026-02-{n:02d}", flaky_fails=n % 2 == 0))
+        yield {r["source"]: r for r in source_report(store, SOURCES, CONFIG)}
+
+
+def test_latency_failures_and_yield_per_source(report):
+    fast, flaky, quiet = report["Fast"], report["Flaky"], report["Quiet"]
+    assert (fast["days"], fast["fetches"], fast["failures"]) == (6, 6, 0)
+    assert (fast["p50_ms"], fast["p95_ms"], fast["fetched"]) == (200, 200, 120)
+    assert (fast["ranked"], fast["top"], fast["top_share"]) == (12, 12, 1.0)
+    assert flaky["failure_rate"] == 0.5 and flaky["fetched"] == 9
+    assert (quiet["ranked"], quiet["top"], quiet["top_share"]) == (6, 0, 0.0)
+
+
+def test_suggestions_and_pruning_notes(report):
+    fast, flaky, quiet = report["Fast"], report["Flaky"], report["Quiet"]
+    assert fast["top_age_p90_hours"] == 6.0
+    assert fast["suggested_hours_back"] == 24
+    assert fast["suggested_poll_minutes"] == 330  # median gap between its stories
+    assert fast["notes"] == []
+    assert quiet["suggested_hours_back"] is None
+    assert quiet["suggested_poll_minutes"] == 360
+    assert quiet["notes"] == ["never in top stories in 6 days"]
+    assert "fails 50% of fetches" in flaky["notes"]
+    assert "slow (p95 6.0s of a 10s timeout)" in flaky["notes"]
+    assert flaky["hours_back"] == 168
+
+
+def test_date_range_limits_the_report(tmp_path):
+    with ArchiveStore(str(tmp_path / "archive.sqlite")) as store:
+        for n in range(1, 7):
+            store.save_run(_day(f"2026-02-{n:02d}", flaky_fails=n % 2 == 0))
+        rows = {r["source"]: r for r in source_report(store, SOURCES, CONFIG, since="2026-02-05")}
+    assert rows["Fast"]["days"] == 2 and rows["Fast"]["ranked"] == 4
+    assert rows["Quiet"]["notes"] == []  # too few days to judge
+
+
+def test_importing_analytics_loads_no_pipeline():
+    code = ("import sys, src.analytics; "
+            "print(','.join(m for m in ('src.main', 'src.backfill', 'src.daemon', 'anthropic', 'elevenlabs') "
+            "if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_missing_archive_is_reported_not_created(tmp_path, capsys):
+    db = tmp_path / "archive" / "archive.sqlite"
+    with pytest.raises(SystemExit) as exc:
+        main(["--db", str(db)])
+    assert exc.value.code == 1
+    assert f"No archive at {db}" in capsys.readouterr().err
+    assert not db.exists()
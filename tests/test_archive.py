@@ -0,0 +1,115 @@
+import json
+import sqlite3
+
+import pytest
+
+from src.archive import ArchiveStore
+
+
+def _record(date, titles, **extra):
+    entries = [{"title": t, "link": f"https://example.com/{date}/{i}", "source": "Test",
+                "summary": f"<p>About {t}</p><p>Points: 120</p>", "published": f"{date}T08:00:00+00:00",
+                "priority": "high", "score": 5.0 - i}
+               for i, t in enumerate(titles)]
+    return {"date": date, "entries_found": len(entries), "entries": entries,
+            "script_word_count": 3, "audio_path": f"audio/briefing-{date}.mp3",
+            "top_stories": [{"title": t, "link": e["link"], "source": "Test"} for t, e in zip(titles, entries)],
+            **extra}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ArchiveStore(str(tmp_path / "archive.sqlite")) as store:
+        store.save_run(_record("2026-02-20", ["llama.cpp joins Hugging Face", "New vision model"]),
+                       "Script about llama.cpp", "Summary one")
+        store.save_run(_record("2026-02-21", ["Gemini 3.1 Pro tops ARC-AGI", "Agents everywhere"]),
+                       "Script about Gemini", "Summary two")
+        store.save_run(_record("2026-02-22", ["GPT-5 launch recap", "llama.cpp hits 100k stars"]),
+                       "Script about GPT-5", "Summary three")
+        yield store
+
+
+def test_search_matches_punctuated_words_and_ranks_titles(store):
+    hits = store.search("llama.cpp")
+    assert {h["date"] for h in hits} == {"2026-02-20", "2026-02-22"}
+    assert all("llama.cpp" in h["title"] for h in hits)
+
+
+def test_search_date_range(store):
+    hits = store.search("llama.cpp", since="2026-02-21")
+    assert [h["date"] for h in hits] == ["2026-02-22"]
+
+
+def test_raw_query_passes_fts_syntax(store):
+    hits = store.search("gemini OR gpt*", raw=True)
+    assert {h["date"] for h in hits} == {"2026-02-21", "2026-02-22"}
+
+
+def test_summaries_are_indexed_clean_but_entries_come_back_as_saved(store):
+    """Backfill re-ranks archived entries, so HN points and feed extras must survive the round trip."""
+    [hit] = store.search("vision")
+    assert "<p>" not in hit["snippet"] and "Points" not in hit["snippet"]
+
+    record = _record("2026-02-23", ["Big model release"])
+    record["entries"][0] |= {"links": ["https://a.com", "https://b.com"], "seen_on": ["2026-02-22"]}
+    store.save_run(record)
+    entry = store.get_run("2026-02-23")["entries"][0]
+    assert entry == {**record["entries"][0], "rank": 1}
+
+
+def test_resaving_loaded_entries_in_a_new_order_reranks_them(store):
+    run = store.get_run("2026-02-20")
+    store.save_run({**run, "entries": run["entries"][::-1]})
+    assert [(e["rank"], e["title"]) for e in store.get_run("2026-02-20")["entries"]] == [
+        (1, "New vision model"), (2, "llama.cpp joins Hugging Face")]
+
+
+def test_older_archives_get_the_new_columns(tmp_path):
+    path = str(tmp_path / "old.sqlite")
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE entries (id INTEGER PRIMARY KEY, date TEXT NOT NULL, rank INTEGER NOT NULL, "
+                   "title TEXT NOT NULL, link TEXT NOT NULL, source TEXT NOT NULL, priority TEXT, published TEXT, "
+                   "score REAL, summary TEXT NOT NULL, links TEXT)")
+    with ArchiveStore(path) as store:
+        store.save_run(_record("2026-02-20", ["Story"]))
+        assert store.get_run("2026-02-20")["entries"][0]["summary"].startswith("<p>About Story")
+
+
+def test_saving_a_day_again_replaces_it(store):
+    store.save_run(_record("2026-02-22", ["Replacement story"]), "New script", "New summary")
+
+    assert store.search("GPT-5") == []
+    assert [e["title"] for e in store.get_run("2026-02-22")["entries"]] == ["Replacement story"]
+    assert store.search_briefings("script")[0]["date"] == "2026-02-22"
+    assert [h["date"] for h in store.search_briefings("GPT-5")] == []
+
+
+def test_runs_lists_days_newest_first(store):
+    store.save_metrics("2026-02-21", {"wall_time": 12.5, "spans": []})
+    assert [r["date"] for r in store.runs(until="2026-02-21")] == ["2026-02-21", "2026-02-20"]
+    assert store.get_run("2026-02-21")["metrics"]["wall_time"] == 12.5
+
+
+def test_metrics_are_kept_for_a_day_that_was_never_archived(store):
+    store.save_metrics("2026-02-23", {"wall_time": 3.0, "spans": [{"name": "fetch_feed", "error": "timeout"}]})
+    run = store.get_run("2026-02-23")
+    assert run["entries"] == [] and run["metrics"]["spans"][0]["error"] == "timeout"
+
+
+def test_import_json_archives(tmp_path):
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "briefing-2026-02-21.txt").write_text("Old script")
+    record = _record("2026-02-21", ["Imported story"], script_path=str(tmp_path / "scripts" / "briefing-2026-02-21.txt"))
+    del record["top_stories"]
+    (tmp_path / "2026-02-21.json").write_text(json.dumps(record, indent=2))
+    (tmp_path / "2026-02-21-summary.json").write_text(
+        json.dumps([{"title": "Imported story", "link": "https://example.com/x", "source": "Test"}]))
+
+    with ArchiveStore(str(tmp_path / "archive.sqlite")) as store:
+        assert store.import_json(str(tmp_path)) == 1
+        assert store.import_json(str(tmp_path)) == 0  # already there
+        run = store.get_run("2026-02-21")
+
+    assert run["script"] == "Old script"
+    assert run["top_stories"][0]["title"] == "Imported story"
+    assert run["entries"][0]["title"] == "Imported story"
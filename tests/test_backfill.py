@@ -0,0 +1,109 @@
+"""Tests for the multi-day backfill."""
+
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.backfill import backfill, days_between, rebuild_entries
+from src.checkpoint import RunDir
+from src.ingest import IngestStore
+from src.schedule import delivery_time
+
+SOURCES = {"rss_feeds": [{"name": "Feed", "url": "https://feed.example.com/rss", "priority": "high"}],
+           "seen": {"path": None}, "ingest": {"path": "cache/ingest.sqlite"}}
+CONFIG = {"delivery": {"schedule": {"timezone": "Asia/Dubai", "time": "08:00"}}}
+
+
+def _entry(title: str, published: str) -> dict:
+    return {"title": title, "link": f"https://example.com/{title.replace(' ', '-')}",
+            "summary": f"About {title}.", "published": published}
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("style:\n  max_stories: 8\n")
+    (tmp_path / "sources").mkdir()
+    (tmp_path / "sources" / "sources.yaml").write_text("rss_feeds: []\nseen:\n  path: null\n")
+    return tmp_path
+
+
+def test_days_between():
+    assert days_between("2026-02-27", "2026-03-02") == ["2026-02-27", "2026-02-28", "2026-03-01", "2026-03-02"]
+    assert days_between("2026-02-22") == ["2026-02-22"]
+    with pytest.raises(ValueError):
+        days_between("2026-02-22", "2026-02-20")
+
+
+def test_entries_rebuilt_from_the_window_before_that_mornings_delivery():
+    store = IngestStore("cache/ingest.sqlite")
+    store.add_entries("https://feed.example.com/rss", [
+        _entry("Too old for the window", "2026-02-19T12:00:00+00:00"),
+        _entry("Inside the window", "2026-02-21T18:00:00+00:00"),
+        _entry("Published after delivery", "2026-02-22T05:00:00+00:00"),  # 09:00 in Dubai
+    ])
+    store.close()
+
+    entries, origin = rebuild_entries("2026-02-22", SOURCES, CONFIG)
+
+    assert origin == "ingest"
+    assert [e["title"] for e in entries] == ["Inside the window"]
+    assert entries[0]["source"] == "Feed"
+    assert delivery_time("2026-02-22", CONFIG["delivery"]["schedule"]).astimezone(timezone.utc) == \
+        datetime(2026, 2, 22, 4, 0, tzinfo=timezone.utc)
+
+
+def test_entries_fall_back_to_the_archived_day():
+    from src.archive import ArchiveStore
+    with ArchiveStore("archive/archive.sqlite") as store:
+        store.save_run({"date": "2026-02-22", "entries": [
+            {**_entry("Archived story", "2026-02-21T20:00:00+00:00"), "source": "Feed", "priority": "high"}]})
+
+    entries, origin = rebuild_entries("2026-02-22", SOURCES, CONFIG)
+
+    assert origin == "archive"
+    assert [e["title"] for e in entries] == ["Archived story"]
+
+
+def test_days_run_concurrently_without_delivering(workdir):
+    all_days_started = threading.Barrier(3, timeout=5)  # breaks unless all three days run at once
+
+    def slow_script(entries, **kwargs):
+        day = f"{kwargs['moment']:%Y-%m-%d}"  # dated by the day's delivery time, not the day it's made
+        all_days_started.wait()
+        return f"Script for {day}."
+
+    def fake_audio(script, path, *args, **kwargs):
+        (workdir / "audio").mkdir(exist_ok=True)
+        (workdir / path).write_bytes(b"ID3")
+
+    entries = [{**_entry("Story", "2026-02-21T20:00:00+00:00"), "source": "Feed", "priority": "high"}]
+    with patch("src.backfill.rebuild_entries", return_value=(entries, "ingest")) as rebuild, \
+         patch("src.main.write_script", side_effect=slow_script), \
+         patch("src.main.write_whatsapp_summary", return_value="Summary."), \
+         patch("src.main.generate_audio", side_effect=fake_audio), \
+         patch("src.main.deliver_text") as text, \
+         patch("src.main.deliver_voice_note") as voice:
+        results = backfill("2026-02-20", "2026-02-22", workers=3)
+        assert [r["date"] for r in results] == ["2026-02-20", "2026-02-21", "2026-02-22"]
+        assert all(r["status"] == "ok" for r in results)
+        text.assert_not_called()
+        voice.assert_not_called()
+        assert RunDir("2026-02-21").load("script") == "Script for 2026-02-21."
+
+        # A second backfill resumes from the checkpoints instead of rebuilding
+        rebuild.reset_mock()
+        results = backfill("2026-02-20", "2026-02-22")
+        rebuild.assert_not_called()
+        assert {r["origin"] for r in results} == {"checkpoint"}
+
+
+def test_day_without_entries_is_reported_as_failed(workdir):
+    with patch("src.backfill.rebuild_entries", return_value=([], "none")), \
+         patch("src.main.write_script") as script:
+        [row] = backfill("2026-02-22")
+    assert row["status"].startswith("failed: no entries")
+    script.assert_not_called()
@@ -0,0 +1,37 @@
+"""Tests for src/cache.py."""
+
+import os
+import time
+
+from src.cache import DiskCache
+
+
+def test_get_returns_what_was_put(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024)
+    key = DiskCache.key("model", 100, "prompt")
+    assert cache.get(key) is None
+    cache.put(key, b"hello")
+    assert cache.get(key) == b"hello"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1024, ttl_seconds=60)
+    cache.put("k", b"old")
+    old = time.time() - 120
+    os.utime(tmp_path / "k", (old, old))
+    assert cache.get("k") is None
+    assert not (tmp_path / "k").exists()
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=250)
+    for i, key in enumerate(["a", "b"]):
+        cache.put(key, b"x" * 100)
+        os.utime(tmp_path / key, (1000 + i, 1000 + i))
+    cache.get("a")  # "a" is now the most recently used
+    cache.put("c", b"x" * 100)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
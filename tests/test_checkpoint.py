@@ -0,0 +1,31 @@
+from src.checkpoint import RunDir
+
+
+def test_saved_stage_loads_back(tmp_path):
+    run_dir = RunDir("2026-02-22", root=str(tmp_path))
+    run_dir.save_json("entries", [{"title": "A"}])
+    assert RunDir("2026-02-22", root=str(tmp_path)).load_json("entries") == [{"title": "A"}]
+
+
+def test_edited_file_is_not_done(tmp_path):
+    run_dir = RunDir("2026-02-22", root=str(tmp_path))
+    path = run_dir.save("script", "Script.")
+    path.write_text("Hand-edited script.")
+    assert not run_dir.done("script")
+    assert run_dir.load("script") is None
+
+
+def test_new_inputs_make_later_stages_stale(tmp_path):
+    run_dir = RunDir("2026-02-22", root=str(tmp_path))
+    run_dir.save_json("entries", [{"title": "A"}])
+    run_dir.save("script", "Script.", inputs=("entries",))
+    assert run_dir.done("script")
+    run_dir.save_json("entries", [{"title": "B"}])
+    assert not run_dir.done("script")
+
+
+def test_clear_forgets_every_stage(tmp_path):
+    run_dir = RunDir("2026-02-22", root=str(tmp_path))
+    run_dir.save("summary", "Summary.")
+    run_dir.clear()
+    assert RunDir("2026-02-22", root=str(tmp_path)).load("summary") is None
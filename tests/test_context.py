@@ -0,0 +1,92 @@
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.config import load_config
+from src.context import ConfigError, RunContext
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("style:\n  max_stories: 8\nllm:\n  model: claude-test\n")
+    return path
+
+
+def test_config_is_parsed_once_until_the_file_changes(config_path):
+    with patch("src.context.load_config", wraps=load_config) as parse:
+        assert RunContext(str(config_path)).config["style"]["max_stories"] == 8
+        assert RunContext(str(config_path)).config["llm"]["model"] == "claude-test"
+        assert parse.call_count == 1
+
+        config_path.write_text("style:\n  max_stories: 5\n")
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert RunContext(str(config_path)).config["style"]["max_stories"] == 5
+        assert parse.call_count == 2
+
+
+def test_invalid_config_lists_every_problem(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("style:\n  max_stories: eight\ntts:\n  max_workers: 3\nllm: [claude]\n")
+    with pytest.raises(ConfigError) as exc:
+        RunContext(str(path)).config
+    assert "style.max_stories should be a int" in str(exc.value)
+    assert "llm should be a dict" in str(exc.value)
+    assert "tts" not in str(exc.value)
+
+
+def test_nested_sections_are_checked_too(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("delivery:\n  schedule:\n    time: '8am'\n    timezone: Mars/Olympus\n"
+                    "llm:\n  packing:\n    token_budget: lots\ntts:\n  cache: false\n"
+                    "editions:\n  - id: en\n  - id: ur\n    timezone: Karachi\n    listener: [Ayesha]\n")
+    with pytest.raises(ConfigError) as exc:
+        RunContext(str(path)).config
+    message = str(exc.value)
+    assert "llm.packing.token_budget should be a int" in message
+    assert "tts.cache" not in message  # false turns the audio cache off
+    assert "delivery.schedule.time should be HH:MM" not in message  # type problems are reported first
+
+    path.write_text("delivery:\n  schedule:\n    time: '8am'\n    timezone: Mars/Olympus\n"
+                    "editions:\n  - id: en\n  - id: ur\n    timezone: Karachi\n    listener: [Ayesha]\n")
+    with pytest.raises(ConfigError) as exc:
+        RunContext(str(path)).config
+    message = str(exc.value)
+    assert "delivery.schedule.time should be HH:MM, got '8am'" in message
+    assert "delivery.schedule.timezone is not a known timezone ('Mars/Olympus')" in message
+    assert "editions[1].listener should be a str" in message
+    assert "editions[1].timezone is not a known timezone ('Karachi')" in message
+
+
+def test_loaders_are_still_importable_from_their_old_modules(config_path):
+    from src.aggregator import load_sources
+    from src.scriptwriter import load_config as old_load_config
+
+    assert old_load_config(str(config_path)) == load_config(str(config_path))
+    assert callable(load_sources)
+
+
+def test_feeds_need_a_name_and_url(tmp_path):
+    path = tmp_path / "sources.yaml"
+    path.write_text("rss_feeds:\n  - name: A\n    url: https://a.com/rss\n  - name: B\n")
+    with pytest.raises(ConfigError, match=r"rss_feeds\[1\] needs a name and a url"):
+        RunContext(sources_path=str(path)).sources
+
+
+def test_clients_are_shared_by_every_context(config_path, monkeypatch):
+    monkeypatch.setattr("src.context._clients", {})
+    clients = []
+
+    def make():
+        clients.append(RunContext(str(config_path)).anthropic())
+
+    threads = [threading.Thread(target=make) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(c) for c in clients}) == 1
+    assert RunContext(str(config_path)).http() is RunContext().http()
@@ -0,0 +1,104 @@
+import threading
+import zoneinfo
+from datetime import datetime, timedelta
+from unittest.mock import ANY, patch
+
+from src import metrics
+from src.context import RunContext
+from src.daemon import next_delivery, prefetch_times, run_day
+from src.schedule import SCHEDULE_DEFAULTS
+
+DUBAI = zoneinfo.ZoneInfo("Asia/Dubai")
+
+
+def test_next_delivery_later_today_or_tomorrow():
+    schedule = {**SCHEDULE_DEFAULTS, "time": "08:00"}
+    early = datetime(2026, 2, 22, 6, 30, tzinfo=DUBAI)
+    late = datetime(2026, 2, 22, 8, 0, tzinfo=DUBAI)
+    assert next_delivery(early, schedule) == datetime(2026, 2, 22, 8, 0, tzinfo=DUBAI)
+    assert next_delivery(late, schedule) == datetime(2026, 2, 23, 8, 0, tzinfo=DUBAI)
+
+
+def test_next_delivery_converts_to_schedule_timezone():
+    utc = datetime(2026, 2, 22, 3, 0, tzinfo=zoneinfo.ZoneInfo("UTC"))  # 07:00 in Dubai
+    assert next_delivery(utc, SCHEDULE_DEFAULTS) == datetime(2026, 2, 22, 8, 0, tzinfo=DUBAI)
+
+
+def test_prefetch_times_roll_up_to_the_final_refresh():
+    delivery = datetime(2026, 2, 22, 8, 0, tzinfo=DUBAI)
+    schedule = {**SCHEDULE_DEFAULTS, "prefetch_minutes": 60, "prefetch_every_minutes": 20,
+                "final_prefetch_minutes": 3}
+    assert [t.strftime("%H:%M") for t in prefetch_times(delivery, schedule)] == \
+        ["07:00", "07:20", "07:40", "07:57"]
+
+
+def _run_day(delivery, schedule, aggregate_side_effect):
+    calls = []
+    ctx = RunContext()
+    with patch("src.daemon._wait_until", return_value=False), \
+         patch("src.daemon._warm_up"), \
+         patch("src.daemon.aggregate", side_effect=aggregate_side_effect) as aggregate, \
+         patch("src.daemon.run", side_effect=lambda **kw: calls.append(kw)):
+        delivered = run_day(delivery, schedule, ctx, threading.Event(), use_cache=True)
+    # The daemon's context (its config and sources paths) is the one every stage gets
+    assert all(c.kwargs["ctx"] is ctx for c in aggregate.call_args_list)
+    assert all(kw.pop("ctx") is ctx for kw in calls)
+    return delivered, aggregate.call_count, calls
+
+
+def test_run_day_delivers_with_the_latest_prefetched_entries():
+    delivery = datetime.now(DUBAI) + timedelta(hours=2)
+    schedule = {**SCHEDULE_DEFAULTS, "prefetch_minutes": 30, "prefetch_every_minutes": 10}
+    batches = iter([[{"title": f"batch {i}"}] for i in range(10)])
+
+    def aggregate(ctx=None):
+        with metrics.span("fetch_feed"):
+            return next(batches)
+
+    delivered, fetches, calls = _run_day(delivery, schedule, aggregate)
+
+    assert delivered
+    assert fetches == 4  # -30, -20, -10 and the final -3 minutes
+    [kwargs] = calls
+    recorder = kwargs.pop("recorder")
+    assert kwargs == {"entries": [{"title": "batch 3"}], "use_cache": True}
+    assert [s.name for s in recorder.spans] == ["fetch_feed"] * 4  # the pre-fetches are part of the run
+
+
+def test_run_day_inside_the_window_fetches_immediately_and_survives_failures():
+    delivery = datetime.now(DUBAI) + timedelta(minutes=1)  # past the final prefetch already
+
+    def failing_aggregate(ctx=None):
+        raise RuntimeError("feeds down")
+
+    with patch("src.daemon._wait_until", return_value=False), \
+         patch("src.daemon._warm_up"), \
+         patch("src.daemon.aggregate", side_effect=failing_aggregate) as aggregate, \
+         patch("src.daemon.run", side_effect=SystemExit(1)) as run:
+        assert run_day(delivery, SCHEDULE_DEFAULTS, RunContext(), threading.Event())
+
+    assert aggregate.call_count == 1
+    run.assert_called_once_with(entries=None, recorder=ANY, ctx=ANY)  # nothing pre-fetched: run aggregates itself
+
+
+def test_run_day_stops_when_asked():
+    stop = threading.Event()
+    stop.set()
+    with patch("src.daemon.aggregate") as aggregate, patch("src.daemon.run") as run:
+        assert not run_day(datetime.now(DUBAI) + timedelta(hours=2), SCHEDULE_DEFAULTS, RunContext(), stop)
+    aggregate.assert_not_called()
+    run.assert_not_called()
+
+
+def test_prefetched_entries_are_stamped_in_the_schedule_timezone():
+    from src.daemon import _prefetch
+    delivery = datetime.now(DUBAI) + timedelta(minutes=1)
+    with patch("src.daemon._wait_until", return_value=False), \
+         patch("src.daemon._warm_up"), \
+         patch("src.daemon.aggregate", return_value=[{"title": "Story"}]), \
+         patch("src.daemon._prefetch", wraps=_prefetch) as prefetch, \
+         patch("src.daemon.run") as run:
+        assert run_day(delivery, SCHEDULE_DEFAULTS, RunContext(), threading.Event())
+
+    assert prefetch.call_args.args[1] is DUBAI
+    run.assert_called_once_with(entries=[{"title": "Story"}], recorder=ANY, ctx=ANY)
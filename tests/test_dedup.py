@@ -0,0 +1,73 @@
+"""Tests for src/dedup.py story clustering."""
+
+import random
+import time
+
+from src.dedup import dedup_entries, normalize_url
+
+
+def _entry(title, link, source, summary="..."):
+    return {"title": title, "link": link, "source": source, "summary": summary,
+            "published": "2026-02-22T08:00:00+00:00", "priority": "high"}
+
+
+def test_normalize_url_strips_noise():
+    assert normalize_url("https://www.Example.com/post/?utm_source=hn#comments") == "example.com/post"
+    assert normalize_url("http://example.com/post?b=2&a=1") == "example.com/post?a=1&b=2"
+
+
+def test_same_url_across_sources_is_merged():
+    entries = [
+        _entry("llama.cpp joins Hugging Face", "https://huggingface.co/blog/ggml?utm_source=hn", "Hacker News AI"),
+        _entry("Unrelated story about databases", "https://example.com/db", "Hacker News Frontpage"),
+        _entry("GGML and llama.cpp join HF", "https://huggingface.co/blog/ggml/", "HuggingFace Blog"),
+    ]
+    result = dedup_entries(entries)
+
+    assert len(result) == 2
+    assert result[0]["title"] == "llama.cpp joins Hugging Face"
+    assert result[0]["sources"] == ["Hacker News AI", "HuggingFace Blog"]
+    assert len(result[0]["links"]) == 2
+    assert "sources" not in result[1]
+
+
+def test_near_identical_titles_are_merged():
+    entries = [
+        _entry("OpenAI releases GPT-5 with a new reasoning mode", "https://openai.com/gpt5", "OpenAI Blog"),
+        _entry("OpenAI releases GPT-5 with new reasoning mode", "https://news.example.com/a", "Latent Space"),
+        _entry("Anthropic ships a new Claude model for coding", "https://anthropic.com/c", "Anthropic News"),
+    ]
+    result = dedup_entries(entries)
+    assert [e["source"] for e in result] == ["OpenAI Blog", "Anthropic News"]
+
+
+def test_hn_boilerplate_summaries_do_not_merge_unrelated_stories():
+    boilerplate = ("<p>Article URL: <a href=\"https://x.com\">https://x.com</a></p>"
+                   "<p>Comments URL: <a href=\"https://news.ycombinator.com/item?id=1\">link</a></p>"
+                   "<p>Points: 120</p><p># Comments: 45</p>")
+    entries = [
+        _entry("A new vector database written in Rust", "https://a.com", "Hacker News AI", boilerplate),
+        _entry("Why my startup stopped using Kubernetes", "https://b.com", "Hacker News AI", boilerplate),
+    ]
+    assert len(dedup_entries(entries)) == 2
+
+
+def test_dedup_scales_to_thousands_of_entries():
+    rng = random.Random(0)
+    vocab = [f"term{i}" for i in range(5000)]
+
+    def text(n):
+        return " ".join(rng.choice(vocab) for _ in range(n))
+
+    entries = [
+        _entry(text(rng.randint(5, 12)), f"https://example.com/{i}", f"Feed {i % 50}", text(40))
+        for i in range(3000)
+    ]
+    # Mirrors of the first 100 stories under a different URL and source
+    entries += [dict(e, link=e["link"] + "/amp", source="Mirror") for e in entries[:100]]
+
+    started = time.monotonic()
+    result = dedup_entries(entries)
+    assert time.monotonic() - started < 5
+    assert len(result) == 3000
+    assert result[0]["sources"] == ["Feed 0", "Mirror"]
@@ -0,0 +1,145 @@
+"""Tests for src/deliver.py."""
+
+import errno
+import os
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("WHATSAPP_TARGET_NUMBER", "+971500000000")
+    return tmp_path / "home"
+
+
+def test_stage_media_hardlinks_instead_of_copying(tmp_path, home):
+    from src.deliver import stage_media
+    audio = tmp_path / "briefing.mp3"
+    audio.write_bytes(b"mp3 bytes")
+
+    staged = stage_media(str(audio))
+
+    assert staged == home / ".openclaw" / "media" / "briefing.mp3"
+    assert os.path.samefile(staged, audio)
+    assert [p.name for p in staged.parent.iterdir()] == ["briefing.mp3"]
+
+
+def test_stage_media_falls_back_to_copy_across_filesystems(tmp_path, home):
+    from src.deliver import stage_media
+    audio = tmp_path / "briefing.mp3"
+    audio.write_bytes(b"mp3 bytes")
+
+    with patch("src.deliver.os.link", side_effect=OSError(errno.EXDEV, "cross-device")):
+        staged = stage_media(str(audio))
+
+    assert staged.read_bytes() == b"mp3 bytes"
+    assert not os.path.samefile(staged, audio)
+
+
+def test_stage_media_replaces_previous_file(tmp_path, home):
+    from src.deliver import stage_media
+    audio = tmp_path / "briefing.mp3"
+    audio.write_bytes(b"old")
+    stage_media(str(audio))
+    audio.unlink()
+    audio.write_bytes(b"new")
+
+    assert stage_media(str(audio)).read_bytes() == b"new"
+
+
+def test_text_and_voice_note_are_separate_openclaw_sends(tmp_path, home):
+    from src.deliver import deliver_text, deliver_voice_note
+    audio = tmp_path / "briefing.mp3"
+    audio.write_bytes(b"mp3")
+
+    with patch("src.deliver.subprocess.run") as run:
+        deliver_text("Summary")
+        deliver_voice_note(str(audio))
+
+    text_cmd, voice_cmd = (c.args[0] for c in run.call_args_list)
+    assert text_cmd[-2:] == ["--message", "Summary"] and "--media" not in text_cmd
+    assert voice_cmd[voice_cmd.index("--media") + 1] == str(home / ".openclaw" / "media" / "briefing.mp3")
+
+
+def _fake_openclaw(bin_dir, monkeypatch, overlap=0, fail_first_for=()):
+    """An `openclaw` on PATH that logs its --target and fails once for some targets.
+
+    With `overlap`, each send waits until that many sends have started, and
+    fails if they never do (i.e. the sends weren't running at once).
+    """
+    import stat
+    import sys
+    bin_dir.mkdir()
+    log = bin_dir / "sends.log"
+    exe = bin_dir / "openclaw"
+    exe.write_text(f"""#!{sys.executable}
+import os, sys, time
+target = sys.argv[sys.argv.index("--target") + 1]
+media = sys.argv[sys.argv.index("--media") + 1] if "--media" in sys.argv else ""
+marker = os.path.join({str(bin_dir)!r}, "failed-" + target)
+if target in {list(fail_first_for)!r} and not os.path.exists(marker):
+    open(marker, "w").close()
+    sys.exit("gateway busy")
+open(os.path.join({str(bin_dir)!r}, "started-" + target), "w").close()
+deadline = time.monotonic() + 10
+while sum(n.startswith("started-") for n in os.listdir({str(bin_dir)!r})) < {overlap}:
+    if time.monotonic() > deadline:
+        sys.exit("sends did not overlap")
+    time.sleep(0.01)
+with open({str(log)!r}, "a") as f:
+    f.write(target + " " + media + "\\n")
+""")
+    exe.chmod(exe.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return log
+
+
+def test_recipients_from_list_file_and_env(tmp_path, home, monkeypatch):
+    from src.deliver import recipients
+    subscribers = tmp_path / "subscribers.txt"
+    subscribers.write_text("+971500000001\n# paused: +971500000002\n\n+971500000003  # Sara\n")
+    monkeypatch.setenv("TELEGRAM_TARGET", "@one,@two")
+    cfg = {"channels": [
+        {"type": "whatsapp", "recipients": ["+971500000009"], "recipients_file": str(subscribers)},
+        {"type": "telegram", "enabled": True},
+        {"type": "signal", "enabled": False, "recipients": ["x"]},
+    ]}
+    assert recipients(cfg) == ["whatsapp:+971500000009", "whatsapp:+971500000001", "whatsapp:+971500000003",
+                               "telegram:@one", "telegram:@two"]
+    assert recipients() == ["whatsapp:+971500000000"]
+
+
+def test_fan_out_runs_sends_concurrently(tmp_path, home, monkeypatch):
+    from src.deliver import deliver_voice_note
+    log = _fake_openclaw(tmp_path / "bin", monkeypatch, overlap=40)  # no send finishes until all 40 started
+    audio = tmp_path / "briefing.mp3"
+    audio.write_bytes(b"mp3")
+    cfg = {"max_workers": 40, "retries": 0,
+           "channels": [{"type": "whatsapp", "recipients": [f"+9715{i:08d}" for i in range(40)]}]}
+
+    report = deliver_voice_note(str(audio), cfg)
+
+    assert len(report["sent"]) == 40 and not report["failed"]
+    staged = {line.split()[1] for line in log.read_text().splitlines()}
+    assert staged == {str(home / ".openclaw" / "media" / "briefing.mp3")}  # staged once, shared
+
+
+def test_failed_recipient_is_retried_without_holding_up_the_rest(tmp_path, home, monkeypatch):
+    from src.deliver import DeliveryError, deliver_text
+    log = _fake_openclaw(tmp_path / "bin", monkeypatch, fail_first_for=["+2", "+4"])
+    cfg = {"retry_backoff_seconds": 0, "channels": [{"type": "whatsapp", "recipients": ["+1", "+2", "+3"]}]}
+
+    report = deliver_text("Summary", cfg)
+    assert sorted(report["sent"]) == ["whatsapp:+1", "whatsapp:+2", "whatsapp:+3"]
+    assert report["retried"] == 1
+
+    cfg["channels"][0]["recipients"].append("+4")
+    with pytest.raises(DeliveryError) as exc:
+        deliver_text("Summary", {**cfg, "retries": 0}, done=report["sent"][:2])
+    assert exc.value.report["sent"] == [r for r in ["whatsapp:+1", "whatsapp:+2", "whatsapp:+3"]
+                                        if r not in report["sent"][:2]]
+    [failed] = exc.value.report["failed"]
+    assert failed["recipient"] == "whatsapp:+4" and "gateway busy" in failed["error"]
+    assert sorted(log.read_text().split()) == ["+1", "+2", "+3", report["sent"][2].split(":")[1]]
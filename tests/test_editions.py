@@ -0,0 +1,35 @@
+import pytest
+
+from src import editions
+
+
+def test_no_editions_configured_means_the_default_one():
+    [edition] = editions.load_editions({})
+    assert edition["id"] == "en"
+    assert edition["listener"] == "Momal"
+
+
+def test_edition_ids_must_be_unique():
+    with pytest.raises(ValueError):
+        editions.load_editions({"editions": [{"id": "ur"}, {"id": "ur"}]})
+
+
+def test_primary_edition_keeps_plain_names():
+    en, ur = editions.load_editions({"editions": [{}, {"id": "ur", "language": "Urdu"}]})
+    assert editions.suffix(en, True) == ""
+    assert editions.suffix(ur, False) == ":ur"
+    assert editions.audio_path("2026-02-22", en, True) == "audio/briefing-2026-02-22.mp3"
+    assert editions.audio_path("2026-02-22", ur, False) == "audio/briefing-2026-02-22-ur.mp3"
+
+
+def test_edition_overrides_voice_and_channels():
+    config = {"tts": {"voice_id": "jessica", "max_workers": 3},
+              "delivery": {"retries": 2, "channels": [{"type": "whatsapp"}]}}
+    ur = {**editions.EDITION_DEFAULTS, "id": "ur", "voice_id": "urdu-voice",
+          "channels": [{"type": "telegram", "recipients": ["@ur"]}]}
+    assert editions.tts_config(config, ur) == {"voice_id": "urdu-voice", "max_workers": 3}
+    assert editions.delivery_config(config, ur)["channels"] == [{"type": "telegram", "recipients": ["@ur"]}]
+    assert editions.delivery_config(config, ur)["retries"] == 2
+    en = {**editions.EDITION_DEFAULTS}
+    assert editions.tts_config(config, en) == config["tts"]
+    assert editions.delivery_config(config, en) is config["delivery"]
@@ -0,0 +1,22 @@
+import json
+
+from src.entry import Entry
+
+
+def test_round_trip_keeps_every_key():
+    d = {"title": "A", "link": "https://a", "summary": "s", "published": "unknown", "source": "HN",
+         "priority": "high", "links": ["https://a", "https://b"], "seen_on": "2026-02-21"}
+    assert Entry.from_dict(d).to_dict() == d
+    assert Entry.from_dict({**d, "score": 4.2}).to_dict() == {**d, "score": 4.2}
+
+
+def test_source_and_priority_are_interned():
+    rows = json.loads(json.dumps([{"title": str(i), "source": "Hacker News", "priority": "high"}
+                                  for i in range(2)]))
+    assert rows[0]["source"] is not rows[1]["source"]
+    a, b = (Entry.from_dict(r) for r in rows)
+    assert a.source is b.source and a.priority is b.priority
+
+
+def test_entries_have_no_per_instance_dict():
+    assert not hasattr(Entry.from_dict({"title": "A"}), "__dict__")
@@ -0,0 +1,90 @@
+"""Tests for conditional-GET feed caching against a local HTTP stand-in."""
+
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.aggregator import fetch_feed
+from src.feedcache import FeedCache
+
+ETAG = '"v1"'
+
+
+def _rss() -> bytes:
+    pub = format_datetime(datetime.now(timezone.utc))
+    return f"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Test</title>
+<item><title>Fresh story</title><link>https://example.com/fresh</link>
+<description>Something happened.</description><pubDate>{pub}</pubDate></item>
+</channel></rss>""".encode()
+
+
+@pytest.fixture
+def feed_server():
+    body = _rss()
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(dict(self.headers))
+            if self.headers.get("If-None-Match") == ETAG:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/feed", requests, len(body)
+    server.shutdown()
+
+
+def test_second_fetch_is_conditional_and_reuses_entries(tmp_path, feed_server):
+    url, requests, size = feed_server
+    cache = FeedCache(str(tmp_path / "feeds"))
+    feed_config = {"name": "Local", "url": url, "priority": "high"}
+
+    first = fetch_feed(feed_config, cache=cache)
+    second = fetch_feed(feed_config, cache=cache)
+
+    assert [e["title"] for e in first] == ["Fresh story"]
+    assert second == first
+    assert "If-None-Match" not in requests[0]
+    assert requests[1]["If-None-Match"] == ETAG
+    assert cache.stats() == {"hits": 1, "misses": 1, "bytes_saved": size}
+
+
+def test_cache_persists_across_instances(tmp_path, feed_server):
+    url, requests, _ = feed_server
+    feed_config = {"name": "Local", "url": url}
+
+    fetch_feed(feed_config, cache=FeedCache(str(tmp_path / "feeds")))
+    reopened = FeedCache(str(tmp_path / "feeds"))
+    entries = fetch_feed(feed_config, cache=reopened)
+
+    assert len(entries) == 1
+    assert reopened.hits == 1
+
+
+def test_cached_entries_are_refiltered_by_hours_back(tmp_path, feed_server):
+    url, _, _ = feed_server
+    cache = FeedCache(str(tmp_path / "feeds"))
+    feed_config = {"name": "Local", "url": url}
+    fetch_feed(feed_config, cache=cache)
+
+    record = cache.get(url)
+    record["entries"][0]["published"] = "2020-01-01T00:00:00+00:00"
+    cache.put(url, {"ETag": ETAG}, record["entries"], record["size"])
+
+    assert fetch_feed(feed_config, hours_back=48, cache=cache) == []
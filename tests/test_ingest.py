@@ -0,0 +1,147 @@
+"""Tests for incremental ingestion against a local feed server."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from src.ingest import TRENDING, IngestStore, poll_once, read_window
+
+
+def _rss(items) -> bytes:
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{title.replace(' ', '-')}</link>"
+        f"<description>About {title}.</description><pubDate>{format_datetime(pub)}</pubDate></item>"
+        for title, pub in items)
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>{body}</channel></rss>'.encode()
+
+
+@pytest.fixture
+def feed():
+    """A feed whose items can be changed between polls; ETag follows the content."""
+    now = datetime.now(timezone.utc)
+    state = {"items": [("Story one", now - timedelta(hours=2)), ("Old story", now - timedelta(days=5))],
+             "requests": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = _rss(state["items"])
+            etag = f'"{len(state["items"])}"'
+            state["requests"].append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/feed"
+    yield state
+    server.shutdown()
+
+
+def _sources(feed, tmp_path, **ingest):
+    return {"rss_feeds": [{"name": "Local", "url": feed["url"], "priority": "high"}],
+            "ingest": {"enabled": True, "path": str(tmp_path / "ingest.sqlite"), **ingest}}
+
+
+@pytest.fixture(autouse=True)
+def _no_trending():
+    with patch("src.ingest.fetch_github_trending", return_value=[]):
+        yield
+
+
+def test_only_new_entries_are_appended(tmp_path, feed):
+    sources = _sources(feed, tmp_path)
+    store = IngestStore(sources["ingest"]["path"])
+    now = time.time()
+
+    assert poll_once(sources, store, now)[feed["url"]] == 2
+    feed["items"].insert(0, ("Story two", datetime.now(timezone.utc)))
+    assert poll_once(sources, store, now + 3600)[feed["url"]] == 1
+    assert poll_once(sources, store, now + 7200 * 10)[feed["url"]] == 0  # 304
+
+    assert feed["requests"][-1] == '"3"'
+    store.close()
+
+
+def test_poll_interval_backs_off_for_quiet_feeds(tmp_path, feed):
+    sources = _sources(feed, tmp_path, min_poll_minutes=10, max_poll_minutes=30, backoff=2)
+    store = IngestStore(sources["ingest"]["path"])
+    now = time.time()
+
+    poll_once(sources, store, now)
+    assert store.feed_state(feed["url"])["interval"] == 600
+    assert poll_once(sources, store, now + 60) == {}  # not due yet
+    poll_once(sources, store, now + 600)
+    assert store.feed_state(feed["url"])["interval"] == 1200
+    poll_once(sources, store, now + 1800)
+    assert store.feed_state(feed["url"])["interval"] == 1800  # capped
+
+    feed["items"].insert(0, ("Story two", datetime.now(timezone.utc)))
+    poll_once(sources, store, now + 3600)
+    assert store.feed_state(feed["url"])["interval"] == 900  # busy again
+    store.close()
+
+
+def test_read_window_uses_per_feed_hours_back(tmp_path, feed):
+    sources = _sources(feed, tmp_path)
+    store = IngestStore(sources["ingest"]["path"])
+    poll_once(sources, store)
+    store.close()
+
+    assert [e["title"] for e in read_window(sources, hours_back=48)] == ["Story one"]
+    sources["rss_feeds"][0]["hours_back"] = 168
+    assert [e["title"] for e in read_window(sources, hours_back=48)] == ["Story one", "Old story"]
+
+
+def test_read_window_is_none_when_store_is_stale(tmp_path, feed):
+    sources = _sources(feed, tmp_path, max_staleness_minutes=60)
+    assert read_window(sources) is None  # never polled
+    store = IngestStore(sources["ingest"]["path"])
+    poll_once(sources, store, time.time() - 7200)
+    store.close()
+    assert read_window(sources) is None
+
+
+def test_trending_snapshot_is_replaced(tmp_path, feed):
+    sources = _sources(feed, tmp_path)
+    store = IngestStore(sources["ingest"]["path"])
+    repo = {"title": "repo", "summary": "", "published": datetime.now(timezone.utc).isoformat(),
+            "source": "GitHub Trending", "priority": "high"}
+    with patch("src.ingest.fetch_github_trending", return_value=[{**repo, "link": "https://github.com/a/b"}]):
+        poll_once(sources, store)
+    with patch("src.ingest.fetch_github_trending", return_value=[{**repo, "link": "https://github.com/c/d"}]):
+        poll_once(sources, store, time.time() + 7200)
+    assert [e["link"] for e in store.window(TRENDING, datetime(2000, 1, 1, tzinfo=timezone.utc))] == \
+        ["https://github.com/c/d"]
+    store.close()
+
+
+def test_aggregate_reads_the_store_instead_of_fetching(tmp_path, feed):
+    import yaml
+    from src.aggregator import aggregate
+
+    sources = {**_sources(feed, tmp_path), "seen": {"path": None}, "keywords_skip": []}
+    store = IngestStore(sources["ingest"]["path"])
+    poll_once(sources, store)
+    store.close()
+    path = tmp_path / "sources.yaml"
+    path.write_text(yaml.safe_dump(sources))
+
+    with patch("src.aggregator.fetch_all") as fetch_all:
+        entries = aggregate(str(path))
+    fetch_all.assert_not_called()
+    assert [e["title"] for e in entries] == ["Story one"]
@@ -0,0 +1,233 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRIES = [{"title": "Story A", "link": "https://a.com", "source": "SourceA",
+            "summary": "...", "published": "2026-02-22", "priority": "high"}]
+
+
+def _fake_audio(script, path, *args, **kwargs):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_bytes(b"ID3" + script.encode())
+    return path
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("style:\n  max_stories: 8\n")
+    return tmp_path
+
+
+def test_importing_main_loads_no_sdks():
+    code = ("import sys, src.main; "
+            "print(','.join(m for m in ('anthropic', 'elevenlabs', 'feedparser', 'yaml', 'dotenv') "
+            "if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+@pytest.mark.parametrize("argv", [
+    ["--no-cache", "--fresh", "--metrics-file", "m.jsonl", "run"],
+    ["run", "--no-cache", "--fresh", "--metrics-file", "m.jsonl"],
+    ["--no-cache", "run", "--fresh", "--metrics-file", "m.jsonl"],
+])
+def test_run_options_work_on_either_side_of_the_command(argv):
+    from src.main import main
+
+    with patch("src.main.run") as run:
+        main(argv)
+    run.assert_called_once_with(use_cache=False, metrics_file="m.jsonl", fresh=True)
+
+
+@pytest.mark.parametrize("argv", [["--no-cache", "write"], ["write", "--no-cache"]])
+def test_no_cache_before_a_stage_command_is_kept(argv):
+    from src.main import main
+
+    with patch("src.main.cmd_write") as cmd_write:
+        main(argv)
+    assert cmd_write.call_args.kwargs == {"use_cache": False}
+
+
+def test_stages_chain_through_saved_outputs(workdir):
+    from src.main import main
+
+    with patch("src.main.aggregate", return_value=ENTRIES):
+        main(["aggregate", "--date", "2026-02-22"])
+    saved = workdir / "runs" / "2026-02-22"
+    assert json.loads((saved / "entries.json").read_text()) == ENTRIES
+
+    with patch("src.main.write_script", return_value="Script.") as script, \
+         patch("src.main.write_whatsapp_summary", return_value="Summary.") as summary:
+        main(["write", "--date", "2026-02-22", "--no-cache"])
+    assert script.call_args.args[0] == ENTRIES
+    assert summary.call_args.kwargs["use_cache"] is False
+    assert (saved / "script.txt").read_text() == "Script."
+    assert (saved / "summary.txt").read_text() == "Summary."
+
+    with patch("src.main.generate_audio", side_effect=_fake_audio) as audio:
+        main(["tts", "--date", "2026-02-22"])
+    assert audio.call_args.args[:2] == ("Script.", "audio/briefing-2026-02-22.mp3")
+
+    with patch("src.main.deliver_text") as text, patch("src.main.deliver_voice_note") as voice:
+        main(["deliver", "--date", "2026-02-22", "--only", "text"])
+    assert text.call_args.args[0] == "Summary."
+    voice.assert_not_called()
+
+
+def test_stage_without_earlier_output_says_what_to_run():
+    from src.main import main
+
+    with patch("src.main.write_script") as script, pytest.raises(SystemExit) as exc:
+        main(["write", "--date", "2026-02-22"])
+    assert "python -m src aggregate" in str(exc.value)
+    script.assert_not_called()
+
+
+def test_stale_script_is_not_used_after_reaggregating(workdir):
+    from src.main import main
+
+    with patch("src.main.aggregate", return_value=ENTRIES):
+        main(["aggregate", "--date", "2026-02-22"])
+    with patch("src.main.write_script", return_value="Script."), \
+         patch("src.main.write_whatsapp_summary", return_value="Summary."):
+        main(["write", "--date", "2026-02-22"])
+    with patch("src.main.aggregate", return_value=ENTRIES + [{**ENTRIES[0], "title": "Story B"}]):
+        main(["aggregate", "--date", "2026-02-22"])
+
+    with patch("src.main.generate_audio") as audio, pytest.raises(SystemExit) as exc:
+        main(["tts", "--date", "2026-02-22"])
+    assert "python -m src write" in str(exc.value)
+    audio.assert_not_called()
+
+
+def test_run_saves_stage_outputs(workdir):
+    from src.main import run
+
+    with patch("src.main.aggregate", return_value=ENTRIES), \
+         patch("src.main.write_script", return_value="Script."), \
+         patch("src.main.write_whatsapp_summary", return_value="Summary."), \
+         patch("src.main.generate_audio"), \
+         patch("src.main.deliver_text"), \
+         patch("src.main.deliver_voice_note"):
+        run()
+    [day] = (workdir / "runs").iterdir()
+    assert (day / "script.txt").read_text() == "Script."
+    assert (day / "summary.txt").read_text() == "Summary."
+    assert json.loads((day / "entries.json").read_text())[0]["title"] == "Story A"
+
+
+def test_run_resumes_after_tts_failure_without_new_llm_calls(workdir):
+    from src.main import run
+
+    def patched(audio):
+        return (patch("src.main.aggregate", return_value=ENTRIES),
+                patch("src.main.write_script", return_value="Script."),
+                patch("src.main.write_whatsapp_summary", return_value="Summary."),
+                patch("src.main.generate_audio", side_effect=audio),
+                patch("src.main.deliver_text"),
+                patch("src.main.deliver_voice_note"))
+
+    p = patched(RuntimeError("ElevenLabs down"))
+    with p[0], p[1], p[2], p[3], p[4] as text, p[5], pytest.raises(SystemExit):
+        run()
+    assert text.call_args.args[0] == "Summary."
+
+    p = patched(_fake_audio)
+    with p[0] as agg, p[1] as script, p[2] as summary, p[3] as audio, p[4] as text, p[5] as voice:
+        run()
+    agg.assert_not_called()
+    script.assert_not_called()
+    summary.assert_not_called()
+    text.assert_not_called()  # already delivered before the failure
+    audio.assert_called_once()
+    voice.assert_called_once()
+
+    p = patched(_fake_audio)
+    with p[0] as agg, p[3] as audio, p[5] as voice:
+        run()  # everything done: nothing runs again
+    agg.assert_not_called()
+    audio.assert_not_called()
+    voice.assert_not_called()
+
+
+def test_deliver_again_only_retries_recipients_that_failed(workdir):
+    from src.deliver import DeliveryError
+    from src.main import main
+    from src.checkpoint import RunDir
+
+    RunDir("2026-02-22").save("summary", "Summary.")
+    failure = DeliveryError({"sent": ["whatsapp:+1"], "failed": [{"recipient": "whatsapp:+2", "error": "busy"}]})
+    with patch("src.main.deliver_text", side_effect=failure), pytest.raises(DeliveryError):
+        main(["deliver", "--date", "2026-02-22", "--only", "text"])
+
+    with patch("src.main.deliver_text", return_value={"sent": ["whatsapp:+2"], "failed": []}) as text:
+        main(["deliver", "--date", "2026-02-22", "--only", "text"])
+    assert text.call_args.kwargs["done"] == ["whatsapp:+1"]
+    receipt = RunDir("2026-02-22").load_json("delivery")
+    assert receipt["sent"]["text"] == ["whatsapp:+1", "whatsapp:+2"] and "text" in receipt
+
+
+def test_editions_share_one_aggregation_and_run_concurrently(workdir):
+    import threading
+    from src.main import run
+    (workdir / "config" / "config.yaml").write_text(
+        "style:\n  max_stories: 8\neditions:\n  - id: en\n  - id: ur\n    language: Urdu\n")
+    writing = set()
+    overlapped = threading.Event()
+
+    def script(entries, use_cache=True, moment=None, edition=None, ctx=None):
+        writing.add(edition["id"])
+        if len(writing) == 2:
+            overlapped.set()
+        overlapped.wait(2)
+        return f"Script {edition['id']}."
+
+    with patch("src.main.aggregate", return_value=ENTRIES) as agg, \
+         patch("src.main.write_script", side_effect=script), \
+         patch("src.main.write_whatsapp_summary", side_effect=lambda e, edition=None, **kw: f"Summary {edition['id']}."), \
+         patch("src.main.generate_audio", side_effect=_fake_audio) as audio, \
+         patch("src.main.deliver_text"), \
+         patch("src.main.deliver_voice_note") as voice:
+        run()
+    agg.assert_called_once()
+    assert overlapped.is_set()
+    day = next((workdir / "runs").iterdir())
+    assert (day / "script.txt").read_text() == "Script en."
+    assert (day / "ur" / "script.txt").read_text() == "Script ur."
+    assert (day / "ur" / "receipt.json").exists()
+    assert sorted(c.args[1] for c in audio.call_args_list) == [
+        f"audio/briefing-{day.name}-ur.mp3", f"audio/briefing-{day.name}.mp3"]
+    assert voice.call_count == 2
+
+
+def test_each_edition_is_dated_by_its_own_timezone(workdir):
+    """At 06:00 UTC it is already Monday in Tokyo but still Sunday evening in Los Angeles."""
+    from src.main import main
+    (workdir / "config" / "config.yaml").write_text(
+        "delivery:\n  schedule:\n    timezone: UTC\n    time: '06:00'\n"
+        "editions:\n  - id: jp\n    timezone: Asia/Tokyo\n  - id: us\n    timezone: America/Los_Angeles\n")
+    with patch("src.main.aggregate", return_value=ENTRIES):
+        main(["aggregate", "--date", "2026-02-23"])
+
+    prompts = {}
+
+    def complete(client, llm_config, prompt, label, use_cache):
+        prompts[label] = prompt
+        return "Text."
+
+    with patch("src.scriptwriter._complete", side_effect=complete), \
+         patch("src.context.RunContext.anthropic"):
+        main(["write", "--date", "2026-02-23"])
+
+    assert "TODAY'S DATE: Monday, February 23" in prompts["audio teaser, jp"]
+    assert "TODAY'S DATE: Monday, February 23" in prompts["WhatsApp summary, jp"]
+    assert "TODAY'S DATE: Sunday, February 22" in prompts["audio teaser, us"]
+    assert "Briefing — Sunday, February 22" in prompts["WhatsApp summary, us"]
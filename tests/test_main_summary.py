@@ -1,9 +1,12 @@
 import json
+import threading
 from unittest.mock import patch
 
+import pytest
 
-def test_archive_json_saved(tmp_path, monkeypatch):
-    """archive JSON must include top_stories with title/link/source fields."""
+
+def test_archive_saved(tmp_path, monkeypatch):
+    """archive must include top_stories with title/link/source fields."""
     monkeypatch.chdir(tmp_path)
     (tmp_path / "scripts").mkdir()
     (tmp_path / "audio").mkdir()
@@ -21,14 +24,170 @@ def test_archive_json_saved(tmp_path, monkeypatch):
          patch("src.main.write_script", return_value="Audio teaser script."), \
          patch("src.main.write_whatsapp_summary", return_value="WhatsApp summary text."), \
          patch("src.main.generate_audio", return_value=str(tmp_path / "audio/briefing.mp3")), \
-         patch("src.main.deliver_whatsapp"):
+         patch("src.main.deliver_text"), \
+         patch("src.main.deliver_voice_note"):
         from src.main import run
         run()
 
-    archive_files = list(tmp_path.glob("archive/*.json"))
-    assert len(archive_files) == 1
-    data = json.loads(archive_files[0].read_text())
+    from src.archive import ArchiveStore
+    with ArchiveStore(str(tmp_path / "archive" / "archive.sqlite")) as store:
+        [day] = store.runs()
+        data = store.get_run(day["date"])
+    assert data["script"] == "Audio teaser script."
+    assert data["summary"] == "WhatsApp summary text."
+    assert data["entries"][0]["title"] == "Story A"
     assert "top_stories" in data
     assert data["top_stories"][0]["title"] == "Story A"
     assert data["top_stories"][0]["link"] == "https://a.com"
     assert data["top_stories"][0]["source"] == "SourceA"
+
+
+def test_tts_starts_before_summary_finishes(tmp_path, monkeypatch):
+    """Script and summary are written concurrently; TTS doesn't wait on the summary."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("style:\n  max_stories: 8\n")
+
+    fake_entries = [
+        {"title": "Story A", "link": "https://a.com", "source": "SourceA",
+         "summary": "...", "published": "2026-02-22", "priority": "high"},
+    ]
+    events, tts_started = [], threading.Event()
+
+    def slow_summary(entries, **kwargs):
+        tts_started.wait(timeout=5)  # the summary can only finish once TTS is under way
+        events.append("summary done")
+        return "WhatsApp summary text."
+
+    def fake_audio(script, path, *args, **kwargs):
+        events.append("tts started")
+        tts_started.set()
+        return path
+
+    with patch("src.main.aggregate", return_value=fake_entries), \
+         patch("src.main.write_script", return_value="Audio teaser script."), \
+         patch("src.main.write_whatsapp_summary", side_effect=slow_summary), \
+         patch("src.main.generate_audio", side_effect=fake_audio), \
+         patch("src.main.deliver_text") as deliver_text, \
+         patch("src.main.deliver_voice_note") as deliver_voice_note:
+        from src.main import run
+        run()
+
+    assert events == ["tts started", "summary done"]
+    deliver_text.assert_called_once()
+    assert deliver_text.call_args.args[0] == "WhatsApp summary text."
+    deliver_voice_note.assert_called_once()
+
+
+def test_archive_and_text_delivery_overlap_audio_rendering(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("style:\n  max_stories: 8\n")
+
+    fake_entries = [
+        {"title": "Story A", "link": "https://a.com", "source": "SourceA",
+         "summary": "...", "published": "2026-02-22", "priority": "high"},
+    ]
+    events, text_sent = [], threading.Event()
+
+    def slow_audio(script, path, *args, **kwargs):
+        text_sent.wait(timeout=5)  # rendering can only finish once the text has gone out
+        events.append("tts done")
+        return path
+
+    def fake_text(text, *args, **kwargs):
+        events.append("text sent")
+        text_sent.set()
+
+    with patch("src.main.aggregate", return_value=fake_entries), \
+         patch("src.main.write_script", return_value="Audio teaser script."), \
+         patch("src.main.write_whatsapp_summary", return_value="WhatsApp summary text."), \
+         patch("src.main.generate_audio", side_effect=slow_audio), \
+         patch("src.main.deliver_text", side_effect=fake_text), \
+         patch("src.main.deliver_voice_note", side_effect=lambda path, *args, **kwargs: events.append("voice sent")):
+        from src.main import run
+        run()
+
+    assert events == ["text sent", "tts done", "voice sent"]
+    assert (tmp_path / "archive" / "archive.sqlite").exists()
+
+
+def test_archive_includes_run_metrics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("style:\n  max_stories: 8\n")
+
+    fake_entries = [
+        {"title": "Story A", "link": "https://a.com", "source": "SourceA",
+         "summary": "...", "published": "2026-02-22", "priority": "high"},
+    ]
+
+    with patch("src.main.aggregate", return_value=fake_entries), \
+         patch("src.main.write_script", return_value="Audio teaser script."), \
+         patch("src.main.write_whatsapp_summary", return_value="WhatsApp summary text."), \
+         patch("src.main.generate_audio", side_effect=lambda script, path, *a, **kw: path), \
+         patch("src.main.deliver_text"), \
+         patch("src.main.deliver_voice_note"):
+        from src.main import run
+        run(metrics_file="metrics/runs.jsonl")
+
+    from src.archive import ArchiveStore
+    with ArchiveStore("archive/archive.sqlite") as store:
+        data = store.get_run(store.runs()[0]["date"])
+    assert "archive" in [s["name"] for s in data["metrics"]["spans"]]
+    assert data["metrics"]["wall_time"] >= 0
+
+    [line] = (tmp_path / "metrics" / "runs.jsonl").read_text().splitlines()
+    assert json.loads(line)["date"] == data["date"]
+
+
+def test_metrics_saved_when_the_run_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("style:\n  max_stories: 8\n")
+
+    fake_entries = [
+        {"title": "Story A", "link": "https://a.com", "source": "SourceA",
+         "summary": "...", "published": "2026-02-22", "priority": "high"},
+    ]
+
+    with patch("src.main.aggregate", return_value=fake_entries), \
+         patch("src.main.write_script", return_value="Audio teaser script."), \
+         patch("src.main.write_whatsapp_summary", return_value="WhatsApp summary text."), \
+         patch("src.main.generate_audio", side_effect=RuntimeError("quota exceeded")), \
+         patch("src.main.deliver_text"), \
+         patch("src.main.deliver_voice_note"):
+        from src.main import run
+        with pytest.raises(SystemExit):
+            run(metrics_file="metrics/runs.jsonl")
+
+    from src.archive import ArchiveStore
+    with ArchiveStore("archive/archive.sqlite") as store:
+        data = store.get_run(store.runs()[0]["date"])
+    assert "archive" in [s["name"] for s in data["metrics"]["spans"]]
+    assert (tmp_path / "metrics" / "runs.jsonl").exists()
+
+
+def test_legacy_files_still_written_when_enabled(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "config.yaml").write_text("archive:\n  legacy_files: true\n")
+
+    fake_entries = [
+        {"title": "Story A", "link": "https://a.com", "source": "SourceA",
+         "summary": "...", "published": "2026-02-22", "priority": "high"},
+    ]
+
+    with patch("src.main.aggregate", return_value=fake_entries), \
+         patch("src.main.write_script", return_value="Audio teaser script."), \
+         patch("src.main.write_whatsapp_summary", return_value="WhatsApp summary text."), \
+         patch("src.main.generate_audio", side_effect=lambda script, path, *a, **kw: path), \
+         patch("src.main.deliver_text"), \
+         patch("src.main.deliver_voice_note"):
+        from src.main import run
+        run()
+
+    data = json.loads(next(tmp_path.glob("archive/*.json")).read_text())
+    assert data["top_stories"][0]["title"] == "Story A"
+    assert "metrics" in data
+    assert next(tmp_path.glob("scripts/*.txt")).read_text() == "Audio teaser script."
@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src import metrics
+
+
+def test_span_records_duration_attrs_and_thread():
+    recorder = metrics.reset()
+    with metrics.span("fetch_feed", source="HN") as span:
+        time.sleep(0.05)
+        span.set(bytes=1234)
+        span.add("entries", 3)
+
+    [record] = recorder.to_dict()["spans"]
+    assert record["name"] == "fetch_feed"
+    assert record["duration"] >= 0.05
+    assert record["source"] == "HN"
+    assert record["bytes"] == 1234
+    assert record["entries"] == 3
+    assert record["thread"] == threading.current_thread().name
+    assert "error" not in record
+
+
+def test_span_records_error_and_reraises():
+    recorder = metrics.reset()
+    with pytest.raises(ValueError):
+        with metrics.span("llm"):
+            raise ValueError("boom")
+
+    [record] = recorder.to_dict()["spans"]
+    assert record["error"] == "ValueError: boom"
+
+
+def test_spans_from_worker_threads_are_collected_in_start_order():
+    recorder = metrics.reset()
+    started = [threading.Event() for _ in range(4)]
+
+    def work(i):
+        if i:
+            started[i - 1].wait(timeout=5)  # start strictly after the previous chunk
+        with metrics.span("tts_chunk", index=i):
+            started[i].set()
+
+    with metrics.Executor(max_workers=4) as pool:
+        list(pool.map(work, range(4)))
+
+    assert [s.attrs["index"] for s in recorder.spans] == [0, 1, 2, 3]
+
+
+def test_spans_from_unrelated_threads_stay_out_of_the_run():
+    """E.g. the daemon's ingest poller, running alongside the morning's briefing."""
+    recorder = metrics.reset()
+
+    def poller():
+        metrics.reset()
+        with metrics.span("ingest_poll"):
+            pass
+
+    thread = threading.Thread(target=poller)
+    thread.start()
+    thread.join()
+    with metrics.span("aggregate"):
+        pass
+
+    assert [s.name for s in recorder.spans] == ["aggregate"]
+
+
+def test_summary_groups_by_name():
+    recorder = metrics.reset()
+    recorder.record("tts_chunk", 0.5)
+    recorder.record("tts_chunk", 1.5)
+    recorder.record("fetch_deadline_missed", 45, source="Slow")
+    recorder.record("tts_chunk", 1.0, error="HTTPError: 500")
+
+    rows = {row["name"]: row for row in recorder.summary()}
+    assert rows["tts_chunk"]["count"] == 3
+    assert rows["tts_chunk"]["total"] == pytest.approx(3.0)
+    assert rows["tts_chunk"]["max"] == pytest.approx(1.5)
+    assert rows["tts_chunk"]["errors"] == 1
+    assert rows["fetch_deadline_missed"]["count"] == 1
+
+
+def test_append_jsonl_adds_one_line_per_run(tmp_path):
+    path = tmp_path / "metrics" / "runs.jsonl"
+    for day in ("2026-02-22", "2026-02-23"):
+        recorder = metrics.reset()
+        with metrics.span("aggregate"):
+            pass
+        metrics.append_jsonl(str(path), {"date": day, **recorder.to_dict()})
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["date"] for line in lines] == ["2026-02-22", "2026-02-23"]
+    assert lines[0]["spans"][0]["name"] == "aggregate"
@@ -0,0 +1,52 @@
+"""Tests for src/packing.py prompt packing."""
+
+from src.packing import clean_summary, estimate_tokens, pack_entries
+
+HN_SUMMARY = ('<p>Article URL: <a href="https://example.com/post">https://example.com/post</a></p>\n'
+              '<p>Comments URL: <a href="https://news.ycombinator.com/item?id=1">'
+              'https://news.ycombinator.com/item?id=1</a></p>\n<p>Points: 312</p>\n<p># Comments: 87</p>')
+
+
+def _entry(i, summary="A short description of the story.", source="Test"):
+    return {"title": f"Story {i}", "link": f"https://example.com/{i}", "source": source,
+            "summary": summary, "published": "unknown", "priority": "high"}
+
+
+def test_clean_summary_strips_html_and_hn_boilerplate():
+    assert clean_summary(HN_SUMMARY) == ""
+    assert clean_summary("<p>Tools &amp; models</p><p>for <b>agents</b></p>") == "Tools & models for agents"
+    # The fetch step clips summaries at 500 chars, sometimes mid-tag
+    assert clean_summary('Great post <a href="https://exa') == "Great post"
+
+
+def test_hn_entry_becomes_compact_buzz_line():
+    text = pack_entries([_entry(1, HN_SUMMARY)])
+    assert "Buzz: 312 points, 87 comments" in text
+    assert "Article URL" not in text
+    assert "Summary:" not in text
+
+
+def test_pack_entries_respects_token_budget_in_rank_order():
+    entries = [_entry(i, "word " * 40) for i in range(50)]
+    text = pack_entries(entries, {"token_budget": 500})
+
+    assert estimate_tokens(text) <= 500
+    assert "1. [Test] Story 0\n" in text
+    n_packed = text.count("\n---\n")
+    assert 3 <= n_packed < 50
+    assert f"Story {n_packed - 1}\n" in text
+    assert f"Story {n_packed}\n" not in text
+
+
+def test_oversized_story_is_skipped_for_smaller_ones():
+    entries = [_entry(0), _entry(1, "long " * 400), _entry(2)]
+    text = pack_entries(entries, {"token_budget": 200, "summary_chars": 5000})
+    assert "Story 0" in text and "Story 2" in text
+    assert "Story 1" not in text
+    assert "2. [Test] Story 2" in text
+
+
+def test_bigger_budget_carries_more_stories_than_old_fixed_slice():
+    entries = [_entry(i, HN_SUMMARY) for i in range(40)]
+    text = pack_entries(entries, {"token_budget": 3000})
+    assert text.count("\n---\n") > 16  # old cap was max_stories * 2
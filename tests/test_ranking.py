@@ -0,0 +1,80 @@
+"""Tests for src/ranking.py scoring and keyword matching."""
+
+from datetime import datetime, timedelta, timezone
+
+from src.ranking import KeywordMatcher, rank_entries, top_entries
+
+NOW = datetime(2026, 2, 22, 8, 0, tzinfo=timezone.utc)
+
+
+def _entry(title, hours_old=1, priority="high", summary="", source="Test"):
+    published = (NOW - timedelta(hours=hours_old)).isoformat() if hours_old is not None else "unknown"
+    return {"title": title, "link": f"https://example.com/{title}", "summary": summary,
+            "published": published, "source": source, "priority": priority}
+
+
+def test_keyword_matcher_counts_distinct_boosts_and_detects_skip():
+    matcher = KeywordMatcher(("model", "API", "open source"), ("IPO",))
+    assert matcher.scan("New Model and models via the API, open source") == (False, 3)
+    assert matcher.scan("A rapid demo") == (False, 0)
+    assert matcher.scan("Model maker plans IPO") == (True, 0)
+
+
+def test_skip_keywords_match_as_substrings_even_inside_a_boost_match():
+    matcher = KeywordMatcher(("open source",), ("source available", "sponsor"))
+    assert matcher.scan("Now open source available to all") == (True, 0)
+    assert matcher.scan("A cosponsored launch") == (True, 0)
+    assert matcher.scan("Fully open source") == (False, 1)
+
+
+def test_skip_keywords_are_dropped():
+    sources = {"keywords_skip": ["sponsored"]}
+    ranked = rank_entries([_entry("Sponsored: buy this"), _entry("Real news")], sources, now=NOW)
+    assert [e["title"] for e in ranked] == ["Real news"]
+
+
+def test_recency_is_used_within_same_priority():
+    entries = [_entry("Old", hours_old=40), _entry("Undated", hours_old=None), _entry("Fresh", hours_old=1)]
+    ranked = rank_entries(entries, {}, now=NOW)
+    assert [e["title"] for e in ranked] == ["Fresh", "Old", "Undated"]
+
+
+def test_boost_keywords_and_hn_engagement_raise_score():
+    sources = {"keywords_boost": ["release", "benchmark"]}
+    entries = [
+        _entry("Plain update"),
+        _entry("Quiet HN post", summary="<p>Points: 3</p><p># Comments: 0</p>"),
+        _entry("Busy HN post", summary="<p>Points: 850</p><p># Comments: 400</p>"),
+        _entry("Model release tops benchmark"),
+    ]
+    ranked = rank_entries(entries, sources, now=NOW)
+    assert ranked[0]["title"] == "Busy HN post"
+    assert ranked[1]["title"] == "Model release tops benchmark"
+    assert ranked[-1]["title"] == "Plain update"
+
+
+def test_priority_outweighs_small_recency_differences():
+    entries = [_entry("Medium fresh", hours_old=1, priority="medium"),
+               _entry("High older", hours_old=6, priority="high")]
+    ranked = rank_entries(entries, {}, now=NOW)
+    assert ranked[0]["title"] == "High older"
+    assert all("score" in e for e in ranked)
+
+
+def test_top_entries_streams_the_same_ranking_but_keeps_only_k():
+    sources = {"keywords_boost": ["agent"], "keywords_skip": ["IPO"]}
+    entries = [_entry(f"Story {i}" + (" agent" if i % 4 == 0 else "") + (" IPO" if i % 7 == 0 else ""),
+                      hours_old=i % 30, priority=["high", "medium", "low"][i % 3]) for i in range(200)]
+    entries.append({**_entry("Tied", hours_old=3), "links": ["https://a", "https://b"]})
+    entries.append(_entry("Tied", hours_old=3))
+
+    top, counts = top_entries(iter(entries), sources, k=20, now=NOW)
+
+    assert top == rank_entries(entries, sources, now=NOW)[:20]
+    assert counts == {"seen": 202, "skipped": 29, "dropped": 202 - 29 - 20}
+
+
+def test_top_entries_without_k_keeps_everything():
+    entries = [_entry("A", hours_old=5), _entry("B", hours_old=1)]
+    top, counts = top_entries(entries, {}, now=NOW)
+    assert [e["title"] for e in top] == ["B", "A"] and counts["dropped"] == 0
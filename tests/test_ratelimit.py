@@ -0,0 +1,39 @@
+import threading
+import time
+
+from src.ratelimit import RateLimiter, limiter
+
+
+def test_max_concurrent_calls():
+    limit = RateLimiter(max_concurrent=2)
+    running, peak, lock = [0], [0], threading.Lock()
+    pair_up = threading.Barrier(2, timeout=5)  # each call waits for a second one to hold a slot alongside it
+
+    def call():
+        with limit.slot():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            pair_up.wait()
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+
+
+def test_requests_per_minute_spaces_out_starts():
+    limit = RateLimiter(per_minute=600)  # one start every 0.1s
+    started = time.monotonic()
+    for _ in range(4):
+        with limit.slot():
+            pass
+    assert time.monotonic() - started >= 0.3
+
+
+def test_limiter_is_shared_by_name():
+    assert limiter("test-shared", {"max_concurrent": 1}) is limiter("test-shared")
@@ -1,3 +1,11 @@
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anthropic
+import pytest
+
 from src.scriptwriter import extract_story_list
 
 
@@ -24,3 +32,135 @@ def test_extract_story_list_respects_max():
 def test_extract_story_list_empty_entries():
     result = extract_story_list([], max_stories=8)
     assert result == []
+
+
+def _message_json(text):
+    return {
+        "id": "msg_test", "type": "message", "role": "assistant", "model": "claude-test",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn", "stop_sequence": None,
+        "usage": {"input_tokens": 10, "output_tokens": 5},
+    }
+
+
+@pytest.fixture
+def messages_api():
+    """Local stand-in for the Anthropic Messages API.
+
+    `state["fail"]` responses are 529 Overloaded before it starts answering;
+    with a `state["overlap"]` barrier, no answer is sent until that many requests are in flight.
+    """
+    state = {"fail": 0, "overlap": None, "requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                state["requests"] += 1
+                fail = state["fail"] > 0
+                state["fail"] -= fail
+            if fail:
+                payload, status = {"type": "error", "error": {"type": "overloaded_error", "message": "busy"}}, 529
+            else:
+                if state["overlap"]:
+                    state["overlap"].wait()
+                prompt = body["messages"][0]["content"]
+                text = "SUMMARY" if "WhatsApp message" in prompt else "SCRIPT"
+                payload, status = _message_json(text), 200
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = anthropic.Anthropic(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}",
+                                 max_retries=0)
+    yield client, state
+    server.shutdown()
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("style:\n  max_stories: 8\nllm:\n  model: claude-test\n  max_tokens: 100\n"
+                    "  max_retries: 2\n  retry_backoff: 0.01\n"
+                    f"  cache:\n    dir: {tmp_path / 'llm-cache'}\n")
+    return str(path)
+
+
+ENTRIES = [{"title": "Story A", "link": "https://a.com", "source": "SourceA",
+            "summary": "...", "published": "2026-02-22", "priority": "high"}]
+
+
+def test_write_calls_run_concurrently_on_one_client(messages_api, config_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.scriptwriter import write_script, write_whatsapp_summary
+    client, state = messages_api
+    state["overlap"] = threading.Barrier(2, timeout=5)  # breaks unless both requests are in flight at once
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        script = pool.submit(write_script, ENTRIES, config_path, client)
+        summary = pool.submit(write_whatsapp_summary, ENTRIES, config_path, client)
+        results = script.result(), summary.result()
+
+    assert results == ("SCRIPT", "SUMMARY")
+
+
+def test_write_script_retries_transient_errors(messages_api, config_path):
+    from src.scriptwriter import write_script
+    client, state = messages_api
+    state["fail"] = 2
+
+    assert write_script(ENTRIES, config_path, client) == "SCRIPT"
+    assert state["requests"] == 3
+
+
+def test_write_script_gives_up_after_max_retries(messages_api, config_path):
+    from src.scriptwriter import write_script
+    client, state = messages_api
+    state["fail"] = 5
+
+    with pytest.raises(anthropic.APIStatusError):
+        write_script(ENTRIES, config_path, client)
+    assert state["requests"] == 3
+
+
+def test_identical_prompt_is_served_from_cache(messages_api, config_path):
+    from src.scriptwriter import write_script
+    client, state = messages_api
+
+    first = write_script(ENTRIES, config_path, client)
+    second = write_script(ENTRIES, config_path, client)
+
+    assert first == second == "SCRIPT"
+    assert state["requests"] == 1
+
+
+def test_no_cache_bypasses_cached_response(messages_api, config_path):
+    from src.scriptwriter import write_script
+    client, state = messages_api
+
+    write_script(ENTRIES, config_path, client)
+    write_script(ENTRIES, config_path, client, use_cache=False)
+
+    assert state["requests"] == 2
+
+
+def test_audio_prompt_follows_the_edition():
+    from src.scriptwriter import build_audio_prompt
+    entries = [{"title": "Story A", "link": "https://a.com", "source": "SourceA", "summary": "...",
+                "published": "2026-02-22", "priority": "high"}]
+    morning = datetime(2026, 2, 22, 8, 0, tzinfo=timezone.utc)
+    default = build_audio_prompt(entries, {}, morning)
+    assert "Hey Momal" in default and "LANGUAGE:" not in default
+
+    urdu = build_audio_prompt(entries, {}, morning, {"id": "ur", "language": "Urdu", "listener": "Ayesha"})
+    assert "Hey Ayesha" in urdu and "Momal" not in urdu
+    assert "Write everything in Urdu" in urdu
@@ -0,0 +1,81 @@
+from src.seen import SeenIndex, filter_seen, mark_covered, open_index, story_keys
+
+
+def _entry(title, link, score=5.0, **extra):
+    return {"title": title, "link": link, "summary": "", "published": "unknown",
+            "source": "Test", "priority": "high", "score": score, **extra}
+
+
+def test_story_keys_ignore_tracking_params_and_title_word_order():
+    a = _entry("OpenAI releases GPT-5 today", "https://www.openai.com/gpt5/?utm_source=rss")
+    b = _entry("Today: GPT-5 releases, OpenAI", "http://openai.com/gpt5")
+    assert story_keys(a) == story_keys(b)
+
+
+def test_story_keys_cover_every_merged_link():
+    entry = _entry("Big model launch news", "https://a.com/x", links=["https://a.com/x", "https://b.com/y"])
+    assert {"url:a.com/x", "url:b.com/y"} <= set(story_keys(entry))
+
+
+def test_filter_drops_stories_covered_on_earlier_days(tmp_path):
+    index = SeenIndex(str(tmp_path / "seen.sqlite"))
+    index.add([_entry("Anthropic ships Claude 5 model", "https://anthropic.com/claude5")], "2026-02-20")
+
+    entries = [
+        _entry("Claude 5 model ships (Anthropic)", "https://news.example.com/claude"),  # same title words
+        _entry("Totally new agent framework", "https://example.com/new"),
+        _entry("Different headline entirely here", "https://anthropic.com/claude5?ref=hn"),  # same URL
+    ]
+    kept = filter_seen(entries, index, {"mode": "drop"}, today="2026-02-22")
+    assert [e["link"] for e in kept] == ["https://example.com/new"]
+
+
+def test_filter_keeps_stories_first_covered_today(tmp_path):
+    """A same-day re-run must still see the stories it covered."""
+    index = SeenIndex(str(tmp_path / "seen.sqlite"))
+    story = _entry("Anthropic ships Claude 5 model", "https://anthropic.com/claude5")
+    index.add([story], "2026-02-22")
+    assert filter_seen([story], index, today="2026-02-22") == [story]
+
+
+def test_downrank_mode_pushes_seen_stories_below_fresh_ones(tmp_path):
+    index = SeenIndex(str(tmp_path / "seen.sqlite"))
+    index.add([_entry("Old story about models", "https://old.com/a")], "2026-02-20")
+    entries = [_entry("Old story about models", "https://old.com/a", score=6.0),
+               _entry("Fresh story about agents", "https://new.com/b", score=4.0)]
+
+    kept = filter_seen(entries, index, {"mode": "downrank", "penalty": 3.0}, today="2026-02-22")
+    assert [e["link"] for e in kept] == ["https://new.com/b", "https://old.com/a"]
+    assert kept[1]["seen_on"] == "2026-02-20"
+    assert kept[1]["score"] == 3.0
+
+
+def test_mark_covered_updates_incrementally_and_prunes(tmp_path):
+    cfg = {"path": str(tmp_path / "seen.sqlite"), "keep_days": 10}
+    mark_covered([_entry("First week story here", "https://a.com/1")], cfg, "2026-02-01")
+    mark_covered([_entry("Second week story here", "https://a.com/2")], cfg, "2026-02-15")
+
+    index = SeenIndex(cfg["path"])
+    assert index.covered_before(_entry("x", "https://a.com/2"), "2026-02-16") == "2026-02-15"
+    assert index.covered_before(_entry("x", "https://a.com/1"), "2026-02-16") is None  # pruned
+
+
+def test_new_index_is_seeded_from_archive_top_stories(tmp_path):
+    (tmp_path / "2026-02-21.json").write_text(
+        '{"date": "2026-02-21", "top_stories": [{"title": "Seeded story", "link": "https://s.com/1", "source": "S"}]}')
+    index = open_index({"path": str(tmp_path / "seen.sqlite")})
+    assert index.covered_before(_entry("x", "https://s.com/1"), "2026-02-22") == "2026-02-21"
+
+
+def test_seeding_reads_top_stories_from_summary_files_and_the_sqlite_archive(tmp_path):
+    from src.archive import ArchiveStore
+    (tmp_path / "2026-02-20.json").write_text('{"date": "2026-02-20", "entries_found": 1}')
+    (tmp_path / "2026-02-20-summary.json").write_text(
+        '[{"title": "Split layout story", "link": "https://s.com/1", "source": "S"}]')
+    with ArchiveStore(str(tmp_path / "archive.sqlite")) as store:
+        store.save_run({"date": "2026-02-21", "entries": [],
+                        "top_stories": [{"title": "Stored story", "link": "https://s.com/2", "source": "S"}]})
+
+    index = open_index({"path": str(tmp_path / "seen.sqlite")})
+    assert index.covered_before(_entry("x", "https://s.com/1"), "2026-02-22") == "2026-02-20"
+    assert index.covered_before(_entry("x", "https://s.com/2"), "2026-02-22") == "2026-02-21"
@@ -1,8 +1,23 @@
 """Tests for src/tts.py using ElevenLabs."""
 
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from src import metrics
+
+
+@pytest.fixture(autouse=True)
+def _isolated_audio_cache(tmp_path, monkeypatch):
+    """generate_audio caches chunks under ./cache/tts; keep each test's cache separate.
+
+    The shared client is reset too, so every test sees its own patched ElevenLabs.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("src.context._clients", {})
+
 
 def test_generate_audio_calls_elevenlabs_with_correct_params(tmp_path):
     """generate_audio should call ElevenLabs TTS with correct voice and model."""
@@ -11,7 +26,7 @@ def test_generate_audio_calls_elevenlabs_with_correct_params(tmp_path):
 
     mock_audio_chunks = [b"chunk1", b"chunk2"]
 
-    with patch("src.tts.ElevenLabs") as mock_client_cls, \
+    with patch("elevenlabs.client.ElevenLabs") as mock_client_cls, \
          patch.dict("os.environ", {"ELEVENLABS_API_KEY": "test-key"}):
         mock_client = MagicMock()
         mock_client_cls.return_value = mock_client
@@ -34,7 +49,7 @@ def test_generate_audio_creates_parent_directory(tmp_path):
     """generate_audio should create the parent directory if it does not exist."""
     output_path = str(tmp_path / "nested" / "dir" / "output.mp3")
 
-    with patch("src.tts.ElevenLabs") as mock_client_cls, \
+    with patch("elevenlabs.client.ElevenLabs") as mock_client_cls, \
          patch.dict("os.environ", {"ELEVENLABS_API_KEY": "test-key"}):
         mock_client = MagicMock()
         mock_client_cls.return_value = mock_client
@@ -61,3 +76,154 @@ def test_generate_audio_raises_without_api_key(tmp_path):
             assert False, "Should have raised ValueError"
         except ValueError as e:
             assert "ELEVENLABS_API_KEY" in str(e)
+
+
+FRAME_A = b"\xff\xfb\x90\xc4" + b"A" * 413
+FRAME_B = b"\xff\xfb\x90\xc4" + b"B" * 413
+
+
+class FakeTTS:
+    """Stand-in for client.text_to_speech returning canned MP3 frames."""
+
+    def __init__(self, overlap=None, failures=0):
+        self.overlap = overlap  # a barrier every call waits on, proving they run at once
+        self.failures = failures
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def convert(self, text, voice_id, model_id, output_format):
+        with self._lock:
+            self.calls.append(text)
+            fail = self.failures > 0
+            self.failures -= fail
+        if self.overlap:
+            self.overlap.wait()
+        if fail:
+            raise ConnectionError("boom")
+        frame = FRAME_A if text.startswith("A") else FRAME_B
+        return iter([frame, frame])
+
+
+def _run_fake(tmp_path, script, fake, tts_config=None):
+    output_path = str(tmp_path / "out.mp3")
+    with patch("elevenlabs.client.ElevenLabs") as mock_client_cls, \
+         patch.dict("src.context._clients", clear=True), \
+         patch.dict("os.environ", {"ELEVENLABS_API_KEY": "test-key"}):
+        mock_client_cls.return_value.text_to_speech = fake
+        from src.tts import generate_audio
+        generate_audio(script, output_path, tts_config)
+    return Path(output_path).read_bytes()
+
+
+def test_split_script_at_pauses_and_sentences():
+    from src.tts import split_script
+    script = "[pause] Hello there. How are you?\n\n[pause]\n\nBig news today! More soon. [pause] [pause] Bye. [pause]"
+    assert split_script(script, chunk_chars=20) == [
+        "Hello there.", "How are you?", None, "Big news today!", "More soon.", None, "Bye.",
+    ]
+    assert split_script(script, chunk_chars=800) == [
+        "Hello there. How are you?", None, "Big news today! More soon.", None, "Bye.",
+    ]
+
+
+def test_silence_is_whole_mp3_frames():
+    from src.tts import silence
+    audio = silence(600)
+    assert len(audio) == 23 * 417  # 23 frames of 26.1 ms at 44.1 kHz / 128 kbps
+    assert audio[:4] == b"\xff\xfb\x90\xc4"
+    assert silence(600, "mp3_22050_32") == b""
+
+
+def test_chunks_are_stitched_in_order_with_silence_for_pauses(tmp_path):
+    from src.tts import silence
+    fake = FakeTTS()
+    audio = _run_fake(tmp_path, "A first part. [pause] B second part. [pause] A third.", fake,
+                      {"pause_ms": 100})
+
+    pause = silence(100)
+    assert audio == FRAME_A * 2 + pause + FRAME_B * 2 + pause + FRAME_A * 2
+    assert sorted(fake.calls) == ["A first part.", "A third.", "B second part."]
+
+
+def test_chunks_are_synthesized_concurrently(tmp_path):
+    fake = FakeTTS(overlap=threading.Barrier(4, timeout=5))  # breaks unless all four chunks are in flight
+    script = " [pause] ".join(f"A chunk {i}." for i in range(4))
+
+    _run_fake(tmp_path, script, fake, {"max_workers": 4, "max_retries": 0})
+    assert len(fake.calls) == 4
+
+
+def test_failed_chunk_is_retried(tmp_path):
+    fake = FakeTTS(failures=1)
+    audio = _run_fake(tmp_path, "A only chunk.", fake, {"retry_backoff": 0.01})
+    assert audio == FRAME_A * 2
+    assert fake.calls == ["A only chunk.", "A only chunk."]
+
+
+def test_failed_synthesis_leaves_no_partial_file(tmp_path):
+    fake = FakeTTS(failures=5)
+    with pytest.raises(ConnectionError):
+        _run_fake(tmp_path, "A first. [pause] A second.", fake, {"retry_backoff": 0.01, "max_retries": 0})
+    assert list(tmp_path.glob("out.mp3*")) == []
+
+
+def test_cached_chunks_are_not_resynthesized(tmp_path):
+    from src.tts import audio_cache_stats
+    script = "A greeting. [pause] B story of the day. [pause] A sign off."
+
+    first = _run_fake(tmp_path, script, FakeTTS())
+    recorder = metrics.reset()  # stats are per run: the first render's misses don't count
+    fake = FakeTTS()
+    second = _run_fake(tmp_path, script.replace("B story of the day", "B another story"), fake)
+
+    assert fake.calls == ["B another story."]
+    assert first.replace(FRAME_B, b"") == second.replace(FRAME_B, b"")
+    stats = audio_cache_stats(recorder)
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["chars_saved"] == len("A greeting.") + len("A sign off.")
+
+
+@pytest.mark.parametrize("cache", [{"max_mb": 5}, True])
+def test_cache_setting_is_merged_over_the_defaults(tmp_path, cache):
+    _run_fake(tmp_path, "A only chunk.", FakeTTS(), {"cache": cache})
+    fake = FakeTTS()
+    _run_fake(tmp_path, "A only chunk.", fake, {"cache": cache})
+    assert fake.calls == []
+    assert any((tmp_path / "cache" / "tts").iterdir())
+
+
+def test_cache_false_disables_it(tmp_path):
+    _run_fake(tmp_path, "A only chunk.", FakeTTS(), {"cache": False})
+    fake = FakeTTS()
+    _run_fake(tmp_path, "A only chunk.", fake, {"cache": False})
+    assert fake.calls == ["A only chunk."]
+
+
+def test_use_cache_false_always_synthesizes(tmp_path):
+    script = "A only chunk."
+    _run_fake(tmp_path, script, FakeTTS())
+    fake = FakeTTS()
+    output_path = str(tmp_path / "again.mp3")
+    with patch("elevenlabs.client.ElevenLabs") as mock_client_cls, \
+         patch.dict("src.context._clients", clear=True), \
+         patch.dict("os.environ", {"ELEVENLABS_API_KEY": "test-key"}):
+        mock_client_cls.return_value.text_to_speech = fake
+        from src.tts import generate_audio
+        generate_audio(script, output_path, use_cache=False)
+    assert fake.calls == ["A only chunk."]
+
+
+def test_cache_key_ignores_whitespace_but_not_voice_inputs():
+    from src.tts import audio_cache_key
+    assert audio_cache_key("Hello  there.\n") == audio_cache_key("Hello there.")
+    assert audio_cache_key("Hello there.") != audio_cache_key("Hello there!")
+
+
+def test_client_is_shared_across_calls(tmp_path):
+    with patch("elevenlabs.client.ElevenLabs") as mock_client_cls, \
+         patch.dict("os.environ", {"ELEVENLABS_API_KEY": "test-key"}):
+        mock_client_cls.return_value.text_to_speech = FakeTTS()
+        from src.tts import generate_audio
+        generate_audio("A one.", str(tmp_path / "1.mp3"))
+        generate_audio("A two.", str(tmp_path / "2.mp3"))
+    mock_client_cls.assert_called_once_with(api_key="test-key", base_url=None)